@@ -0,0 +1,111 @@
+"""
+JP Assistant - Headless batch mode
+Runs commands from a file or stdin through the JP brain and reports latency
+"""
+
+import contextlib
+import json
+import random
+import sys
+import time
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+from jp_assistant import JPAssistant
+from utils.stats import percentile
+
+
+def read_commands(stream: IO[str]) -> Iterator[Tuple[Optional[str], str]]:
+    """(id, command) for each line: plain text, or JSON with "text" and optional "id" """
+    for line in stream:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            record = json.loads(line)
+            yield record.get("id"), record.get("text", record.get("command", ""))
+        else:
+            yield None, line
+
+
+def run_batch(assistant: JPAssistant, commands: Iterator[Tuple[Optional[str], str]],
+              output: IO[str]) -> Dict[str, float]:
+    """Process every command, writing one JSON response per line; returns the summary"""
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+
+    for number, (command_id, command) in enumerate(commands, 1):
+        record = {
+            "id": number if command_id is None else command_id,
+            "command": command,
+            "intent": None,
+        }
+
+        command_started = time.perf_counter()
+        try:
+            record["response"] = assistant.process_jp_command(command)
+        except Exception as e:
+            errors += 1
+            record["error"] = f"{type(e).__name__}: {e}"
+        latency = time.perf_counter() - command_started
+        # The command that answered, from the same routing pass that was timed
+        record["intent"] = assistant.last_intent
+        latencies.append(latency)
+        record["latency_ms"] = round(latency * 1000, 3)
+
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "commands": len(latencies),
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "commands_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def format_summary(summary: Dict[str, float]) -> str:
+    return "\n".join([
+        "📊 Batch Summary",
+        "━" * 16,
+        f"✅ Commands: {summary['commands']} ({summary['errors']} failed)",
+        f"⏱️ Elapsed: {summary['elapsed_seconds']:.2f}s "
+        f"({summary['commands_per_second']:.1f} commands/s)",
+        f"📈 Latency: mean {summary['mean_ms']:.1f} ms, p50 {summary['p50_ms']:.1f} ms, "
+        f"p90 {summary['p90_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms, "
+        f"max {summary['max_ms']:.1f} ms",
+    ])
+
+
+def run_batch_files(source: str, destination: str = "-", seed: int = None) -> int:
+    """Entry point for main.py --batch; returns the process exit code"""
+    results = sys.stdout
+    # Status messages go to stderr so stdout carries only the JSONL responses
+    with contextlib.ExitStack() as stack, contextlib.redirect_stdout(sys.stderr):
+        if seed is not None:
+            random.seed(seed)
+
+        assistant = JPAssistant(headless=True)
+        if not assistant.jp_brain or not assistant.command_processor:
+            print("❌ Cannot start batch mode - initialization failed")
+            return 1
+
+        try:
+            stream = sys.stdin if source == "-" else stack.enter_context(open(source, encoding="utf-8"))
+            output = results if destination == "-" else stack.enter_context(
+                open(destination, "w", encoding="utf-8"))
+            summary = run_batch(assistant, read_commands(stream), output)
+        except (OSError, ValueError) as e:
+            print(f"❌ Batch failed: {e}")
+            return 1
+        finally:
+            assistant.shutdown()
+
+        print(format_summary(summary))
+        return 1 if summary["errors"] else 0
@@ -2,7 +2,22 @@
 Core modules for JP Assistant
 """
 
+import importlib
 from .config import *
-from .speech_engine import SpeechEngine
-from .command_processor import CommandProcessor
-from .system_manager import SystemManager, ProgramLauncher
+
+# Heavier modules load on first access, so importing one light module from
+# the package (a command handler, the registry) doesn't pull in speech and psutil
+_LAZY_EXPORTS = {
+    "SpeechEngine": ".speech_engine",
+    "CommandProcessor": ".command_processor",
+    "SystemManager": ".system_manager",
+    "ProgramLauncher": ".system_manager",
+    "FileIndex": ".file_index",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -2,11 +2,10 @@
 Command Processor Module - Handles command parsing and execution
 """
 
-import datetime
 import random
-from typing import Dict, Any
-from . import config
-from .system_manager import SystemManager, ProgramLauncher
+from typing import Dict, Any, List
+from .command_registry import STANDARD, registry
+from .intent_router import IntentMatch
 
 class MemoryManager:
     """Handles memory storage and retrieval"""
@@ -66,148 +65,27 @@ class CommandProcessor:
         self.memory_manager = MemoryManager()
         self.command_count = 0
     
-    def process_command(self, command: str) -> str:
-        """Process voice command and return appropriate response"""
+    def process_command(self, command: str, matches: List[IntentMatch] = None) -> str:
+        """Process voice command and return appropriate response
+        
+        matches are the router's matches for the command, when the caller
+        already computed them while trying JP's enhanced commands. The
+        handlers live in core.commands and are registered by intent.
+        """
         if not command.strip():
             return "I didn't hear anything. Please try again."
         
         command = command.lower().strip()
         self.command_count += 1
         
-        # Greeting commands
-        if any(word in command for word in ["hello", "hi", "hey", "good morning", "good afternoon"]):
-            greetings = [
-                "Hello! How can I help you today?",
-                "Hi there! What would you like to know?",
-                "Hey! I'm here to help. What do you need?",
-                "Good to hear from you! How can I assist?"
-            ]
-            return random.choice(greetings)
-        
-        # Time and date commands
-        elif "time" in command:
-            current_time = datetime.datetime.now().strftime("%I:%M %p")
-            return f"The current time is {current_time}"
-        
-        elif any(word in command for word in ["date", "today", "day"]):
-            today = datetime.datetime.now().strftime("%A, %B %d, %Y")
-            return f"Today is {today}"
-        
-        # Identity commands
-        elif any(phrase in command for phrase in ["your name", "who are you", "what are you"]):
-            return f"I'm {config.APP_NAME} version {config.APP_VERSION}, your advanced voice-activated AI helper!"
-        
-        # Gratitude responses
-        elif any(word in command for word in ["thank", "thanks", "appreciate"]):
-            responses = [
-                "You're very welcome!",
-                "Happy to help!",
-                "My pleasure!",
-                "Anytime! I'm here to help."
-            ]
-            return random.choice(responses)
-        
-        # System information commands
-        elif any(word in command for word in ["storage", "disk", "space", "memory", "system"]):
-            return SystemManager.get_system_status()
-        
-        elif any(word in command for word in ["cpu", "processor", "performance"]):
-            return SystemManager.get_cpu_usage()
-        
-        # Enhanced file operations with system-wide search
-        elif any(word in command for word in ["files", "folder", "directory", "list", "find", "search files"]):
-            # Determine search scope
-            system_wide = "system" in command or "all" in command or "everywhere" in command
-            
-            if "mp3" in command or "music" in command:
-                return SystemManager.find_files_by_extension(".mp3", system_wide=system_wide)
-            elif "jpg" in command or "jpeg" in command or "image" in command or "photo" in command:
-                return SystemManager.find_files_by_extension(".jpg", system_wide=system_wide)
-            elif "png" in command:
-                return SystemManager.find_files_by_extension(".png", system_wide=system_wide)
-            elif "pdf" in command or "document" in command:
-                return SystemManager.find_files_by_extension(".pdf", system_wide=system_wide)
-            elif "txt" in command or "text" in command:
-                return SystemManager.find_files_by_extension(".txt", system_wide=system_wide)
-            elif "video" in command or "mp4" in command:
-                return SystemManager.find_files_by_extension(".mp4", system_wide=system_wide)
-            elif "excel" in command or "xlsx" in command:
-                return SystemManager.find_files_by_extension(".xlsx", system_wide=system_wide)
-            elif "word" in command or "docx" in command:
-                return SystemManager.find_files_by_extension(".docx", system_wide=system_wide)
-            elif "zip" in command or "archive" in command:
-                return SystemManager.find_files_by_extension(".zip", system_wide=system_wide)
-            else:
-                # Check if user specified a filename to search for
-                search_terms = command.replace("find", "").replace("search", "").replace("files", "").replace("for", "").strip()
-                if search_terms and len(search_terms) > 2:
-                    return SystemManager.search_files_by_name(search_terms, system_wide=system_wide)
-                else:
-                    return SystemManager.list_files()
-        
-        # Program launching
-        elif "open" in command:
-            if "browser" in command or "chrome" in command or "edge" in command:
-                return ProgramLauncher.open_browser()
-            else:
-                # Extract program name
-                for program in ProgramLauncher.PROGRAMS.keys():
-                    if program in command:
-                        return ProgramLauncher.launch_program(program)
-                return ProgramLauncher.launch_program("")  # Show available programs
-        
-        # Web search
-        elif "search" in command or "google" in command or "find" in command:
-            # Extract search terms
-            search_terms = command
-            for remove_word in ["search", "for", "google", "find", "on", "the", "internet", "web"]:
-                search_terms = search_terms.replace(remove_word, "")
-            search_terms = search_terms.strip()
-            
-            return ProgramLauncher.search_web(search_terms)
-        
-        # Memory commands
-        elif "remember" in command:
-            return self.memory_manager.remember(command)
-        
-        elif any(phrase in command for phrase in ["what is", "recall", "what do you know about"]):
-            return self.memory_manager.recall(command)
-        
-        elif "list memories" in command or "what do you remember" in command:
-            return self.memory_manager.list_memories()
-        
-        # Entertainment
-        elif "joke" in command or "funny" in command:
-            return random.choice(config.JOKES)
-        
-        elif "sing" in command:
-            return "🎵 I'm just a voice assistant, but here's a classic: 'Daisy, Daisy, give me your answer true...' 🎵"
-        
-        # Help and capabilities
-        elif any(word in command for word in ["help", "what can you do", "capabilities", "features"]):
-            return config.HELP_TEXT.strip()
-        
-        # Weather (placeholder)
-        elif "weather" in command:
-            return "I don't have direct weather access, but I can search for weather information if you'd like! Just say 'search weather in [your city]'"
-        
-        # Shutdown/restart (security)
-        elif any(word in command for word in ["shutdown", "restart", "reboot", "turn off"]):
-            return "I cannot perform system shutdown or restart commands for security reasons."
-        
-        # Stats about usage
-        elif "stats" in command or "statistics" in command:
-            return f"I've processed {self.command_count} commands in this session and have {len(self.memory_manager.memories)} memories stored."
-        
-        # Exit commands
-        elif any(word in command for word in ["goodbye", "bye", "exit", "quit", "stop"]):
-            return "Goodbye! It was great helping you today!"
+        response = registry.dispatch(STANDARD, self, command, matches)
+        if response is not None:
+            return response
         
         # Default response for unrecognized commands
-        else:
-            suggestions = [
-                "I'm not sure about that. Try asking about time, system info, or say 'help' to see what I can do!",
-                "I didn't understand that command. Would you like to see my capabilities? Just say 'help'!",
-                "Hmm, I'm not familiar with that. Ask me about the time, open programs, or search the web!",
-            ]
-            return random.choice(suggestions)
+        suggestions = [
+            "I'm not sure about that. Try asking about time, system info, or say 'help' to see what I can do!",
+            "I didn't understand that command. Would you like to see my capabilities? Just say 'help'!",
+            "Hmm, I'm not familiar with that. Ask me about the time, open programs, or search the web!",
+        ]
+        return random.choice(suggestions)
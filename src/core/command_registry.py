@@ -0,0 +1,214 @@
+"""
+Command Registry Module - Declared command handlers, loaded on first dispatch
+"""
+
+import importlib
+import inspect
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from . import config
+from .intent_router import IntentMatch, IntentRouter
+from .metrics_exporter import assistant_metrics
+from .phonetic_index import PhoneticIndex
+
+# group: "enhanced" commands are handled by JPBrain, "standard" ones by
+# CommandProcessor. target: the handler function, or "module:function"
+# for handlers that are imported only when first dispatched.
+CommandSpec = namedtuple("CommandSpec", [
+    "intent", "phrases", "priority", "group", "target", "capabilities"
+])
+
+ENTRY_POINT_GROUP = "jp_assistant.commands"
+ENHANCED = "enhanced"
+STANDARD = "standard"
+
+
+class CommandRegistry:
+    """Trigger phrases, priorities and handlers for every command
+
+    Handlers register with the command() decorator, or with declare() and
+    a "module:function" string so the module is imported on first use.
+    Third-party packages add commands through the "jp_assistant.commands"
+    entry point group; each entry point is a function that receives the
+    registry and declares its commands. The intent router is rebuilt
+    from the registry whenever a command is added. Utterances that match
+    no trigger phrase are matched by sound, and then by the intent
+    classifier.
+
+    Handlers are called as handler(owner, command, match), where owner is
+    the JPBrain or CommandProcessor dispatching the command; command and
+    match are only passed to handlers whose signature names them.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, CommandSpec] = {}
+        self._handlers: Dict[str, Callable] = {}
+        self._router: Optional[IntentRouter] = None
+        self._phonetic: Optional[PhoneticIndex] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def command(self, intent: str, phrases: Iterable[str], priority: int,
+                group: str = STANDARD, capabilities: Iterable[str] = ()) -> Callable:
+        """Decorator registering a function as the handler for an intent"""
+        def decorator(func: Callable) -> Callable:
+            self.register(CommandSpec(intent, tuple(phrases), priority, group, func,
+                                      frozenset(capabilities)))
+            return func
+        return decorator
+
+    def declare(self, intent: str, phrases: Iterable[str], priority: int, target: str,
+                group: str = STANDARD, capabilities: Iterable[str] = ()) -> None:
+        """Register a handler by "module:function" without importing it yet"""
+        self.register(CommandSpec(intent, tuple(phrases), priority, group, target,
+                                  frozenset(capabilities)))
+
+    def register(self, spec: CommandSpec) -> None:
+        with self._lock:
+            self._specs[spec.intent] = spec
+            self._handlers.pop(spec.intent, None)
+            self._router = None
+            self._phonetic = None
+
+    def _ensure_loaded(self) -> None:
+        """Register the built-in standard commands and any installed plugins"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            importlib.import_module(".commands", __package__).register(self)
+            self._load_entry_points()
+
+    def _load_entry_points(self) -> None:
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            # Python 3.7 has no importlib.metadata; plugins are unavailable there
+            return
+
+        discovered = entry_points()
+        if hasattr(discovered, "select"):
+            plugins = discovered.select(group=ENTRY_POINT_GROUP)
+        else:
+            plugins = discovered.get(ENTRY_POINT_GROUP, [])
+
+        for plugin in plugins:
+            try:
+                plugin.load()(self)
+            except Exception as e:
+                print(f"⚠️ Could not load command plugin '{plugin.name}': {e}")
+
+    def specs(self, group: str = None) -> List[CommandSpec]:
+        """Enabled commands, highest priority first"""
+        self._ensure_loaded()
+        disabled = set(config.DISABLED_COMMAND_CAPABILITIES)
+        with self._lock:
+            specs = [spec for spec in self._specs.values()
+                     if (group is None or spec.group == group) and not spec.capabilities & disabled]
+        return sorted(specs, key=lambda spec: spec.priority)
+
+    def intents(self, group: str) -> Set[str]:
+        return {spec.intent for spec in self.specs(group)}
+
+    def router(self) -> IntentRouter:
+        """Intent router over every enabled command's trigger phrases"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._router is None:
+                router = IntentRouter()
+                for spec in self.specs():
+                    router.add(spec.intent, spec.phrases, spec.priority)
+                self._router = router
+            return self._router
+
+    def phonetic_index(self) -> PhoneticIndex:
+        """Trigger phrases keyed by sound, for commands the recognizer misheard"""
+        with self._lock:
+            if self._phonetic is None:
+                index = PhoneticIndex(min_key_length=config.PHONETIC_MIN_COMMAND_KEY,
+                                      max_spelling_ratio=config.PHONETIC_MAX_SPELLING_RATIO)
+                for spec in self.specs():
+                    for phrase in spec.phrases:
+                        index.add(phrase, spec)
+                self._phonetic = index
+            return self._phonetic
+
+    def matches(self, command: str) -> List[IntentMatch]:
+        """Trigger phrase matches; failing those, phrases that sound alike,
+        then the intent classifier's best guess
+        """
+        matches = self.router().matches(command)
+        if matches:
+            return matches
+        # Priorities decide among the closest-sounding phrases
+        matches = [IntentMatch(match.value.intent, match.phrase, match.start, match.end, match.value.priority)
+                   for match in self.phonetic_index().lookup(command)]
+        if matches:
+            return matches
+        fallback = self._classifier_match(command)
+        return [fallback] if fallback else []
+
+    def _classifier_match(self, command: str) -> Optional[IntentMatch]:
+        # Imported here so routing never loads NumPy; interactive runs warm the model in the background
+        from .intent_classifier import get_intent_classifier
+
+        probabilities = get_intent_classifier().probabilities(command)
+        enabled = {spec.intent: spec for spec in self.specs()
+                   if spec.intent not in config.INTENT_FALLBACK_EXCLUDED}
+        candidates = [(probability, intent) for intent, probability in probabilities.items()
+                      if intent in enabled]
+        if not candidates:
+            return None
+        probability, intent = max(candidates)
+        if probability < config.INTENT_FALLBACK_MIN_CONFIDENCE:
+            return None
+        # An empty phrase marks a classifier guess rather than a trigger phrase
+        return IntentMatch(intent, "", 0, 0, enabled[intent].priority)
+
+    def handler(self, intent: str) -> Callable:
+        """The handler for an intent, importing its module on first use"""
+        with self._lock:
+            handler = self._handlers.get(intent)
+            if handler is None:
+                target = self._specs[intent].target
+                if isinstance(target, str):
+                    module_name, _, attr = target.partition(":")
+                    target = getattr(importlib.import_module(module_name), attr)
+                handler = self._handlers[intent] = self._adapt(target)
+            return handler
+
+    @staticmethod
+    def _adapt(func: Callable) -> Callable:
+        """Call func with only the command and match arguments it accepts"""
+        parameters = inspect.signature(func).parameters
+        wants_command = "command" in parameters
+        wants_match = "match" in parameters
+
+        def call(owner, command: str, match: IntentMatch):
+            kwargs = {}
+            if wants_command:
+                kwargs["command"] = command
+            if wants_match:
+                kwargs["match"] = match
+            return func(owner, **kwargs)
+        return call
+
+    def best(self, group: str, matches: List[IntentMatch]) -> Optional[IntentMatch]:
+        """The match dispatch() would run for a group"""
+        return IntentRouter.best(matches, self.intents(group))
+
+    def dispatch(self, group: str, owner, command: str,
+                 matches: List[IntentMatch] = None) -> Optional[str]:
+        """Run the highest-priority command of a group mentioned in the command"""
+        if matches is None:
+            matches = self.matches(command)
+        match = self.best(group, matches)
+        if match is None:
+            return None
+        assistant_metrics.name_handler(match.intent)
+        return self.handler(match.intent)(owner, command, match)
+
+
+# Shared registry the command handlers register with
+registry = CommandRegistry()
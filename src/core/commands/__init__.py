@@ -0,0 +1,42 @@
+"""
+Built-in standard commands
+
+The registry declares these by "module:function" with their trigger
+phrases from config.COMMAND_KEYWORDS, so routing works without importing
+them; each module (and SystemManager, psutil and friends behind it) is
+imported when one of its commands is first dispatched.
+"""
+
+from .. import config
+
+# (intent, priority, "module:function", capabilities), in COMMAND_KEYWORDS order
+BUILTIN_COMMANDS = [
+    ("shutdown", 500, "basic:refuse_shutdown", ()),
+    ("time", 510, "basic:tell_time", ()),
+    ("weather", 520, "basic:weather", ()),
+    ("date", 530, "basic:tell_date", ()),
+    ("identity", 540, "basic:identity", ()),
+    ("gratitude", 550, "basic:gratitude", ()),
+    ("list_memories", 560, "memory:list_memories", ("memory",)),
+    ("system_status", 570, "system:system_status", ("system_info",)),
+    ("cpu", 580, "system:cpu_usage", ("system_info",)),
+    ("refine_files", 585, "files:refine_files", ("filesystem",)),
+    ("files", 590, "files:find_files", ("filesystem",)),
+    ("open", 600, "programs:open_program", ("programs",)),
+    ("web_search", 610, "programs:search_web", ("network",)),
+    ("remember", 620, "memory:remember", ("memory",)),
+    ("recall", 630, "memory:recall", ("memory",)),
+    ("joke", 640, "basic:tell_joke", ()),
+    ("sing", 650, "basic:sing", ()),
+    ("help", 660, "basic:show_help", ()),
+    ("stats", 670, "system:session_stats", ()),
+    ("exit", 680, "basic:say_goodbye", ()),
+    ("greeting", 690, "basic:greet", ()),
+]
+
+
+def register(registry) -> None:
+    """Declare the built-in commands, the same way a plugin entry point does"""
+    for intent, priority, target, capabilities in BUILTIN_COMMANDS:
+        registry.declare(intent, config.COMMAND_KEYWORDS[intent], priority,
+                         f"{__name__}.{target}", capabilities=capabilities)
@@ -0,0 +1,68 @@
+"""
+Basic Commands - Time, identity, small talk and help
+"""
+
+import datetime
+import random
+from .. import config
+
+
+def refuse_shutdown(processor) -> str:
+    """Shutdown/restart (security)"""
+    return "I cannot perform system shutdown or restart commands for security reasons."
+
+
+def tell_time(processor) -> str:
+    current_time = datetime.datetime.now().strftime("%I:%M %p")
+    return f"The current time is {current_time}"
+
+
+def weather(processor) -> str:
+    """Weather (placeholder)"""
+    return "I don't have direct weather access, but I can search for weather information if you'd like! Just say 'search weather in [your city]'"
+
+
+def tell_date(processor) -> str:
+    today = datetime.datetime.now().strftime("%A, %B %d, %Y")
+    return f"Today is {today}"
+
+
+def identity(processor) -> str:
+    return f"I'm {config.APP_NAME} version {config.APP_VERSION}, your advanced voice-activated AI helper!"
+
+
+def gratitude(processor) -> str:
+    responses = [
+        "You're very welcome!",
+        "Happy to help!",
+        "My pleasure!",
+        "Anytime! I'm here to help."
+    ]
+    return random.choice(responses)
+
+
+def tell_joke(processor) -> str:
+    return random.choice(config.JOKES)
+
+
+def sing(processor) -> str:
+    return "🎵 I'm just a voice assistant, but here's a classic: 'Daisy, Daisy, give me your answer true...' 🎵"
+
+
+def show_help(processor) -> str:
+    return config.HELP_TEXT.strip()
+
+
+def say_goodbye(processor) -> str:
+    return "Goodbye! It was great helping you today!"
+
+
+# Greetings rank last, so "hey, what time is it" answers the question
+def greet(processor) -> str:
+    greetings = [
+        "Hello! How can I help you today?",
+        "Hi there! What would you like to know?",
+        "Hey! I'm here to help. What do you need?",
+        "Good to hear from you! How can I assist?"
+    ]
+    return random.choice(greetings)
@@ -0,0 +1,118 @@
+"""
+File Commands - Find files by type or name, and narrow down the last results
+"""
+
+import os
+from .. import config
+from ..conversation_context import conversation, parse_refinement, refine, result_extensions
+from ..intent_router import tokenize
+from ..system_manager import SystemManager
+
+# (words naming a file type, extension searched for), checked in order
+FILE_TYPE_WORDS = [
+    ({"mp3", "music"}, ".mp3"),
+    ({"jpg", "jpeg", "image", "images", "photo", "photos"}, ".jpg"),
+    ({"png"}, ".png"),
+    ({"pdf", "document", "documents"}, ".pdf"),
+    ({"txt", "text"}, ".txt"),
+    ({"video", "videos", "mp4"}, ".mp4"),
+    ({"excel", "xlsx"}, ".xlsx"),
+    ({"word", "docx"}, ".docx"),
+    ({"zip", "archive", "archives"}, ".zip"),
+]
+
+
+def _named_extension(words: set):
+    for type_words, extension in FILE_TYPE_WORDS:
+        if words & type_words:
+            return extension
+    return None
+
+
+def _search_location(folder: str):
+    """The search location a folder word names, e.g. "downloads" for ~/Downloads"""
+    for location in SystemManager.get_search_locations():
+        if os.path.basename(location).lower().rstrip("s") == folder.rstrip("s"):
+            return location
+    return None
+
+
+def _search_again(turn, location: str):
+    """Repeat a cut-short extension or name search in one folder; None if it can't be"""
+    if "extension" in turn.entities:
+        return SystemManager.collect_files_by_extension(turn.entities["extension"], directory=location)
+    if "name" in turn.entities:
+        return SystemManager.collect_files_by_name(turn.entities["name"], directory=location)
+    return None
+
+
+def _list_paths(header: str, paths) -> str:
+    result = [header]
+    for path in paths[:config.MAX_FILES_TO_SHOW]:
+        result.append(f"   📄 {os.path.basename(path)} ({os.path.dirname(path)})")
+    if len(paths) > config.MAX_FILES_TO_SHOW:
+        result.append(f"   ... and {len(paths) - config.MAX_FILES_TO_SHOW} more")
+    return "\n".join(result)
+
+
+def refine_files(processor, command: str) -> str:
+    """Filter the previous search's results, e.g. "now only in Downloads"
+
+    When that search was cut short, filtering its results could miss
+    files, so a folder that is one of the search locations is searched
+    again; otherwise the answer says it only covers the earlier results.
+    """
+    turn = conversation.last_with_results()
+    filters = parse_refinement(command, turn.results) if turn else {}
+    # "find pdf files only in downloads" after an MP3 search is a new search;
+    # "only in documents" is not
+    extension = _named_extension(set(tokenize(command)) - {filters.get("folder")})
+    if extension and (turn is None or extension not in result_extensions(turn.results)):
+        return find_files(processor, command)
+    if turn is None:
+        return "🤔 There's nothing to narrow down yet. Try 'find PDF files' first."
+    if not filters:
+        return "🤔 How should I narrow it down? Try 'only in Downloads' or 'just the PDFs'."
+
+    entities = dict(turn.entities, **filters)
+    description = " ".join(f"{key} '{value}'" for key, value in filters.items())
+    location = _search_location(filters["folder"]) if turn.truncated and "folder" in filters else None
+    found = _search_again(turn, location) if location else None
+    if found is not None:
+        other_filters = {key: value for key, value in filters.items() if key != "folder"}
+        paths = refine(found.paths, other_filters)
+        conversation.record(command, "refine_files", entities, paths, found.truncated)
+        if not paths:
+            return f"🔍 Searched {location} again: no files match {description}"
+        return _list_paths(f"🔍 Searched {location} again: {len(paths)} files match {description}:", paths)
+
+    paths = refine(turn.results, filters)
+    conversation.record(command, "refine_files", entities, paths, turn.truncated)
+    if not paths:
+        answer = f"🔍 None of the {len(turn.results)} earlier results match {description}"
+    else:
+        answer = _list_paths(f"🔍 {len(paths)} of {len(turn.results)} earlier results match {description}:", paths)
+    if turn.truncated:
+        answer += (f"\n   ⚠️ That search stopped after its first {len(turn.results)} results, "
+                   "so there may be more. Try a new search to be sure.")
+    return answer
+
+
+def find_files(processor, command: str) -> str:
+    """Enhanced file operations with system-wide search"""
+    words = set(tokenize(command))
+    system_wide = bool(words & {"system", "all", "everywhere"})
+
+    extension = _named_extension(words)
+    if extension:
+        found = SystemManager.collect_files_by_extension(extension, system_wide=system_wide)
+        conversation.record(command, "files", {"extension": extension}, found.paths, found.truncated)
+        return found.text
+
+    # Check if user specified a filename to search for
+    search_terms = command.replace("find", "").replace("search", "").replace("files", "").replace("for", "").strip()
+    if search_terms and len(search_terms) > 2:
+        found = SystemManager.collect_files_by_name(search_terms, system_wide=system_wide)
+        conversation.record(command, "files", {"name": search_terms}, found.paths, found.truncated)
+        return found.text
+    return SystemManager.list_files()
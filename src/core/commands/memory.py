@@ -0,0 +1,15 @@
+"""
+Memory Commands - Remember and recall facts for the session
+"""
+
+
+def list_memories(processor) -> str:
+    return processor.memory_manager.list_memories()
+
+
+def remember(processor, command: str) -> str:
+    return processor.memory_manager.remember(command)
+
+
+def recall(processor, command: str) -> str:
+    return processor.memory_manager.recall(command)
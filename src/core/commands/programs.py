@@ -0,0 +1,22 @@
+"""
+Program Commands - Launch programs and search the web
+"""
+
+from ..intent_router import tokenize
+from ..system_manager import ProgramLauncher
+
+
+def open_program(processor, command: str) -> str:
+    words = set(tokenize(command))
+    if words & {"browser", "chrome", "edge"}:
+        return ProgramLauncher.open_browser()
+
+    # Extract program name; with none, the launcher lists what it can open
+    return ProgramLauncher.launch_program(ProgramLauncher.find_program(command) or "")
+
+
+def search_web(processor, command: str) -> str:
+    filler = {"search", "for", "google", "find", "on", "the", "internet", "web"}
+    search_terms = " ".join(word for word in command.split() if word not in filler)
+
+    return ProgramLauncher.search_web(search_terms)
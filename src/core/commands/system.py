@@ -0,0 +1,22 @@
+"""
+System Commands - Status, CPU and session statistics
+"""
+
+from ..system_manager import SystemManager
+
+
+def system_status(processor) -> str:
+    return SystemManager.get_system_status()
+
+
+def cpu_usage(processor) -> str:
+    return SystemManager.get_cpu_usage()
+
+
+def session_stats(processor) -> str:
+    """Stats about usage"""
+    cache = SystemManager.get_cache_stats()
+    return (f"I've processed {processor.command_count} commands in this session and have "
+            f"{len(processor.memory_manager.memories)} memories stored. "
+            f"Search cache: {cache['hits']} hits, {cache['misses']} misses "
+            f"({cache['hit_rate']:.0%} hit rate, {cache['entries']} entries).")
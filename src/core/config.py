@@ -1,5 +1,7 @@
 # Configuration settings for JP Assistant
 
+import os
+
 # Audio Settings
 MICROPHONE_INDEX = 3
 TIMEOUT_SECONDS = 8
@@ -15,10 +17,152 @@ WAKE_WORD_TIMEOUT = 3  # Shorter timeout for wake word detection
 TTS_RATE = 200
 TTS_VOLUME = 0.9
 
+# Speech Recognition Backend - "google" (online) or "vosk" (offline, needs the vosk package)
+SPEECH_RECOGNIZER = "google"
+VOSK_MODEL_PATH = "models/vosk-model-small-en-in-0.4"
+VOSK_SAMPLE_RATE = 16000
+
+# Voice Pipeline - listening, recognition, commands and speech overlap
+PIPELINE_QUEUE_SIZE = 4  # Items buffered between stages before the earlier stage waits
+PIPELINE_LISTEN_WHILE_SPEAKING = False  # True records the next utterance while JP answers (use a headset: JP hears itself)
+PIPELINE_CAPTURE_RETRY_SECONDS = 1.0  # Pause before retrying a microphone that failed immediately
+
 # System Settings
 MAX_FILES_TO_SHOW = 10
 MAX_SEARCH_RESULTS = 5
 
+# Metrics Settings
+METRICS_SAMPLE_INTERVAL = 2.0  # Seconds between background CPU/memory/disk samples
+SYSTEM_DISK_PATH = os.path.abspath(os.sep)  # System drive root (C:\\ on Windows, / elsewhere)
+METRICS_EXPORT_ENABLED = False  # Serve Prometheus metrics over HTTP
+METRICS_EXPORT_ADDRESS = "127.0.0.1"  # Use "0.0.0.0" to let a remote Prometheus scrape
+METRICS_EXPORT_PORT = 9857
+METRICS_TEXTFILE_PATH = None  # e.g. node_exporter's textfile directory + "/jp_assistant.prom"
+METRICS_TEXTFILE_INTERVAL = 15  # Seconds between textfile rewrites
+METRICS_LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+TOP_PROCESSES_COUNT = 5
+PROCESS_SAMPLE_MAX_AGE = 10.0  # Older process samples are re-baselined before reporting
+PROCESS_BASELINE_INTERVAL = 0.25  # Baseline wait when no background sampler keeps process samples fresh
+PARTITION_USAGE_TIMEOUT = 2.0  # Seconds to wait for all mounts before reporting slow ones as unavailable
+PARTITION_REFRESH_SECONDS = 30  # Partition list refresh where mount changes can't be watched
+# Kernel and virtual filesystems left out of the partition inventory (fnmatch patterns)
+PSEUDO_FILESYSTEMS = ["proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "ramfs", "overlay", "squashfs",
+                      "cgroup*", "autofs", "mqueue", "hugetlbfs", "debugfs", "tracefs", "securityfs",
+                      "pstore", "bpf", "configfs", "fusectl", "binfmt_misc", "efivarfs", "nsfs",
+                      "rpc_pipefs", "selinuxfs", "fuse.gvfsd-fuse", "fuse.portal"]
+
+# Linux pressure stall (PSI) triggers: "<some|full> <stall microseconds> <window microseconds>"
+# Unprivileged users need windows that are multiples of 2 seconds
+PSI_TRIGGERS = {
+    "cpu": "some 1000000 2000000",     # Runnable tasks waited half of the last 2s
+    "memory": "some 200000 2000000",   # Tasks stalled on memory 10% of the last 2s
+    "io": "full 400000 2000000"        # All tasks stalled on I/O 20% of the last 2s
+}
+PSI_CLEAR_PERCENT = 5.0  # A pressure alert clears once avg10 falls below this
+
+# File Search Settings
+SEARCH_EXCLUDED_DIRS = ['System32', 'Windows', '__pycache__']
+EXTENSION_SEARCH_EXCLUDED_DIRS = SEARCH_EXCLUDED_DIRS + ['Program Files']
+FILE_INDEX_PATH = "data/file_index.db"
+FILE_INDEX_REFRESH_SECONDS = 300  # Re-check directory mtimes at most every 5 minutes
+FILE_INDEX_WATCHED_REFRESH_SECONDS = 3600  # Safety-net refresh for roots with a live watcher
+FILE_INDEX_BATCH_SIZE = 5000
+FILE_WATCHER_ENABLED = True
+WATCHER_MAX_WATCHES = 50000  # Cap on watched directories (inotify descriptors or polled mtimes)
+WATCHER_POLL_INTERVAL = 30  # Seconds between mtime polls where inotify is unavailable
+TRIGRAM_MIN_SCORE = 0.5  # Lowest similarity reported by fuzzy file name search
+TRIGRAM_COMPACT_RATIO = 0.25  # Rebuild trigram postings once this share of entries is deleted
+RESULT_CACHE_MAX_ENTRIES = 128
+RESULT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+RESULT_CACHE_TTL = 120  # Seconds a cached search or listing stays valid
+MAX_EXTENSION_SEARCH_RESULTS = 50
+MAX_NAME_SEARCH_RESULTS = 30
+SEARCH_TIME_BUDGET = 10.0  # Seconds before a search reports partial results
+SEARCH_FIRST_RESULTS_DELAY = 0.3  # Seconds to wait before announcing early matches
+
+# Extensions searched together for media queries like "find music"
+MEDIA_CATEGORIES = {
+    "music": [".mp3", ".wav", ".flac", ".m4a", ".ogg", ".aac", ".wma"],
+    "video": [".mp4", ".avi", ".mkv", ".mov", ".wmv", ".webm"],
+    "image": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"],
+    "document": [".pdf", ".docx", ".doc", ".txt", ".xlsx", ".pptx", ".odt"],
+}
+FS_WALKER_WORKERS = 8  # Threads used by the parallel directory walker
+
+# Content Search Settings
+TEXT_FILE_EXTENSIONS = [
+    ".txt", ".md", ".rst", ".csv", ".tsv", ".log", ".json", ".xml", ".yaml", ".yml",
+    ".ini", ".cfg", ".toml", ".html", ".css", ".py", ".js", ".ts", ".java", ".c",
+    ".cpp", ".h", ".cs", ".go", ".rs", ".rb", ".php", ".sh", ".bat", ".ps1", ".sql", ".tex"
+]
+CONTENT_SEARCH_WORKERS = 4  # Processes scanning files in parallel
+CONTENT_SEARCH_BATCH_SIZE = 32  # Files handed to a worker at a time
+CONTENT_SEARCH_SNIPPETS_PER_FILE = 3
+CONTENT_SEARCH_MAX_FILE_BYTES = 64 * 1024 * 1024
+CONTENT_SEARCH_TIME_BUDGET = 20.0
+MAX_CONTENT_SEARCH_RESULTS = 30
+
+# Disk Usage Settings
+DISK_USAGE_TOP_N = 10  # Largest folders and files kept per report
+DISK_USAGE_TIME_BUDGET = 15.0  # Seconds per scan; unfinished scans resume from the cache
+OPTIMIZE_DISK_SCAN_BUDGET = 2.0  # Quick scan for "optimize" when no disk report exists yet
+
+# Cleanup Settings
+RECLAIM_MIN_AGE_HOURS = 24  # Only temp/cache files untouched this long are deleted
+RECLAIM_WORKERS = 4
+RECLAIM_CONFIRM_SECONDS = 300  # How long a cleanup preview can be confirmed
+# Directories never entered: agent, multiplexer and display sockets live here
+RECLAIM_SKIP_DIRS = ["ssh-*", "tmux-*", ".X11-unix", ".ICE-unix", ".XIM-unix", ".font-unix",
+                     ".Test-unix", "systemd-private-*", "pulse-*", "gnupg", "keyring-*"]
+
+# Command Keywords - whole-word triggers for the standard command processor;
+# each handler in core/commands sets its own priority, below JP's enhanced commands
+COMMAND_KEYWORDS = {
+    "shutdown": ["shutdown", "shut down", "restart", "reboot", "turn off"],
+    "time": ["time"],
+    "weather": ["weather"],
+    "date": ["date", "today", "day"],
+    "identity": ["your name", "who are you", "what are you"],
+    "gratitude": ["thank", "thanks", "thank you", "appreciate"],
+    "list_memories": ["list memories", "what do you remember"],
+    "system_status": ["storage", "disk", "space", "memory", "system"],
+    "cpu": ["cpu", "processor", "performance"],
+    "refine_files": ["only in", "just in", "only the", "just the", "only ones", "narrow it down",
+                     "narrow down", "filter them", "filter those", "of those", "from those"],
+    "files": ["files", "file", "folder", "folders", "directory", "list", "find", "search files"],
+    "open": ["open"],
+    "web_search": ["search", "google"],
+    "remember": ["remember"],
+    "recall": ["what is", "recall", "what do you know about"],
+    "joke": ["joke", "jokes", "funny"],
+    "sing": ["sing"],
+    "help": ["help", "what can you do", "capabilities", "features"],
+    "stats": ["stats", "statistics"],
+    "exit": ["goodbye", "bye", "exit", "quit", "stop"],
+    "greeting": ["hello", "hi", "hey", "good morning", "good afternoon", "good evening"]
+}
+
+# Command capabilities to switch off, e.g. ["network", "programs", "file_delete"];
+# commands needing them are left out of routing (including plugin commands)
+DISABLED_COMMAND_CAPABILITIES = []
+
+# Phonetic Matching - command phrases with shorter sound keys (e.g. "hi") only match as spelled
+PHONETIC_MIN_COMMAND_KEY = 3
+PHONETIC_MAX_SPELLING_RATIO = 0.3  # Share of letters a misheard command phrase may differ by
+PHONETIC_MAX_WAKE_SPELLING_RATIO = 0.25  # Stricter for wake/sleep words, so "job" or "jeep" don't wake JP
+
+# Conversation Context - recent turns kept for follow-ups like "now only in Downloads"
+CONTEXT_MAX_TURNS = 20
+CONTEXT_TTL_SECONDS = 600  # Older results are not refined
+CONTEXT_MAX_RESULTS = 500  # Paths remembered per turn
+
+# Intent Classifier Settings - fallback when no trigger phrase matches
+INTENT_TRAINING_PATH = "data/intent_training.jsonl"  # {"text": ..., "intent": ...} per line
+INTENT_MODEL_PATH = "data/intent_model.npz"  # Retrained when the training data changes
+INTENT_CLASSIFIER_FEATURES = 4096  # Hashed n-gram buckets
+INTENT_FALLBACK_MIN_CONFIDENCE = 0.6
+INTENT_FALLBACK_EXCLUDED = ["cleanup_confirm"]  # Intents that need their exact trigger phrase
+
 # Application Info
 APP_NAME = "JP Assistant"
 APP_VERSION = "2.0"
@@ -0,0 +1,146 @@
+"""
+Content Search Module - Memory-mapped full-text search over text-like files
+"""
+
+import mmap
+import multiprocessing
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, List, Optional, Tuple
+from . import config
+
+ContentMatch = namedtuple("ContentMatch", ["path", "line_number", "snippet"])
+
+SNIFF_BYTES = 8192
+SNIPPET_CHARS = 120
+
+
+def _is_binary(handle) -> bool:
+    """Sniff the start of a file: NUL bytes mean it is not text"""
+    return b"\0" in handle.read(SNIFF_BYTES)
+
+
+def _snippet(data, start: int, end: int) -> str:
+    """Cut the line around a match out of the mapped file"""
+    line_start = data.rfind(b"\n", 0, start) + 1
+    line_end = data.find(b"\n", end)
+    if line_end == -1:
+        line_end = len(data)
+
+    # Keep long lines centred on the match
+    if line_end - line_start > SNIPPET_CHARS:
+        line_start = max(line_start, start - SNIPPET_CHARS // 2)
+        line_end = min(line_end, line_start + SNIPPET_CHARS)
+    return data[line_start:line_end].decode("utf-8", errors="replace").strip()
+
+
+def search_files(paths: List[str], pattern: bytes, ignore_case: bool,
+                 max_snippets: int, max_file_bytes: int) -> List[Tuple[str, List[Tuple[int, str]]]]:
+    """Worker entry point: scan a batch of files and return (path, [(line, snippet)])
+
+    Runs in a separate process. The regex engine scans the whole mapping
+    in C, so there is no Python loop over lines.
+    """
+    regex = re.compile(re.escape(pattern), re.IGNORECASE if ignore_case else 0)
+    results = []
+
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+            if size == 0 or size > max_file_bytes:
+                continue
+            with open(path, "rb") as handle:
+                if _is_binary(handle):
+                    continue
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    snippets = []
+                    line_number = 1
+                    last = 0
+                    for match in regex.finditer(data):
+                        # Count newlines only between consecutive matches
+                        line_number += data[last:match.start()].count(b"\n")
+                        last = match.start()
+                        snippets.append((line_number, _snippet(data, match.start(), match.end())))
+                        if len(snippets) >= max_snippets:
+                            break
+                    if snippets:
+                        results.append((path, snippets))
+        except (OSError, ValueError):
+            # Unreadable, vanished or unmappable files are skipped
+            continue
+
+    return results
+
+
+class ContentSearcher:
+    """Fans batches of text files out to a process pool and streams the matches"""
+
+    def __init__(self, workers: int = None):
+        self.workers = workers or config.CONTENT_SEARCH_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the process pool on first use"""
+        if self._executor is None:
+            # forkserver children do not inherit the parent's threads (watcher, sampler)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def search(self, query: str, paths: Iterable[str], deadline: float = None,
+               ignore_case: bool = True) -> Iterator[ContentMatch]:
+        """Yield matches as worker batches finish, keeping a bounded number in flight"""
+        pattern = query.encode("utf-8")
+        if not pattern:
+            return
+
+        executor = self._get_executor()
+        max_in_flight = self.workers * 2
+        pending = set()
+        batch: List[str] = []
+        paths = iter(paths)
+        exhausted = False
+
+        try:
+            while not exhausted or pending:
+                # Keep every worker busy without queueing the whole file list
+                while not exhausted and len(pending) < max_in_flight:
+                    path = next(paths, None)
+                    if path is None:
+                        exhausted = True
+                    else:
+                        batch.append(path)
+                    if batch and (exhausted or len(batch) >= config.CONTENT_SEARCH_BATCH_SIZE):
+                        pending.add(executor.submit(
+                            search_files, batch, pattern, ignore_case,
+                            config.CONTENT_SEARCH_SNIPPETS_PER_FILE,
+                            config.CONTENT_SEARCH_MAX_FILE_BYTES
+                        ))
+                        batch = []
+
+                if not pending:
+                    break
+
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    return  # Out of time
+                for future in done:
+                    for path, snippets in future.result():
+                        for line_number, snippet in snippets:
+                            yield ContentMatch(path, line_number, snippet)
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
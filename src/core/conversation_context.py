@@ -0,0 +1,139 @@
+"""
+Conversation Context Module - Recent turns and their results, for follow-up questions
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from . import config
+from .intent_router import tokenize
+
+# Words that introduce a folder ("only in Downloads") or a name ("just the ones named budget")
+FOLDER_WORDS = {"in", "from", "under", "inside", "within"}
+NAME_WORDS = {"named", "called", "containing", "matching"}
+FILLER_WORDS = {"my", "the", "a", "folder", "folders", "directory", "dir", "drive", "files",
+                "ones", "those", "these", "them", "only", "just", "now"}
+
+
+class Turn:
+    """One answered command: what was asked, what it meant and what it found
+
+    truncated means results are only the first part of what the search
+    would have found, so a filter over them can miss matches.
+    """
+
+    __slots__ = ("intent", "command", "entities", "results", "truncated", "timestamp")
+
+    def __init__(self, intent: str, command: str, entities: Dict[str, str],
+                 results: Tuple[str, ...], truncated: bool, timestamp: float):
+        self.intent = intent
+        self.command = command
+        self.entities = entities
+        self.results = results
+        self.truncated = truncated
+        self.timestamp = timestamp
+
+
+class ConversationContext:
+    """The last few turns, oldest dropped first
+
+    A fixed-length deque of slotted records, each holding at most
+    CONTEXT_MAX_RESULTS paths, so memory stays flat however long JP runs.
+    Turns older than CONTEXT_TTL_SECONDS are ignored by follow-ups.
+    """
+
+    def __init__(self, max_turns: int = None, ttl: float = None):
+        self.ttl = config.CONTEXT_TTL_SECONDS if ttl is None else ttl
+        self._turns = deque(maxlen=max_turns or config.CONTEXT_MAX_TURNS)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def record(self, command: str, intent: str, entities: Dict[str, str] = None,
+               results: Iterable[str] = (), truncated: bool = False) -> Turn:
+        results = tuple(results)
+        truncated = truncated or len(results) > config.CONTEXT_MAX_RESULTS
+        turn = Turn(intent, command, dict(entities or {}), results[:config.CONTEXT_MAX_RESULTS],
+                    truncated, time.monotonic())
+        with self._lock:
+            self._turns.append(turn)
+        return turn
+
+    def last_with_results(self) -> Optional[Turn]:
+        """Most recent turn that found something, if it is still fresh"""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            for turn in reversed(self._turns):
+                if turn.timestamp < cutoff:
+                    return None
+                if turn.results:
+                    return turn
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._turns.clear()
+
+
+def result_extensions(paths: Iterable[str]) -> set:
+    return {os.path.splitext(path)[1].lower() for path in paths} - {""}
+
+
+def _extension_of(word: str, extensions: set) -> Optional[str]:
+    """The result extension a word names, allowing a plural ("pdfs")"""
+    for candidate in (word, word[:-1] if word.endswith("s") else None):
+        if candidate and f".{candidate}" in extensions:
+            return f".{candidate}"
+    return None
+
+
+def parse_refinement(command: str, paths: Iterable[str]) -> Dict[str, str]:
+    """Filters in a follow-up such as "now only in Downloads" or "just the PDFs"
+
+    Returns any of "folder", "extension" and "name". Only extensions the
+    earlier results contain count, so a folder named like a file type
+    isn't mistaken for one.
+    """
+    words = tokenize(command)
+    extensions = result_extensions(paths)
+    filters = {}
+
+    for position, word in enumerate(words):
+        following = [w for w in words[position + 1:] if w not in FILLER_WORDS]
+        if not following:
+            continue
+        if word in FOLDER_WORDS and "folder" not in filters and not _extension_of(following[0], extensions):
+            filters["folder"] = following[0]
+        elif word in NAME_WORDS and "name" not in filters:
+            filters["name"] = following[0]
+
+    for word in words:
+        extension = _extension_of(word, extensions)
+        if extension and word not in filters.values():
+            filters.setdefault("extension", extension)
+    return filters
+
+
+def refine(paths: Iterable[str], filters: Dict[str, str]) -> List[str]:
+    """The paths that pass every filter; no filesystem access"""
+    folder = filters.get("folder")
+    extension = filters.get("extension")
+    name = filters.get("name")
+    refined = []
+    for path in paths:
+        directory, filename = os.path.split(path)
+        if extension and not filename.lower().endswith(extension):
+            continue
+        if name and name not in filename.lower():
+            continue
+        if folder and not any(folder in part.lower() for part in directory.replace("\\", "/").split("/")):
+            continue
+        refined.append(path)
+    return refined
+
+
+# Shared context, so standard and enhanced commands see each other's turns
+conversation = ConversationContext()
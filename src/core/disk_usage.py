@@ -0,0 +1,186 @@
+"""
+Disk Usage Module - Parallel, incrementally cached directory size analysis
+"""
+
+import heapq
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Tuple
+from . import config
+
+# What one directory holds directly: its mtime when listed, the bytes of its
+# own files, its subdirectory paths and its largest files as (bytes, path)
+DirUsage = namedtuple("DirUsage", ["mtime", "file_bytes", "subdirs", "largest_files"])
+
+UsageReport = namedtuple("UsageReport", [
+    "root", "total_bytes", "largest_dirs", "largest_files",
+    "dirs_scanned", "dirs_reused", "complete", "elapsed"
+])
+
+
+def format_size(num_bytes: int) -> str:
+    """Human readable size, e.g. 1.5 GB"""
+    size = float(num_bytes)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class DiskUsageAnalyzer:
+    """du-style analyzer that remembers what each directory held
+
+    A directory's own listing is reused while its mtime is unchanged, so a
+    re-run only stats directories instead of every file. Adding, removing
+    or renaming entries bumps the mtime; a file growing in place does not,
+    which is why the file watcher drops the parent's entry on change events.
+    """
+
+    def __init__(self, top_n: int = None, workers: int = None):
+        self.top_n = top_n or config.DISK_USAGE_TOP_N
+        self.workers = workers or config.FS_WALKER_WORKERS
+        self._cache: Dict[str, DirUsage] = {}
+        self._lock = threading.Lock()
+        self.last_report: Optional[UsageReport] = None
+
+    @staticmethod
+    def _entry_bytes(stat_result) -> int:
+        """Space a file occupies on disk (allocated blocks where available)"""
+        blocks = getattr(stat_result, "st_blocks", None)
+        return blocks * 512 if blocks is not None else stat_result.st_size
+
+    def _scan(self, path: str, device: int) -> Tuple[Optional[DirUsage], bool]:
+        """Return a directory's usage and whether it came from the cache"""
+        try:
+            mtime = os.stat(path, follow_symlinks=False).st_mtime
+        except OSError:
+            return None, False
+
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached.mtime == mtime:
+            return cached, True
+
+        file_bytes = 0
+        subdirs = []
+        largest: List[Tuple[int, str]] = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_symlink():
+                            continue
+                        stat_result = entry.stat(follow_symlinks=False)
+                        if entry.is_dir():
+                            # Stay on one filesystem, like du -x
+                            if stat_result.st_dev == device:
+                                subdirs.append(entry.path)
+                            continue
+                        size = self._entry_bytes(stat_result)
+                    except OSError:
+                        continue
+                    file_bytes += size
+                    if len(largest) < self.top_n:
+                        heapq.heappush(largest, (size, entry.path))
+                    elif size > largest[0][0]:
+                        heapq.heapreplace(largest, (size, entry.path))
+        except OSError:
+            # Skip directories we can't access
+            return None, False
+
+        usage = DirUsage(mtime, file_bytes, tuple(subdirs), tuple(largest))
+        with self._lock:
+            self._cache[path] = usage
+        return usage, False
+
+    def analyze(self, root: str, deadline: float = None) -> UsageReport:
+        """Size every directory under root and rank the largest directories and files
+
+        Runs until the walk finishes or the deadline (a time.monotonic()
+        value) passes; a partial run still warms the cache for the next one.
+        """
+        started = time.monotonic()
+        root = os.path.abspath(root)
+        visited: Dict[str, DirUsage] = {}
+        scanned = reused = 0
+        complete = True
+
+        try:
+            device = os.stat(root).st_dev
+        except OSError:
+            return UsageReport(root, 0, [], [], 0, 0, False, 0.0)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jp-du")
+        pending = {executor.submit(self._scan, root, device): root}
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    complete = False
+                    break
+                for future in done:
+                    path = pending.pop(future)
+                    usage, from_cache = future.result()
+                    if usage is None:
+                        continue
+                    visited[path] = usage
+                    if from_cache:
+                        reused += 1
+                    else:
+                        scanned += 1
+                    for subdir in usage.subdirs:
+                        pending[executor.submit(self._scan, subdir, device)] = subdir
+        except RuntimeError:
+            # The executor refuses new work once the interpreter is shutting down
+            complete = False
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        # Roll file bytes up into every ancestor, deepest directories first
+        totals = {path: usage.file_bytes for path, usage in visited.items()}
+        for path in sorted(visited, key=lambda p: p.count(os.sep), reverse=True):
+            parent = os.path.dirname(path)
+            if path != root and parent in totals:
+                totals[parent] += totals[path]
+
+        largest_dirs = heapq.nlargest(
+            self.top_n, ((size, path) for path, size in totals.items() if path != root)
+        )
+        largest_files = heapq.nlargest(
+            self.top_n, (item for usage in visited.values() for item in usage.largest_files)
+        )
+
+        if complete:
+            self._forget_missing(root, visited)
+
+        report = UsageReport(root, totals.get(root, 0), largest_dirs, largest_files,
+                             scanned, reused, complete, time.monotonic() - started)
+        self.last_report = report
+        return report
+
+    def _forget_missing(self, root: str, visited: Dict[str, DirUsage]) -> None:
+        """Drop cached directories under root that no longer exist"""
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            for path in [p for p in self._cache if p.startswith(prefix) and p not in visited]:
+                del self._cache[path]
+
+    def invalidate(self, path: str) -> None:
+        """Forget a directory's cached listing"""
+        with self._lock:
+            self._cache.pop(os.path.abspath(path), None)
+
+    def handle_file_event(self, event) -> None:
+        """FileWatcher listener: a changed file leaves its directory's mtime alone"""
+        for path in (event.path, event.dest_path):
+            if path:
+                self.invalidate(os.path.dirname(path))
+                if event.is_dir:
+                    self.invalidate(path)
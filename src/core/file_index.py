@@ -0,0 +1,469 @@
+"""
+File Index Module - Persistent on-disk index of files under the search roots
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional, Set
+from . import config
+from .fs_walker import ParallelWalker, is_pruned
+
+
+class FileIndex:
+    """SQLite-backed index of files, refreshed incrementally by directory mtime"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS roots (
+            path TEXT PRIMARY KEY,
+            indexed_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS dirs (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            mtime REAL NOT NULL,
+            PRIMARY KEY (root, path)
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            dir TEXT NOT NULL,
+            name TEXT NOT NULL,
+            ext TEXT NOT NULL,
+            PRIMARY KEY (root, path)
+        );
+        CREATE INDEX IF NOT EXISTS files_root_dir ON files(root, dir);
+        CREATE INDEX IF NOT EXISTS files_root_ext ON files(root, ext);
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or config.FILE_INDEX_PATH
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+        self._worker: Optional[threading.Thread] = None
+        self._pending: List[str] = []
+        self._pending_lock = threading.Lock()
+        # Roots whose watcher lost events and that await a forced refresh
+        self._resyncing: Set[str] = set()
+        self.watcher = None
+        # Bumped after every bulk build or refresh so derived indexes know to rebuild
+        self.generation = 0
+
+    # ------------------------------------------------------------------
+    # Root bookkeeping
+    # ------------------------------------------------------------------
+
+    def is_indexed(self, root: str) -> bool:
+        """Check whether a search root has been fully indexed"""
+        root = os.path.abspath(root)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM roots WHERE path = ?", (root,)
+            ).fetchone()
+        return row is not None
+
+    def last_indexed(self, root: str) -> Optional[float]:
+        """Get the time a root was last built or refreshed"""
+        root = os.path.abspath(root)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT indexed_at FROM roots WHERE path = ?", (root,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def file_count(self) -> int:
+        """Total number of files in the index"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Building and refreshing
+    # ------------------------------------------------------------------
+
+    def build_root(self, root: str) -> int:
+        """Index every file below a root, replacing any previous entries"""
+        root = os.path.abspath(root)
+        if not os.path.isdir(root):
+            return 0
+
+        with self._lock:
+            self._purge_root(root)
+        count = self._index_tree(root, root)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO roots (path, indexed_at) VALUES (?, ?)",
+                (root, time.time())
+            )
+            self._conn.commit()
+            self.generation += 1
+        return count
+
+    def refresh_root(self, root: str) -> int:
+        """Re-list only the directories whose mtime changed since the last pass"""
+        root = os.path.abspath(root)
+        if not self.is_indexed(root):
+            return self.build_root(root)
+
+        with self._lock:
+            known = dict(self._conn.execute(
+                "SELECT path, mtime FROM dirs WHERE root = ?", (root,)
+            ).fetchall())
+
+        changed = 0
+        for dir_path, mtime in known.items():
+            try:
+                current = os.stat(dir_path).st_mtime
+            except OSError:
+                with self._lock:
+                    self._remove_tree(root, dir_path)
+                changed += 1
+                continue
+
+            if current != mtime:
+                changed += self._rescan_dir(root, dir_path, current, known)
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE roots SET indexed_at = ? WHERE path = ?", (time.time(), root)
+            )
+            self._conn.commit()
+            if changed:
+                self.generation += 1
+        return changed
+
+    def ensure_fresh(self, roots: Iterable[str]) -> None:
+        """Build missing roots and refresh stale ones on a background thread"""
+        now = time.time()
+        stale = []
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            indexed_at = self.last_indexed(root)
+            # Watched roots receive changes as events, so only a slow safety-net refresh is needed
+            if self.is_watching(root):
+                max_age = config.FILE_INDEX_WATCHED_REFRESH_SECONDS
+            else:
+                max_age = config.FILE_INDEX_REFRESH_SECONDS
+            if indexed_at is None or now - indexed_at > max_age:
+                stale.append(os.path.abspath(root))
+        self._queue(stale)
+
+    def is_watching(self, root: str) -> bool:
+        """True when watcher events keep a root current, i.e. none were lost since its last refresh"""
+        root = os.path.abspath(root)
+        with self._pending_lock:
+            if root in self._resyncing:
+                return False
+        return bool(self.watcher and self.watcher.is_watching(root))
+
+    def _queue(self, roots: List[str], resync: bool = False) -> None:
+        """Refresh roots on the background worker, starting it if needed
+
+        A resync is queued even when the root is being refreshed right now,
+        since that pass may already have gone past the directories whose
+        events were lost; the root counts as unwatched until it completes.
+        """
+        with self._pending_lock:
+            for root in roots:
+                if resync:
+                    self._resyncing.add(root)
+                    if root not in self._pending[1:]:
+                        self._pending.append(root)
+                elif root not in self._pending:
+                    self._pending.append(root)
+
+            if self._pending and (self._worker is None or not self._worker.is_alive()):
+                self._worker = threading.Thread(target=self._drain_pending, daemon=True)
+                self._worker.start()
+
+    def _drain_pending(self) -> None:
+        """Process queued roots one at a time"""
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                root = self._pending[0]
+            try:
+                self.refresh_root(root)
+            except (sqlite3.Error, OSError) as e:
+                print(f"File index error for {root}: {e}")
+            finally:
+                with self._pending_lock:
+                    self._pending.remove(root)
+                    if root not in self._pending:
+                        self._resyncing.discard(root)
+
+    # ------------------------------------------------------------------
+    # Live updates
+    # ------------------------------------------------------------------
+
+    def attach_watcher(self, watcher) -> None:
+        """Apply a FileWatcher's events to the index as they arrive"""
+        self.watcher = watcher
+        watcher.add_listener(self.apply_event)
+
+    def _roots_containing(self, path: str) -> List[str]:
+        """Indexed roots that contain a path"""
+        with self._lock:
+            roots = [row[0] for row in self._conn.execute("SELECT path FROM roots")]
+        return [root for root in roots
+                if path == root or path.startswith(root.rstrip(os.sep) + os.sep)]
+
+    def apply_event(self, event) -> None:
+        """Update the rows affected by one FileEvent"""
+        if event.kind == "renamed":
+            self._apply_removal(event.path, event.is_dir)
+            self._apply_creation(event.dest_path, event.is_dir)
+        elif event.kind == "created":
+            self._apply_creation(event.path, event.is_dir)
+        elif event.kind == "deleted":
+            self._apply_removal(event.path, event.is_dir)
+        elif event.kind == "changed":
+            for root in self._roots_containing(event.path):
+                try:
+                    mtime = os.stat(event.path).st_mtime
+                except OSError:
+                    continue
+                with self._lock:
+                    known = dict(self._conn.execute(
+                        "SELECT path, mtime FROM dirs WHERE root = ? AND (path = ? OR (path >= ? AND path < ?))",
+                        (root, event.path) + self._prefix_range(event.path)
+                    ).fetchall())
+                self._rescan_dir(root, event.path, mtime, known)
+        elif event.kind == "overflow":
+            # Events were lost, so rescan now instead of waiting out the watched-root refresh age
+            self._queue(self._roots_containing(event.path), resync=True)
+
+    def _apply_creation(self, path: str, is_dir: bool) -> None:
+        """Add a newly created file or directory tree"""
+        for root in self._roots_containing(path):
+            if is_dir:
+                self._index_tree(root, path)
+            else:
+                with self._lock:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files (root, path, dir, name, ext) VALUES (?, ?, ?, ?, ?)",
+                        self._file_row(root, os.path.dirname(path), os.path.basename(path))
+                    )
+                    self._conn.commit()
+
+    def _apply_removal(self, path: str, is_dir: bool) -> None:
+        """Drop a deleted file or directory tree"""
+        for root in self._roots_containing(path):
+            with self._lock:
+                if is_dir:
+                    self._remove_tree(root, path)
+                else:
+                    self._conn.execute(
+                        "DELETE FROM files WHERE root = ? AND path = ?", (root, path)
+                    )
+                self._conn.commit()
+
+    def _index_tree(self, root: str, start: str) -> int:
+        """Walk a subtree and insert its directories and files"""
+        dir_rows = []
+        file_rows = []
+        count = 0
+
+        walker = ParallelWalker(config.SEARCH_EXCLUDED_DIRS, with_mtime=True)
+        for entry in walker.walk([start]):
+            dir_rows.append((root, entry.path, entry.mtime))
+            for name in entry.files:
+                file_rows.append(self._file_row(root, entry.path, name))
+            count += len(entry.files)
+
+            if len(file_rows) >= config.FILE_INDEX_BATCH_SIZE:
+                self._insert(dir_rows, file_rows)
+                dir_rows, file_rows = [], []
+
+        self._insert(dir_rows, file_rows)
+        return count
+
+    def _rescan_dir(self, root: str, dir_path: str, mtime: float, known: dict) -> int:
+        """Replace the direct children of one directory"""
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError:
+            return 0
+
+        names = []
+        subdirs = set()
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink() and not is_pruned(entry.name, config.SEARCH_EXCLUDED_DIRS):
+                        subdirs.add(entry.path)
+                else:
+                    names.append(entry.name)
+            except OSError:
+                continue
+
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE root = ? AND dir = ?", (root, dir_path))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (root, path, dir, name, ext) VALUES (?, ?, ?, ?, ?)",
+                [self._file_row(root, dir_path, name) for name in names]
+            )
+            self._conn.execute(
+                "UPDATE dirs SET mtime = ? WHERE root = ? AND path = ?", (mtime, root, dir_path)
+            )
+
+            # Drop subdirectories that disappeared since the last pass
+            prefix = dir_path.rstrip(os.sep) + os.sep
+            for known_dir in list(known):
+                if (known_dir.startswith(prefix) and known_dir not in subdirs
+                        and os.path.dirname(known_dir) == dir_path):
+                    self._remove_tree(root, known_dir)
+            self._conn.commit()
+
+        # Index subdirectories that appeared since the last pass
+        for subdir in subdirs:
+            if subdir not in known:
+                self._index_tree(root, subdir)
+        return 1
+
+    def _insert(self, dir_rows: list, file_rows: list) -> None:
+        """Insert a batch of rows in a single transaction"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs (root, path, mtime) VALUES (?, ?, ?)", dir_rows
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (root, path, dir, name, ext) VALUES (?, ?, ?, ?, ?)",
+                file_rows
+            )
+            self._conn.commit()
+
+    def _remove_tree(self, root: str, dir_path: str) -> None:
+        """Delete a directory and everything below it"""
+        below = self._prefix_range(dir_path)
+        self._conn.execute(
+            "DELETE FROM files WHERE root = ? AND (dir = ? OR (dir >= ? AND dir < ?))",
+            (root, dir_path) + below
+        )
+        self._conn.execute(
+            "DELETE FROM dirs WHERE root = ? AND (path = ? OR (path >= ? AND path < ?))",
+            (root, dir_path) + below
+        )
+
+    def _purge_root(self, root: str) -> None:
+        """Remove every row belonging to a root"""
+        self._conn.execute("DELETE FROM files WHERE root = ?", (root,))
+        self._conn.execute("DELETE FROM dirs WHERE root = ?", (root,))
+        self._conn.execute("DELETE FROM roots WHERE path = ?", (root,))
+
+    @staticmethod
+    def _file_row(root: str, dir_path: str, name: str) -> tuple:
+        """Build a files-table row"""
+        return (root, os.path.join(dir_path, name), dir_path, name,
+                os.path.splitext(name)[1].lower())
+
+    @staticmethod
+    def _prefix_range(dir_path: str) -> tuple:
+        """Bounds of the paths below a directory, for "path >= ? AND path < ?"
+
+        Unlike LIKE, which ignores ASCII case in SQLite, the comparison is
+        exact, so /home/u/Docs never takes in /home/u/docs on
+        case-sensitive filesystems. It can also use the primary key index.
+        """
+        prefix = dir_path.rstrip(os.sep) + os.sep
+        # Every path starting with the prefix sorts before the prefix with its separator bumped
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    @staticmethod
+    def _like_prefix(prefix: str) -> str:
+        """Escape a path for use as a LIKE prefix pattern"""
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return escaped + '%'
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize_extension(extension: str) -> str:
+        """Lower-case an extension and make sure it starts with a dot"""
+        extension = extension.lower()
+        return extension if extension.startswith('.') else '.' + extension
+
+    def find_by_extension(self, root: str, extension: str, limit: int = None,
+                          excluded_dirs: Iterable[str] = ()) -> List[str]:
+        """Find indexed files under a root with the given extension"""
+        return self.find_by_extensions(root, [extension], limit, excluded_dirs)
+
+    def find_by_extensions(self, root: str, extensions: Iterable[str], limit: int = None,
+                           excluded_dirs: Iterable[str] = ()) -> List[str]:
+        """Find indexed files under a root matching any of the given extensions"""
+        root = os.path.abspath(root)
+        extensions = sorted({self.normalize_extension(ext) for ext in extensions})
+        if not extensions:
+            return []
+
+        placeholders = ", ".join("?" * len(extensions))
+        sql = f"SELECT path FROM files WHERE root = ? AND ext IN ({placeholders})"
+        params = [root] + extensions
+        for name in excluded_dirs:
+            # Skip files whose path below the root passes through an excluded directory
+            sql += " AND instr(substr(dir, ?) || ?, ?) = 0"
+            params.extend([len(root) + 1, os.sep, os.sep + name + os.sep])
+        sql += " ORDER BY path"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def find_by_name(self, root: str, term: str, limit: int = None) -> List[str]:
+        """Find indexed files under a root whose name contains a term"""
+        root = os.path.abspath(root)
+        pattern = '%' + self._like_prefix(term)[:-1] + '%'
+
+        sql = "SELECT path FROM files WHERE root = ? AND name LIKE ? ESCAPE '\\' ORDER BY path"
+        params = [root, pattern]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def iter_paths(self, batch_size: int = None) -> Iterator[str]:
+        """Yield every distinct indexed path, fetching in batches"""
+        batch_size = batch_size or config.FILE_INDEX_BATCH_SIZE
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT path FROM files WHERE path > ? ORDER BY path LIMIT ?",
+                    (last, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+            last = rows[-1][0]
+
+    def paths_under(self, dir_path: str) -> List[str]:
+        """Every distinct indexed path below a directory"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT path FROM files WHERE path >= ? AND path < ?", self._prefix_range(dir_path)
+            )]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
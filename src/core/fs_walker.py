@@ -0,0 +1,91 @@
+"""
+Filesystem Walker Module - Parallel os.scandir traversal shared by file searches
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, Optional
+from . import config
+
+# One scanned directory: its path, owning root, pruned subdirectory paths,
+# plain file names and (when requested) the directory's own mtime
+WalkEntry = namedtuple("WalkEntry", ["path", "root", "subdirs", "files", "mtime"])
+
+
+def is_pruned(name: str, excluded_dirs: Iterable[str]) -> bool:
+    """Check whether a directory should be skipped during a search"""
+    return name.startswith('.') or name in excluded_dirs
+
+
+class ParallelWalker:
+    """Walks several roots at once, one scandir call per directory on a thread pool"""
+
+    def __init__(self, excluded_dirs: Iterable[str] = None, workers: int = None,
+                 with_mtime: bool = False):
+        self.excluded_dirs = frozenset(
+            config.SEARCH_EXCLUDED_DIRS if excluded_dirs is None else excluded_dirs
+        )
+        self.workers = workers or config.FS_WALKER_WORKERS
+        self.with_mtime = with_mtime
+
+    def _scan(self, path: str, root: str) -> Optional[WalkEntry]:
+        """List one directory, splitting entries into subdirectories and files"""
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        # DirEntry caches d_type, so this rarely needs a stat call
+                        if entry.is_dir():
+                            # Same as os.walk: symlinked directories are not descended
+                            if not entry.is_symlink() and not is_pruned(entry.name, self.excluded_dirs):
+                                subdirs.append(entry.path)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+            mtime = os.stat(path).st_mtime if self.with_mtime else None
+        except OSError:
+            # Skip directories we can't access
+            return None
+        return WalkEntry(path, root, subdirs, files, mtime)
+
+    def walk(self, roots: Iterable[str], max_dirs: int = None) -> Iterator[WalkEntry]:
+        """Yield scanned directories from all roots as soon as each one is listed
+
+        Every directory is its own task, so large subtrees spread across the
+        pool instead of pinning one worker per root. Closing the generator
+        early cancels the directories still queued.
+        """
+        submitted = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jp-walker")
+        pending = set()
+        try:
+            for root in roots:
+                if os.path.isdir(root):
+                    pending.add(executor.submit(self._scan, root, root))
+                    submitted += 1
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = future.result()
+                    if entry is None:
+                        continue
+
+                    for subdir in entry.subdirs:
+                        # Prevent searching too deep
+                        if max_dirs and submitted >= max_dirs:
+                            break
+                        pending.add(executor.submit(self._scan, subdir, entry.root))
+                        submitted += 1
+                    yield entry
+        except RuntimeError:
+            # The executor refuses new work once the interpreter is shutting down
+            return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,359 @@
+"""
+Filesystem Watcher Module - Pushes file changes under the search roots to listeners
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from . import config
+from .fs_walker import ParallelWalker, is_pruned
+
+# kind is one of the FileWatcher event constants; dest_path is only set for renames.
+# A created or renamed directory implies that everything inside it is new as well.
+FileEvent = namedtuple("FileEvent", ["kind", "path", "is_dir", "dest_path"])
+
+
+class FileWatcher:
+    """Base watcher: keeps the listener list and the background thread"""
+
+    CREATED = "created"
+    DELETED = "deleted"
+    RENAMED = "renamed"
+    CHANGED = "changed"    # A directory changed in a way the watcher cannot describe
+    OVERFLOW = "overflow"  # Events were lost; the path should be rescanned
+
+    backend = "none"
+
+    def __init__(self, excluded_dirs: Iterable[str] = None):
+        self.excluded_dirs = frozenset(
+            config.SEARCH_EXCLUDED_DIRS if excluded_dirs is None else excluded_dirs
+        )
+        self.roots: List[str] = []
+        self._listeners: List[Callable[[FileEvent], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def add_listener(self, callback: Callable[[FileEvent], None]) -> None:
+        """Register a callback that receives every FileEvent"""
+        self._listeners.append(callback)
+
+    def is_watching(self, root: str) -> bool:
+        """True when every directory below a root is covered by the watcher"""
+        return False
+
+    def start(self, roots: Iterable[str]) -> None:
+        """Start watching the given roots on a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self.roots = [os.path.abspath(root) for root in roots if os.path.isdir(root)]
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"jp-watcher-{self.backend}")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+    def _emit(self, kind: str, path: str, is_dir: bool = False, dest_path: str = None) -> None:
+        """Send an event to every listener, isolating listener failures"""
+        event = FileEvent(kind, path, is_dir, dest_path)
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"File watcher listener error: {e}")
+
+
+class InotifyWatcher(FileWatcher):
+    """Linux watcher built on inotify through ctypes"""
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+                  IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct("iIII")
+
+    backend = "inotify"
+
+    def __init__(self, excluded_dirs: Iterable[str] = None, max_watches: int = None):
+        super().__init__(excluded_dirs)
+        self.max_watches = max_watches or config.WATCHER_MAX_WATCHES
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # The watch-descriptor table is capped at max_watches entries
+        self._watches: Dict[int, str] = {}
+        self._paths: Dict[str, int] = {}
+        self._overflowed_roots: Set[str] = set()
+        self._wake_read, self._wake_write = os.pipe()
+
+    @staticmethod
+    def _load_libc():
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+
+    @property
+    def watch_count(self) -> int:
+        """Number of directories currently watched"""
+        return len(self._watches)
+
+    def is_watching(self, root: str) -> bool:
+        root = os.path.abspath(root)
+        return root in self._paths and root not in self._overflowed_roots
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        try:
+            os.write(self._wake_write, b"x")
+        except OSError:
+            pass
+        super().stop()
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _owning_root(self, path: str) -> Optional[str]:
+        for root in self.roots:
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def _add_watch(self, path: str) -> bool:
+        """Watch one directory; returns False once the watch limit is reached"""
+        if path in self._paths:
+            return True
+
+        root = self._owning_root(path)
+        if len(self._watches) >= self.max_watches:
+            self._mark_overflow(root, "configured watch limit reached")
+            return False
+
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self._mark_overflow(root, "system inotify watch limit reached")
+                return False
+            # Directory vanished or is unreadable; nothing to watch
+            return True
+
+        self._watches[wd] = path
+        self._paths[path] = wd
+        return True
+
+    def _mark_overflow(self, root: Optional[str], reason: str) -> None:
+        """Stop adding watches for a root and let the index fall back to mtime refreshes"""
+        if root and root not in self._overflowed_roots:
+            self._overflowed_roots.add(root)
+            print(f"⚠️ File watcher: {reason}; {root} falls back to periodic index refreshes")
+
+    def _watch_tree(self, start: str) -> None:
+        """Add watches for a directory and everything below it"""
+        walk = ParallelWalker(self.excluded_dirs).walk([start])
+        try:
+            for entry in walk:
+                if not self._add_watch(entry.path):
+                    break
+        finally:
+            walk.close()
+
+    def _remove_tree(self, path: str) -> None:
+        """Forget watches for a directory that went away"""
+        prefix = path.rstrip(os.sep) + os.sep
+        for watched in [p for p in self._paths if p == path or p.startswith(prefix)]:
+            wd = self._paths.pop(watched)
+            self._watches.pop(wd, None)
+
+    def _run(self) -> None:
+        for root in self.roots:
+            self._watch_tree(root)
+
+        while not self._stop_event.is_set():
+            try:
+                readable, _, _ = select.select([self._fd, self._wake_read], [], [])
+            except (OSError, ValueError):
+                break
+            if self._fd not in readable:
+                continue
+
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                break
+            self._handle_events(data)
+
+    def _handle_events(self, data: bytes) -> None:
+        """Decode a buffer of inotify events and emit FileEvents"""
+        pending_moves: Dict[int, tuple] = {}
+        offset = 0
+
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                for root in self.roots:
+                    self._emit(self.OVERFLOW, root, is_dir=True)
+                continue
+
+            if mask & self.IN_IGNORED:
+                path = self._watches.pop(wd, None)
+                if path is not None:
+                    self._paths.pop(path, None)
+                continue
+
+            parent = self._watches.get(wd)
+            if parent is None:
+                continue
+            path = os.path.join(parent, name) if name else parent
+            is_dir = bool(mask & self.IN_ISDIR)
+            if is_dir and name and is_pruned(name, self.excluded_dirs):
+                continue
+
+            if mask & self.IN_CREATE:
+                # Watch new directories before announcing them, so files created
+                # while listeners index the directory still produce events
+                if is_dir:
+                    self._watch_tree(path)
+                self._emit(self.CREATED, path, is_dir)
+            elif mask & self.IN_DELETE:
+                self._emit(self.DELETED, path, is_dir)
+                if is_dir:
+                    self._remove_tree(path)
+            elif mask & self.IN_MOVED_FROM:
+                pending_moves[cookie] = (path, is_dir)
+            elif mask & self.IN_MOVED_TO:
+                source = pending_moves.pop(cookie, None)
+                if is_dir:
+                    if source:
+                        self._remove_tree(source[0])
+                    self._watch_tree(path)
+                if source:
+                    self._emit(self.RENAMED, source[0], is_dir, dest_path=path)
+                else:
+                    self._emit(self.CREATED, path, is_dir)
+            elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF) and path in self.roots:
+                self._emit(self.DELETED, path, is_dir=True)
+
+        # Moved out of the watched roots: treat as deleted
+        for path, is_dir in pending_moves.values():
+            self._emit(self.DELETED, path, is_dir)
+            if is_dir:
+                self._remove_tree(path)
+
+
+class PollingWatcher(FileWatcher):
+    """Portable watcher that compares directory mtimes on a timer"""
+
+    backend = "polling"
+
+    def __init__(self, excluded_dirs: Iterable[str] = None, interval: float = None,
+                 max_watches: int = None):
+        super().__init__(excluded_dirs)
+        self.interval = interval or config.WATCHER_POLL_INTERVAL
+        self.max_watches = max_watches or config.WATCHER_MAX_WATCHES
+        self._mtimes: Dict[str, float] = {}
+        self._overflowed_roots: Set[str] = set()
+
+    def is_watching(self, root: str) -> bool:
+        root = os.path.abspath(root)
+        return root in self._mtimes and root not in self._overflowed_roots
+
+    def _track_tree(self, start: str) -> None:
+        """Record mtimes for a directory and everything below it"""
+        walk = ParallelWalker(self.excluded_dirs, with_mtime=True).walk([start])
+        try:
+            for entry in walk:
+                if len(self._mtimes) >= self.max_watches:
+                    root = next((r for r in self.roots if entry.path.startswith(r)), None)
+                    if root and root not in self._overflowed_roots:
+                        self._overflowed_roots.add(root)
+                        print(f"⚠️ File watcher: poll limit reached; {root} falls back to periodic index refreshes")
+                    break
+                self._mtimes[entry.path] = entry.mtime
+        finally:
+            walk.close()
+
+    def _run(self) -> None:
+        for root in self.roots:
+            self._track_tree(root)
+
+        while not self._stop_event.wait(self.interval):
+            self._poll()
+
+    def _poll(self) -> None:
+        """Stat every tracked directory and report the ones that changed"""
+        for path, mtime in list(self._mtimes.items()):
+            if path not in self._mtimes:
+                continue  # Removed together with a parent earlier in this pass
+            try:
+                current = os.stat(path).st_mtime
+            except OSError:
+                prefix = path.rstrip(os.sep) + os.sep
+                for tracked in [p for p in self._mtimes if p == path or p.startswith(prefix)]:
+                    del self._mtimes[tracked]
+                self._emit(self.DELETED, path, is_dir=True)
+                continue
+
+            if current != mtime:
+                self._mtimes[path] = current
+                self._emit(self.CHANGED, path, is_dir=True)
+                self._track_new_subdirs(path)
+
+    def _track_new_subdirs(self, path: str) -> None:
+        """Start tracking subdirectories that appeared in a changed directory"""
+        try:
+            with os.scandir(path) as it:
+                new_dirs = [entry.path for entry in it
+                            if entry.is_dir() and not entry.is_symlink()
+                            and not is_pruned(entry.name, self.excluded_dirs)
+                            and entry.path not in self._mtimes]
+        except OSError:
+            return
+        for new_dir in new_dirs:
+            self._emit(self.CREATED, new_dir, is_dir=True)
+            self._track_tree(new_dir)
+
+
+def create_watcher(excluded_dirs: Iterable[str] = None) -> FileWatcher:
+    """Create the best watcher available on this platform"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(excluded_dirs)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify unavailable, falling back to polling: {e}")
+    return PollingWatcher(excluded_dirs)
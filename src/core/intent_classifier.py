@@ -0,0 +1,172 @@
+"""
+Intent Classifier Module - Hashed n-gram features with a NumPy softmax model
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from . import config
+from .intent_router import tokenize
+
+
+def load_examples(path: str) -> Tuple[List[str], List[str]]:
+    """Utterances and intents from a JSONL file of {"text": ..., "intent": ...}"""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            example = json.loads(line)
+            texts.append(example["text"])
+            labels.append(example["intent"])
+    return texts, labels
+
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed bag-of-words features
+
+    Each utterance becomes word unigrams, word bigrams and character
+    trigrams hashed into a fixed-size vector (so unseen words still share
+    features with known ones, e.g. "optimise" and "optimize"). A batch of
+    utterances is scored with one matrix multiply, and training is plain
+    full-batch gradient descent, so everything runs on the CPU in well
+    under a second for a few hundred examples.
+    """
+
+    def __init__(self, intents: Iterable[str] = (), n_features: int = None):
+        self.intents: List[str] = list(intents)
+        self.n_features = n_features or config.INTENT_CLASSIFIER_FEATURES
+        self.weights = np.zeros((self.n_features, len(self.intents)), dtype=np.float32)
+        self.bias = np.zeros(len(self.intents), dtype=np.float32)
+        # Checksum of the data the model was trained on, to spot stale saved models
+        self.fingerprint = 0
+
+    def _hashed_features(self, text: str) -> List[int]:
+        tokens = tokenize(text)
+        grams = [f"w:{token}" for token in tokens]
+        grams += [f"b:{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        for token in tokens:
+            padded = f"<{token}>"
+            grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        # crc32 rather than hash(): string hashes change between runs
+        return [zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in grams]
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), n_features) matrix of L2-normalised feature counts"""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(matrix[row], self._hashed_features(text), 1.0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-9)
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        scores = scores - scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def fit(self, texts: List[str], labels: List[str], epochs: int = 300,
+            learning_rate: float = 50.0, l2: float = 1e-5) -> float:
+        """Train on labelled utterances; returns the final cross-entropy loss"""
+        self.intents = sorted(set(labels))
+        index = {intent: i for i, intent in enumerate(self.intents)}
+        features = self.vectorize(texts)
+        targets = np.zeros((len(texts), len(self.intents)), dtype=np.float32)
+        targets[np.arange(len(texts)), [index[label] for label in labels]] = 1.0
+
+        self.weights = np.zeros((self.n_features, len(self.intents)), dtype=np.float32)
+        self.bias = np.zeros(len(self.intents), dtype=np.float32)
+        loss = 0.0
+        for _ in range(epochs):
+            probabilities = self._softmax(features @ self.weights + self.bias)
+            error = (probabilities - targets) / len(texts)
+            self.weights -= learning_rate * (features.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+            loss = float(-np.mean(np.log(probabilities[targets > 0] + 1e-9)))
+        return loss
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), len(intents)) probabilities, scored in one matrix multiply"""
+        return self._softmax(self.vectorize(texts) @ self.weights + self.bias)
+
+    def classify_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """The most likely intent and its probability for each utterance"""
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.intents[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        return self.classify_batch([text])[0]
+
+    def probabilities(self, text: str) -> Dict[str, float]:
+        """Probability of every intent for one utterance"""
+        return dict(zip(self.intents, self.predict_proba([text])[0].tolist()))
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, weights=self.weights, bias=self.bias,
+                 intents=np.array(self.intents), fingerprint=np.array(self.fingerprint))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            classifier = cls(data["intents"].tolist(), n_features=data["weights"].shape[0])
+            classifier.weights = data["weights"]
+            classifier.bias = data["bias"]
+            classifier.fingerprint = int(data["fingerprint"])
+        return classifier
+
+
+_classifier: Optional[IntentClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def _training_data() -> Tuple[List[str], List[str]]:
+    """Labelled examples plus every registered command's trigger phrases"""
+    from .command_registry import registry
+
+    texts, labels = [], []
+    if os.path.exists(config.INTENT_TRAINING_PATH):
+        texts, labels = load_examples(config.INTENT_TRAINING_PATH)
+    for spec in registry.specs():
+        for phrase in spec.phrases:
+            texts.append(phrase)
+            labels.append(spec.intent)
+    return texts, labels
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Shared classifier, loaded from disk or retrained when its training data changed"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is not None:
+            return _classifier
+
+        texts, labels = _training_data()
+        fingerprint = zlib.crc32(json.dumps([texts, labels, config.INTENT_CLASSIFIER_FEATURES]).encode("utf-8"))
+        try:
+            classifier = IntentClassifier.load(config.INTENT_MODEL_PATH)
+            if classifier.fingerprint != fingerprint:
+                classifier = None
+        except (OSError, KeyError, ValueError):
+            classifier = None
+
+        if classifier is None:
+            classifier = IntentClassifier()
+            classifier.fit(texts, labels)
+            classifier.fingerprint = fingerprint
+            try:
+                classifier.save(config.INTENT_MODEL_PATH)
+            except OSError as e:
+                print(f"⚠️ Could not save intent model: {e}")
+
+        _classifier = classifier
+        return _classifier
@@ -0,0 +1,98 @@
+"""
+Intent Router Module - Single-pass phrase matching over whole words
+"""
+
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# intent: the matched route, phrase: the trigger words, start/end: token span
+IntentMatch = namedtuple("IntentMatch", ["intent", "phrase", "start", "end", "priority"])
+
+# Apostrophes split words, so "what's" and "how's" become "what s" / "how s"
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of an utterance or trigger phrase"""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ("children", "routes")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # (priority, intent, phrase) of every route whose phrase ends here
+        self.routes: List[Tuple[int, str, str]] = []
+
+
+class IntentRouter:
+    """Token trie of trigger phrases with explicit priorities
+
+    Phrases match whole words only, so "hi" no longer fires inside "this".
+    matches() walks the trie once from each token, and the walk from a
+    token ends as soon as no phrase continues, so an utterance costs
+    O(words x longest phrase) dictionary lookups no matter how many
+    phrases are registered. Lower priority numbers win; among equal
+    priorities the earliest match in the utterance wins.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._next_priority = 0
+        self.intents: List[str] = []
+
+    def add(self, intent: str, phrases: Iterable[str], priority: int = None) -> int:
+        """Register trigger phrases; without a priority, later intents rank lower"""
+        if priority is None:
+            priority = self._next_priority
+        self._next_priority = max(self._next_priority, priority + 1)
+        if intent not in self.intents:
+            self.intents.append(intent)
+
+        for phrase in phrases:
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.children.setdefault(token, _Node())
+            route = (priority, intent, " ".join(tokens))
+            if route not in node.routes:
+                node.routes.append(route)
+        return priority
+
+    def add_routes(self, routes: Dict[str, Iterable[str]]) -> None:
+        """Register several intents, ranked in dict order"""
+        for intent, phrases in routes.items():
+            self.add(intent, phrases)
+
+    def matches(self, text: str, tokens: List[str] = None) -> List[IntentMatch]:
+        """Every phrase occurrence in the utterance, in order of position"""
+        tokens = tokenize(text) if tokens is None else tokens
+        found = []
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.children.get(tokens[end])
+                if node is None:
+                    break
+                for priority, intent, phrase in node.routes:
+                    found.append(IntentMatch(intent, phrase, start, end + 1, priority))
+        return found
+
+    @staticmethod
+    def best(matches: List[IntentMatch], intents: Iterable[str] = None) -> Optional[IntentMatch]:
+        """Highest-priority match, optionally only among the given intents"""
+        best = None
+        for match in matches:
+            if intents is not None and match.intent not in intents:
+                continue
+            if best is None or match.priority < best.priority:
+                best = match
+        return best
+
+    def route(self, text: str, intents: Iterable[str] = None) -> Optional[IntentMatch]:
+        """The highest-priority intent mentioned in the utterance, if any"""
+        return self.best(self.matches(text), intents)
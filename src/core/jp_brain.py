@@ -9,14 +9,22 @@ import threading
 import time
 import os
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 
 # Add utils to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
 from file_manager import FileManager
 
 from .jp_config import *
-from .system_manager import SystemManager
+from .config import (MAX_NAME_SEARCH_RESULTS, SEARCH_TIME_BUDGET, SEARCH_FIRST_RESULTS_DELAY,
+                     RECLAIM_CONFIRM_SECONDS, OPTIMIZE_DISK_SCAN_BUDGET, PSI_CLEAR_PERCENT)
+from .disk_usage import format_size
+from .command_registry import ENHANCED, registry
+from .conversation_context import conversation
+from .intent_router import IntentMatch, IntentRouter
+from .metrics_series import MetricSeries, MetricsHistory
+from .pressure_monitor import PressureMonitor, read_pressure
+from .scheduler import AlertGate, JobScheduler
 
 class JPPersonality:
     """JP Assistant personality and response management"""
@@ -24,7 +32,6 @@ class JPPersonality:
     def __init__(self, user_name: str = "Boss"):
         self.user_name = user_name
         self.personality = VOICE_PERSONALITIES[PERSONALITY]
-        self.context_memory = []
         self.conversation_count = 0
         
     def get_time_greeting(self) -> str:
@@ -68,37 +75,52 @@ class JPBrain:
     def __init__(self):
         self.personality = JPPersonality()
         self.file_manager = FileManager()
-        self.system_manager = SystemManager()
-        self.context_history = []
+        # Created on first use, so importing the brain doesn't load psutil and the file search stack
+        self._system_manager = None
+        self._system_manager_lock = threading.Lock()
+        # Recent turns and their results, shared with the standard commands
+        self.context_history = conversation
         self.user_patterns = {}
         self.learning_data = self.file_manager.load_json("jp_learning.json") or {}
+        # Cleanup preview awaiting confirmation: (plans, time.monotonic() when shown)
+        self.pending_cleanup: Optional[tuple] = None
+        # Called with an interim message while long searches are still running
+        self.partial_result_callback: Optional[Callable[[str], None]] = None
+        
+    @property
+    def system_manager(self):
+        """Shared SystemManager, imported and created on first access"""
+        with self._system_manager_lock:
+            if self._system_manager is None:
+                from .system_manager import SystemManager
+                self._system_manager = SystemManager()
+            return self._system_manager
+    
+    @property
+    def has_system_manager(self) -> bool:
+        return self._system_manager is not None
         
     def analyze_intent(self, command: str) -> Dict[str, Any]:
-        """Smart intent analysis"""
-        command = command.lower().strip()
+        """Smart intent analysis
+        
+        probabilities covers every registered command; the trigger phrase
+        match (or the classifier's top guess) is the primary intent.
+        """
+        # Imported here so NumPy only loads when an analysis is asked for
+        from .intent_classifier import get_intent_classifier
         
         intent_analysis = {
             "primary_intent": None,
             "confidence": 0.0,
+            "probabilities": get_intent_classifier().probabilities(command),
             "suggested_actions": []
         }
         
         # Enhanced intent classification
-        if any(word in command for word in ["analyze", "scan", "check", "status", "diagnose"]):
-            intent_analysis["primary_intent"] = "system_analysis"
-            intent_analysis["confidence"] = 0.9
-            
-        elif any(word in command for word in ["optimize", "improve", "speed", "boost", "clean"]):
-            intent_analysis["primary_intent"] = "optimization"
-            intent_analysis["confidence"] = 0.85
-            
-        elif any(word in command for word in ["learn", "remember", "adapt", "smart"]):
-            intent_analysis["primary_intent"] = "learning"
-            intent_analysis["confidence"] = 0.8
-            
-        elif any(word in command for word in ["suggest", "recommend", "advice", "think", "should"]):
-            intent_analysis["primary_intent"] = "smart_assistance"
-            intent_analysis["confidence"] = 0.85
+        match = IntentRouter.best(registry.matches(command))
+        if match:
+            intent_analysis["primary_intent"] = match.intent
+            intent_analysis["confidence"] = intent_analysis["probabilities"].get(match.intent, 0.0)
             
         return intent_analysis
     
@@ -123,56 +145,27 @@ class JPBrain:
                 suggestions.append("High CPU usage detected - system optimization recommended")
             
             if system_info.get('disk_percent', 0) > 80:
-                suggestions.append("Disk space getting low - cleanup recommended")
+                report = self.system_manager.get_last_disk_usage_report()
+                if report and report.largest_dirs:
+                    size, path = report.largest_dirs[0]
+                    suggestions.append(f"Disk space getting low - {os.path.basename(path)} "
+                                       f"is using {format_size(size)}")
+                else:
+                    suggestions.append("Disk space getting low - ask me what is using your disk")
         
         return suggestions[:3]  # Limit to 3 suggestions
     
-    def process_enhanced_command(self, command: str) -> str:
-        """Process commands with enhanced intelligence"""
-        intent = self.analyze_intent(command)
-        command_lower = command.lower()
-        
-        # Enhanced system commands
-        if any(phrase in command_lower for phrase in ENHANCED_COMMANDS["system_analysis"]):
-            return self.perform_system_analysis()
-            
-        elif any(phrase in command_lower for phrase in ENHANCED_COMMANDS["optimization"]):
-            return self.perform_system_optimization()
-            
-        elif any(phrase in command_lower for phrase in ENHANCED_COMMANDS["smart_assistance"]):
-            return self.provide_smart_assistance()
-            
-        elif any(phrase in command_lower for phrase in ENHANCED_COMMANDS["learning"]):
-            return self.activate_learning_mode()
-            
-        # Enhanced file search commands
-        elif any(phrase in command_lower for phrase in ["find all", "search all", "system-wide search", "search entire system"]):
-            return self.perform_system_wide_search(command)
-            
-        elif any(phrase in command_lower for phrase in ["drive usage", "disk usage", "all drives", "check drives"]):
-            return self.check_all_drives()
-            
-        elif "find music" in command_lower or "all music files" in command_lower:
-            return self.find_all_music_files()
-            
-        elif "find videos" in command_lower or "all video files" in command_lower:
-            return self.find_all_video_files()
-            
-        elif "find images" in command_lower or "all photos" in command_lower:
-            return self.find_all_image_files()
-            
-        # Smart contextual responses
-        elif "how are you" in command_lower or "how's it going" in command_lower:
-            return self.provide_status_update()
-            
-        elif "what can you do" in command_lower or "capabilities" in command_lower:
-            return self.describe_capabilities()
-            
-        elif "improve yourself" in command_lower or "get better" in command_lower:
-            return self.self_improvement_mode()
-            
-        return None  # Command not handled by enhanced processing
+    def process_enhanced_command(self, command: str, matches: List[IntentMatch] = None) -> str:
+        """Process commands with enhanced intelligence
+        
+        matches are the router's matches for the command, when the caller
+        already computed them for the standard command processor too.
+        Handlers are the methods below registered with registry.command.
+        """
+        # None when no enhanced command matches, so the standard processor runs
+        return registry.dispatch(ENHANCED, self, command, matches)
     
+    @registry.command("system_analysis", ENHANCED_COMMANDS["system_analysis"], priority=100, group=ENHANCED)
     def perform_system_analysis(self) -> str:
         """Comprehensive system analysis"""
         system_info = self.system_manager.get_system_info()
@@ -206,6 +199,7 @@ class JPBrain:
         
         return self.personality.personalize_response("task_complete", "\n".join(analysis))
     
+    @registry.command("optimization", ENHANCED_COMMANDS["optimization"], priority=130, group=ENHANCED)
     def perform_system_optimization(self) -> str:
         """Intelligent system optimization"""
         system_info = self.system_manager.get_system_info()
@@ -217,35 +211,102 @@ class JPBrain:
         optimizations.append("⚡ Smart System Optimization")
         optimizations.append("━" * 28)
         
-        improvements = 0
+        findings = 0
         
         if system_info['cpu'] > 60:
             optimizations.append("🔧 CPU Optimization:")
-            optimizations.append("   • Background process management")
-            optimizations.append("   • Priority adjustment")
-            improvements += 1
+            for process in self.system_manager.get_top_processes("cpu", 3):
+                optimizations.append(f"   • {process.name} is using {process.cpu_percent:.0f}% CPU")
+            findings += 1
             
         if system_info['memory_used'] > 70:
             optimizations.append("🧹 Memory Optimization:")
-            optimizations.append("   • Cache cleanup")
-            optimizations.append("   • Memory defragmentation")
-            improvements += 1
+            for process in self.system_manager.get_top_processes("memory", 3):
+                optimizations.append(f"   • {process.name} is holding {format_size(process.rss)}")
+            findings += 1
             
         if system_info['disk_percent'] > 75:
             optimizations.append("💾 Storage Optimization:")
-            optimizations.append("   • Temporary file cleanup")
-            optimizations.append("   • System file organization")
-            improvements += 1
-        
-        if improvements == 0:
+            # Reuse the last disk space scan; without one, take only a quick look
+            report = (self.system_manager.get_last_disk_usage_report()
+                      or self.system_manager.get_disk_usage_report(time_budget=OPTIMIZE_DISK_SCAN_BUDGET))
+            for size, path in report.largest_dirs[:3]:
+                optimizations.append(f"   • Review {os.path.relpath(path, report.root)} ({format_size(size)})")
+            for size, path in report.largest_files[:3]:
+                optimizations.append(f"   • Large file {os.path.basename(path)} ({format_size(size)})")
+            if not report.complete:
+                optimizations.append("   • Say 'biggest files' for a full scan")
+            findings += 1
+        
+        cleanup = self._plan_cleanup()
+        if cleanup:
+            optimizations.append(cleanup)
+            findings += 1
+        
+        if findings == 0:
             optimizations.append("✅ System already running optimally!")
             optimizations.append("No immediate optimizations needed.")
         else:
-            optimizations.append(f"\n✅ Applied {improvements} optimization(s)")
-            optimizations.append("System performance improved!")
+            # Nothing has been changed yet; only the confirmed cleanup applies anything
+            optimizations.append(f"\n📋 Found {findings} area(s) worth attention")
         
         return self.personality.personalize_response("task_complete", "\n".join(optimizations))
     
+    def _plan_cleanup(self) -> Optional[str]:
+        """Dry-run the temp/cache cleanup and remember it for confirmation
+        
+        A preview that can still be confirmed is shown again rather than
+        walking the temp and cache folders a second time.
+        """
+        if self.pending_cleanup and time.monotonic() - self.pending_cleanup[1] <= RECLAIM_CONFIRM_SECONDS:
+            plans = self.pending_cleanup[0]
+        else:
+            plans = self.system_manager.plan_cleanup()
+            self.pending_cleanup = (plans, time.monotonic())
+        total = sum(plan.total_bytes for plan in plans)
+        if not plans or not total:
+            self.pending_cleanup = None
+            return None
+        
+        lines = [f"🗑️ {format_size(total)} of old temp and cache files can be freed:"]
+        for plan in plans[:5]:
+            lines.append(f"   • {plan.target.name}: {format_size(plan.total_bytes)} "
+                         f"in {len(plan.files)} files")
+        lines.append("   Say 'confirm cleanup' to delete them")
+        return "\n".join(lines)
+    
+    @registry.command("cleanup", ENHANCED_COMMANDS["cleanup"], priority=120, group=ENHANCED, capabilities=["file_delete"])
+    def preview_cleanup(self) -> str:
+        """Show what a temp/cache cleanup would delete, without deleting anything"""
+        preview = self._plan_cleanup()
+        if not preview:
+            return self.personality.personalize_response(
+                "task_complete", "✅ No old temp or cache files to clean up."
+            )
+        return self.personality.personalize_response("task_complete", preview)
+    
+    @registry.command("cleanup_confirm", ENHANCED_COMMANDS["cleanup_confirm"], priority=110, group=ENHANCED, capabilities=["file_delete"])
+    def confirm_cleanup(self) -> str:
+        """Delete the files from the last cleanup preview"""
+        if not self.pending_cleanup:
+            return "There's no cleanup waiting for confirmation. Say 'clean temp files' to see what can be freed."
+        
+        plans, shown_at = self.pending_cleanup
+        self.pending_cleanup = None
+        if time.monotonic() - shown_at > RECLAIM_CONFIRM_SECONDS:
+            return "That cleanup preview has expired. Say 'clean temp files' to check again."
+        
+        result = self.system_manager.run_cleanup(plans)
+        summary = [
+            f"✅ Applied 1 optimization: freed {format_size(result.freed_bytes)} "
+            f"from {result.files_deleted} files in {result.elapsed:.1f}s"
+        ]
+        if result.files_failed:
+            summary.append(f"⚠️ {result.files_failed} files were in use or protected and were left alone")
+        
+        return self.personality.personalize_response("task_complete", "\n".join(summary))
+    
+    @registry.command("smart_assistance", ENHANCED_COMMANDS["smart_assistance"], priority=140, group=ENHANCED)
     def provide_smart_assistance(self) -> str:
         """Provide intelligent assistance and recommendations"""
         current_time = datetime.datetime.now()
@@ -283,6 +344,7 @@ class JPBrain:
         
         return self.personality.personalize_response("acknowledgment", "\n".join(assistance))
     
+    @registry.command("learning", ENHANCED_COMMANDS["learning"], priority=150, group=ENHANCED)
     def activate_learning_mode(self) -> str:
         """Activate enhanced learning capabilities"""
         self.learning_data["learning_mode_active"] = True
@@ -305,6 +367,7 @@ class JPBrain:
         
         return self.personality.personalize_response("acknowledgment", "\n".join(learning_info))
     
+    @registry.command("status_update", ENHANCED_COMMANDS["status_update"], priority=250, group=ENHANCED)
     def provide_status_update(self) -> str:
         """Provide JP's current status"""
         status_responses = [
@@ -316,6 +379,7 @@ class JPBrain:
         
         return self.personality.personalize_response("acknowledgment", random.choice(status_responses))
     
+    @registry.command("capabilities", ENHANCED_COMMANDS["capabilities"], priority=260, group=ENHANCED)
     def describe_capabilities(self) -> str:
         """Describe JP's enhanced capabilities"""
         capabilities = [
@@ -335,6 +399,7 @@ class JPBrain:
         
         return self.personality.personalize_response("acknowledgment", "\n".join(capabilities))
     
+    @registry.command("self_improvement", ENHANCED_COMMANDS["self_improvement"], priority=270, group=ENHANCED)
     def self_improvement_mode(self) -> str:
         """Activate self-improvement protocols"""
         improvements = [
@@ -352,6 +417,7 @@ class JPBrain:
         
         return self.personality.personalize_response("task_complete", "\n".join(improvements))
     
+    @registry.command("system_search", ENHANCED_COMMANDS["system_search"], priority=190, group=ENHANCED, capabilities=["filesystem"])
     def perform_system_wide_search(self, command: str) -> str:
         """Perform intelligent system-wide file search"""
         # Extract search terms from command
@@ -375,9 +441,95 @@ class JPBrain:
             ]
             return self.personality.personalize_response("acknowledgment", "\n".join(search_info))
         
+        # Ranked fuzzy lookup answers instantly once the trigram index is built
+        matches = self.system_manager.fuzzy_search_files(search_terms, system_wide=True)
+        if matches:
+            self.context_history.record(command, "system_search", {"name": search_terms},
+                                        [path for _, path in matches],
+                                        len(matches) >= MAX_NAME_SEARCH_RESULTS)
+            return self.system_manager.format_fuzzy_results(search_terms, matches)
+        
         # Perform the search
-        return self.system_manager.search_files_by_name(search_terms, system_wide=True)
+        stream = self.system_manager.iter_files_by_name(
+            search_terms,
+            system_wide=True,
+            max_results=MAX_NAME_SEARCH_RESULTS,
+            deadline=time.monotonic() + SEARCH_TIME_BUDGET
+        )
+        
+        if not self.partial_result_callback:
+            files = stream.collect()
+            self.context_history.record(command, "system_search", {"name": search_terms}, files,
+                                        stream.truncated)
+            return self.system_manager.format_name_results(search_terms, files, stream)
+        
+        # Keep searching in the background while the first matches are announced
+        search_thread = threading.Thread(target=stream.collect, daemon=True)
+        search_thread.start()
+        
+        stream.finished.wait(SEARCH_FIRST_RESULTS_DELAY)
+        while not stream.finished.is_set():
+            if stream.first_match.wait(0.05):
+                first_names = [os.path.basename(path) for path in stream.results[:3]]
+                self.partial_result_callback(
+                    f"🔍 Found {', '.join(first_names)} so far. Still searching..."
+                )
+                break
+        
+        search_thread.join()
+        self.context_history.record(command, "system_search", {"name": search_terms}, stream.results,
+                                    stream.truncated)
+        return self.system_manager.format_name_results(search_terms, stream.results, stream)
     
+    @registry.command("content_search", ENHANCED_COMMANDS["content_search"], priority=180, group=ENHANCED, capabilities=["filesystem"])
+    def perform_content_search(self, command: str) -> str:
+        """Search inside text files for the phrase that follows the trigger words"""
+        command_lower = command.lower()
+        search_text = ""
+        for phrase in ENHANCED_COMMANDS["content_search"]:
+            position = command_lower.find(phrase)
+            if position != -1:
+                search_text = command[position + len(phrase):]
+                break
+        
+        search_text = search_text.strip().strip("'\"")
+        for filler in ["the text ", "the word ", "the phrase "]:
+            if search_text.lower().startswith(filler):
+                search_text = search_text[len(filler):]
+        
+        return self.personality.personalize_response(
+            "task_complete",
+            self.system_manager.search_file_contents(search_text.strip(), system_wide=True)
+        )
+    
+    def report_top_processes(self, by: str) -> str:
+        """Name the processes behind high CPU or memory usage"""
+        return self.personality.personalize_response(
+            "task_complete", self.system_manager.get_top_processes_report(by)
+        )
+    
+    @registry.command("process_cpu", ENHANCED_COMMANDS["process_cpu"], priority=160, group=ENHANCED)
+    def report_cpu_processes(self) -> str:
+        """Report the processes using the most CPU"""
+        return self.report_top_processes("cpu")
+    
+    @registry.command("process_memory", ENHANCED_COMMANDS["process_memory"], priority=170, group=ENHANCED)
+    def report_memory_processes(self) -> str:
+        """Report the processes using the most memory"""
+        return self.report_top_processes("memory")
+    
+    @registry.command("disk_space", ENHANCED_COMMANDS["disk_space"], priority=200, group=ENHANCED, capabilities=["filesystem"])
+    def analyze_disk_space(self) -> str:
+        """Show what is taking up space in the home folder"""
+        analysis = [
+            "📦 Disk Space Analysis",
+            "━" * 21,
+            self.system_manager.analyze_disk_usage()
+        ]
+        
+        return self.personality.personalize_response("task_complete", "\n".join(analysis))
+    
+    @registry.command("drive_usage", ENHANCED_COMMANDS["drive_usage"], priority=210, group=ENHANCED)
     def check_all_drives(self) -> str:
         """Check usage for all system drives"""
         drive_info = self.system_manager.get_drive_usage()
@@ -395,61 +547,44 @@ class JPBrain:
         
         return self.personality.personalize_response("task_complete", "\n".join(analysis))
     
+    def find_category_files(self, category: str) -> str:
+        """Search a media category, remembering the files for follow-ups"""
+        found = self.system_manager.collect_files_by_category(category, system_wide=True)
+        self.context_history.record(f"find {category}", "media_search", {"category": category},
+                                    found.paths, found.truncated)
+        return found.text
+    
+    @registry.command("find_music", ENHANCED_COMMANDS["find_music"], priority=220, group=ENHANCED, capabilities=["filesystem"])
     def find_all_music_files(self) -> str:
         """Find all music files across the system"""
         music_search = [
             "🎵 Searching for all music files...",
             "━" * 30,
+            self.find_category_files("music")
         ]
         
-        # Search for different music formats
-        mp3_files = self.system_manager.find_files_by_extension(".mp3", system_wide=True)
-        wav_files = self.system_manager.find_files_by_extension(".wav", system_wide=True)
-        
-        music_search.append("MP3 Files:")
-        music_search.append(mp3_files)
-        music_search.append("")
-        music_search.append("WAV Files:")
-        music_search.append(wav_files)
-        
         return self.personality.personalize_response("task_complete", "\n".join(music_search))
     
+    @registry.command("find_videos", ENHANCED_COMMANDS["find_videos"], priority=230, group=ENHANCED, capabilities=["filesystem"])
     def find_all_video_files(self) -> str:
         """Find all video files across the system"""
         video_search = [
             "🎥 Searching for all video files...",
             "━" * 30,
+            self.find_category_files("video")
         ]
         
-        # Search for different video formats
-        mp4_files = self.system_manager.find_files_by_extension(".mp4", system_wide=True)
-        avi_files = self.system_manager.find_files_by_extension(".avi", system_wide=True)
-        
-        video_search.append("MP4 Files:")
-        video_search.append(mp4_files)
-        video_search.append("")
-        video_search.append("AVI Files:")
-        video_search.append(avi_files)
-        
         return self.personality.personalize_response("task_complete", "\n".join(video_search))
     
+    @registry.command("find_images", ENHANCED_COMMANDS["find_images"], priority=240, group=ENHANCED, capabilities=["filesystem"])
     def find_all_image_files(self) -> str:
         """Find all image files across the system"""
         image_search = [
             "🖼️ Searching for all image files...",
             "━" * 30,
+            self.find_category_files("image")
         ]
         
-        # Search for different image formats
-        jpg_files = self.system_manager.find_files_by_extension(".jpg", system_wide=True)
-        png_files = self.system_manager.find_files_by_extension(".png", system_wide=True)
-        
-        image_search.append("JPG Files:")
-        image_search.append(jpg_files)
-        image_search.append("")
-        image_search.append("PNG Files:")
-        image_search.append(png_files)
-        
         return self.personality.personalize_response("task_complete", "\n".join(image_search))
 
 class SmartMonitoring:
@@ -457,51 +592,142 @@ class SmartMonitoring:
     
     def __init__(self, jp_brain: JPBrain):
         self.brain = jp_brain
-        self.monitoring_thread = None
         self.is_monitoring = False
+        self.sampler = self.brain.system_manager.get_metrics_sampler()
+        capacity = int(TREND_ALERTS["history_seconds"] / self.sampler.interval) + 1
+        self.history = MetricsHistory(['cpu', 'memory_used', 'disk_free_bytes'], capacity)
+        self.alerts = AlertGate(TREND_ALERTS["alert_cooldown"])
+        self.scheduler = JobScheduler("jp-monitoring")
+        self._known_drives: Optional[set] = None
+        self.pressure = PressureMonitor()
+        self.pressure.add_listener(self._on_pressure)
+        self.using_psi = False
         
     def start_monitoring(self):
         """Start intelligent background monitoring"""
         if not self.is_monitoring:
             self.is_monitoring = True
-            self.monitoring_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-            self.monitoring_thread.start()
+            self.sampler.add_listener(self.history.record)
+            self.sampler.start()
+            # Stall notifications from the kernel where available, sampled trends otherwise
+            self.using_psi = self.pressure.start()
+            self.scheduler.add_job("system_health", MONITORING_INTERVALS["system_health"],
+                                   self._smart_health_check)
+            self.scheduler.add_job("environment", MONITORING_INTERVALS["environment"],
+                                   self._check_environment, initial_delay=0)
+            self.scheduler.add_job("notifications", MONITORING_INTERVALS["notifications"],
+                                   self._check_assistance_opportunities)
+            self.scheduler.add_job("learning", MONITORING_INTERVALS["learning"],
+                                   self._save_learning_data)
+            self.scheduler.start()
     
     def stop_monitoring(self):
         """Stop monitoring"""
         self.is_monitoring = False
-    
-    def _monitor_loop(self):
-        """Smart monitoring loop"""
-        while self.is_monitoring:
-            try:
-                # Smart system health check
-                self._smart_health_check()
-                
-                # Look for assistance opportunities
-                self._check_assistance_opportunities()
-                
-                # Sleep before next check
-                time.sleep(MONITORING_INTERVALS["system_health"])
-                
-            except Exception as e:
-                print(f"Monitoring error: {e}")
-                time.sleep(10)
+        self.sampler.remove_listener(self.history.record)
+        self.scheduler.stop()
+        self.pressure.stop()
+        self.using_psi = False
     
     def _smart_health_check(self):
-        """Intelligent system health monitoring"""
-        system_info = self.brain.system_manager.get_system_info()
+        """Alert on sustained load and on trends, not on single spikes"""
+        cpu = self.history['cpu']
+        memory = self.history['memory_used']
+        disk_free = self.history['disk_free_bytes']
         
-        if system_info:
-            # Smart alerting based on trends
-            if system_info.get('cpu', 0) > 85:
-                self._smart_alert("High CPU usage detected. Would you like me to optimize performance?")
-            
-            if system_info.get('memory_used', 0) > 90:
-                self._smart_alert("Memory usage is high. I can help free up some space.")
-            
-            if system_info.get('disk_percent', 0) > 90:
-                self._smart_alert("Disk space is running low. Shall I help clean up files?")
+        if self.using_psi:
+            self._clear_pressure_alerts()
+        else:
+            self._check_load_trends(cpu, memory)
+        
+        runout = None
+        if disk_free.span(TREND_ALERTS["disk_trend_window"]) >= TREND_ALERTS["disk_trend_window"] / 2:
+            runout = disk_free.seconds_until(0, TREND_ALERTS["disk_trend_window"])
+        horizon = TREND_ALERTS["disk_runout_horizon"]
+        self._trend_alert(
+            "disk",
+            runout is not None and runout < horizon,
+            runout is None or runout > horizon * 2,
+            lambda: f"Disk is filling up fast and may run out in about {int(runout // 60)} minutes. "
+                    f"Shall I help clean up files?"
+        )
+    
+    def _check_load_trends(self, cpu: MetricSeries, memory: MetricSeries):
+        """Sampler-based CPU and memory alerts, used where PSI isn't available"""
+        margin = TREND_ALERTS["hysteresis_margin"]
+        
+        cpu_average = cpu.mean(TREND_ALERTS["cpu_duration"])
+        self._trend_alert(
+            "cpu",
+            cpu.sustained_above(TREND_ALERTS["cpu_threshold"], TREND_ALERTS["cpu_duration"]),
+            cpu_average is not None and cpu_average < TREND_ALERTS["cpu_threshold"] - margin,
+            lambda: f"CPU has been above {TREND_ALERTS['cpu_threshold']}% for "
+                    f"{TREND_ALERTS['cpu_duration'] // 60} minutes{self._top_offender('cpu')}. "
+                    f"Would you like me to optimize performance?"
+        )
+        
+        memory_average = memory.mean(TREND_ALERTS["memory_duration"])
+        self._trend_alert(
+            "memory",
+            memory.sustained_above(TREND_ALERTS["memory_threshold"], TREND_ALERTS["memory_duration"]),
+            memory_average is not None and memory_average < TREND_ALERTS["memory_threshold"] - margin,
+            lambda: f"Memory usage has stayed high{self._top_offender('memory')}. "
+                    f"I can help free up some space."
+        )
+    
+    def _on_pressure(self, resource: str, percent: float):
+        """PressureMonitor listener: the kernel reported a stall"""
+        if not self.alerts.update(f"pressure_{resource}", True, False):
+            return
+        
+        if resource == "cpu":
+            message = (f"Programs are waiting for the CPU ({percent:.0f}% of the last 10 seconds)"
+                       f"{self._top_offender('cpu')}. Would you like me to optimize performance?")
+        elif resource == "memory":
+            message = (f"The system is stalling for memory ({percent:.0f}% of the last 10 seconds)"
+                       f"{self._top_offender('memory')}. I can help free up some space.")
+        else:
+            message = (f"Disk activity is stalling programs ({percent:.0f}% of the last 10 seconds)"
+                       f"{self._top_offender('io')}.")
+        self._smart_alert(message)
+    
+    def _clear_pressure_alerts(self):
+        """Let pressure alerts fire again once the stall has passed"""
+        for resource in self.pressure.triggers:
+            percent = read_pressure(resource)
+            if percent is not None:
+                self.alerts.update(f"pressure_{resource}", False, percent < PSI_CLEAR_PERCENT)
+    
+    def _top_offender(self, by: str) -> str:
+        """' - mostly <process>' for an alert message, or nothing if unknown"""
+        processes = self.brain.system_manager.get_top_processes(by, 1)
+        if not processes or (by == "cpu" and processes[0].cpu_percent < 1):
+            return ""
+        return f" - mostly {processes[0].name}"
+    
+    def _trend_alert(self, name: str, raise_condition: bool, clear_condition: bool,
+                     message: Callable[[], str]):
+        """Show an alert when the gate allows it
+        
+        The message is built lazily so the process lookup only runs when alerting.
+        """
+        if self.alerts.update(name, raise_condition, clear_condition):
+            self._smart_alert(message())
+    
+    def _check_environment(self):
+        """Mention drives that were connected or removed since the last check"""
+        drives = {mount.mountpoint for mount in self.brain.system_manager.get_partition_usage()
+                  if mount.available}
+        if self._known_drives is not None:
+            for drive in sorted(drives - self._known_drives):
+                self._smart_suggestion(f"New drive connected: {drive}")
+            for drive in sorted(self._known_drives - drives):
+                self._smart_suggestion(f"Drive removed: {drive}")
+        self._known_drives = drives
+    
+    def _save_learning_data(self):
+        """Persist learning data periodically so a crash doesn't lose it"""
+        self.brain.file_manager.save_json("jp_learning.json", self.brain.learning_data)
     
     def _check_assistance_opportunities(self):
         """Look for opportunities to provide smart assistance"""
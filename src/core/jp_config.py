@@ -103,15 +103,25 @@ JP_RESPONSES = {
     ]
 }
 
-# Enhanced Commands
+# Enhanced Commands - trigger phrases match whole words; the JPBrain handler
+# registered for each command sets which one wins when several match
 ENHANCED_COMMANDS = {
     "system_analysis": [
         "system scan", "full scan", "system status", "diagnostics",
         "check system", "analyze system", "system report"
     ],
     
+    "cleanup_confirm": [
+        "confirm cleanup", "yes clean up", "go ahead and clean"
+    ],
+    
+    "cleanup": [
+        "clean temp files", "clean temporary files", "clear cache", "clean up cache",
+        "free up space", "clean up files"
+    ],
+    
     "optimization": [
-        "optimize", "tune system", "improve performance", 
+        "optimize", "optimization", "tune system", "improve performance", 
         "speed up", "clean system", "boost performance"
     ],
     
@@ -123,17 +133,71 @@ ENHANCED_COMMANDS = {
     "learning": [
         "learn this", "remember this", "adapt", "improve",
         "learn from me", "get smarter", "understand me better"
-    ]
+    ],
+    
+    "process_cpu": [
+        "using my cpu", "using the cpu", "eating my cpu", "cpu hog",
+        "using my processor", "top processes"
+    ],
+    
+    "process_memory": [
+        "using my memory", "using the memory", "using my ram", "eating my memory",
+        "memory hog"
+    ],
+    
+    "content_search": [
+        "file that mentions", "files that mention", "files mentioning",
+        "search inside files", "search file contents", "files containing the text",
+        "files containing the word"
+    ],
+    
+    "system_search": [
+        "find all", "search all", "system wide search", "search entire system"
+    ],
+    
+    "disk_space": [
+        "using my disk", "using disk space", "taking up space",
+        "largest folders", "biggest files", "largest files"
+    ],
+    
+    "drive_usage": [
+        "drive usage", "disk usage", "all drives", "check drives"
+    ],
+    
+    "find_music": ["find music", "all music files"],
+    
+    "find_videos": ["find videos", "all video files"],
+    
+    "find_images": ["find images", "all photos"],
+    
+    "status_update": ["how are you", "how's it going"],
+    
+    "capabilities": ["what can you do", "capabilities"],
+    
+    "self_improvement": ["improve yourself", "get better"]
 }
 
 # Monitoring Settings
 MONITORING_INTERVALS = {
-    "system_health": 300,      # 5 minutes
+    "system_health": 30,       # Evaluates buffered samples, so it can run often
     "environment": 600,        # 10 minutes  
     "notifications": 60,       # 1 minute
     "learning": 900           # 15 minutes
 }
 
+# Trend Alert Settings (seconds)
+TREND_ALERTS = {
+    "history_seconds": 3600,       # Metric history kept for trend analysis
+    "cpu_threshold": 85,
+    "cpu_duration": 120,           # CPU above threshold this long
+    "memory_threshold": 90,
+    "memory_duration": 120,
+    "disk_runout_horizon": 3600,   # Warn when the disk would fill within this
+    "disk_trend_window": 600,      # Samples used to estimate the fill rate
+    "hysteresis_margin": 10,       # Percent below the threshold before an alert clears
+    "alert_cooldown": 900          # Minimum gap between repeats of the same alert
+}
+
 # Learning Configuration
 LEARNING_CONFIG = {
     "track_user_patterns": True,
@@ -0,0 +1,217 @@
+"""
+Metrics Exporter Module - Prometheus text exposition of assistant and host metrics
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from . import config
+
+# A metric family produced by a collector: name, type, help text and
+# (labels, value) samples. Labels are a dict, possibly empty.
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative latency buckets per label value, Prometheus style"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = sorted(buckets)
+        # label value -> [bucket counts..., +Inf count], sum
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(label)
+            if counts is None:
+                counts = self._counts[label] = [0] * (len(self.buckets) + 1)
+                self._sums[label] = 0.0
+            counts[index] += 1
+            self._sums[label] += value
+
+    def samples(self, name: str, label_name: str) -> List[str]:
+        """Exposition lines for every label value"""
+        lines = []
+        with self._lock:
+            for label, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + [float("inf")], counts):
+                    cumulative += count
+                    labels = _format_labels({label_name: label, "le": _format_value(float(bound))})
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels({label_name: label})
+                lines.append(f"{name}_sum{labels} {self._sums[label]!r}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+        return lines
+
+
+class AssistantMetrics:
+    """Command counters and latencies, plus pluggable collectors for other state"""
+
+    def __init__(self):
+        self.command_latency = Histogram(config.METRICS_LATENCY_BUCKETS)
+        self._commands: Dict[str, int] = {}
+        self._collectors: List[Callable[[], List[MetricFamily]]] = []
+        self._lock = threading.Lock()
+        # Handler reached by the command being timed on this thread (None until dispatched)
+        self._current = threading.local()
+
+    def add_collector(self, collector: Callable[[], List[MetricFamily]]) -> None:
+        """Register a callable whose metric families are added to every scrape"""
+        self._collectors.append(collector)
+
+    def record_command(self, handler: str, seconds: float) -> None:
+        """Count a handled command and its latency"""
+        with self._lock:
+            self._commands[handler] = self._commands.get(handler, 0) + 1
+        self.command_latency.observe(handler, seconds)
+
+    def name_handler(self, name: str) -> None:
+        """Label the command being timed by command() on this thread with the handler it reached"""
+        # The first dispatch names the command; anything it dispatches in turn doesn't
+        if getattr(self._current, "name", "") is None:
+            self._current.name = name
+
+    @contextmanager
+    def command(self, default_handler: str):
+        """Time one command end to end, labelled by the handler it reached"""
+        self._current.name = None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_command(self._current.name or default_handler, time.perf_counter() - started)
+            self._current.name = ""
+
+    def render(self) -> str:
+        """The full scrape in Prometheus text format"""
+        lines = [
+            "# HELP jp_commands_total Commands handled, by handler",
+            "# TYPE jp_commands_total counter",
+        ]
+        with self._lock:
+            for handler, count in sorted(self._commands.items()):
+                lines.append(f"jp_commands_total{_format_labels({'handler': handler})} {count}")
+
+        lines.append("# HELP jp_command_duration_seconds Command handling latency, by handler")
+        lines.append("# TYPE jp_command_duration_seconds histogram")
+        lines.extend(self.command_latency.samples("jp_command_duration_seconds", "handler"))
+
+        for collector in list(self._collectors):
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+                continue
+            for name, metric_type, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used by the command handlers
+assistant_metrics = AssistantMetrics()
+
+
+class MetricsExporter:
+    """Serves /metrics over HTTP and/or rewrites a node_exporter textfile"""
+
+    def __init__(self, metrics: AssistantMetrics = None):
+        self.metrics = metrics or assistant_metrics
+        self._server: Optional["ThreadingHTTPServer"] = None
+        self._stop_event = threading.Event()
+        self._textfile_thread: Optional[threading.Thread] = None
+
+    def start_http(self, port: int = None, address: str = None) -> Tuple[str, int]:
+        """Serve the metrics on a background thread; returns the bound address"""
+        # Imported here: command modules load this file, and most runs never serve HTTP
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the console
+                pass
+
+        self._server = ThreadingHTTPServer(
+            (address or config.METRICS_EXPORT_ADDRESS,
+             config.METRICS_EXPORT_PORT if port is None else port),
+            Handler
+        )
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="jp-metrics-http",
+                         daemon=True).start()
+        return self._server.server_address[:2]
+
+    def write_textfile(self, path: str) -> None:
+        """Write the metrics atomically so the collector never reads half a file"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.metrics.render())
+        os.replace(temp_path, path)
+
+    def start_textfile(self, path: str = None, interval: float = None) -> None:
+        """Rewrite the textfile on a background thread"""
+        path = path or config.METRICS_TEXTFILE_PATH
+        interval = interval or config.METRICS_TEXTFILE_INTERVAL
+        self._stop_event.clear()
+
+        def run():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    print(f"⚠️ Could not write metrics file: {e}")
+                if self._stop_event.wait(interval):
+                    return
+
+        self._textfile_thread = threading.Thread(target=run, name="jp-metrics-textfile", daemon=True)
+        self._textfile_thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and writing metrics"""
+        self._stop_event.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,105 @@
+"""
+Metrics Sampler Module - Background CPU, memory and disk sampling
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import psutil
+from . import config
+
+
+class MetricsSampler:
+    """Keeps a fresh system metrics snapshot on a background thread
+
+    psutil.cpu_percent(interval=None) reports usage since the previous
+    call, so sampling it on a steady schedule gives the same figure as a
+    blocking one-second measurement without making the caller wait.
+    Readers get the latest snapshot dict, which is replaced whole and
+    never mutated, so no lock is needed to read it.
+    """
+
+    def __init__(self, interval: float = None, disk_path: str = None):
+        self.interval = interval or config.METRICS_SAMPLE_INTERVAL
+        self.disk_path = disk_path or config.SYSTEM_DISK_PATH
+        self._snapshot: Optional[Dict[str, float]] = None
+        self._listeners: List[Callable[[Dict[str, float]], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[Dict[str, float]], None]) -> None:
+        """Call callback with every new snapshot, on the sampler thread"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, float]], None]) -> None:
+        """Stop calling a listener added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Take a first sample and keep sampling in the background"""
+        with self._start_lock:
+            if self.is_running:
+                return
+            if self._snapshot is None:
+                # The first non-blocking reading has nothing to compare against
+                self._publish(self._sample(cpu_interval=0.1))
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="jp-metrics", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling; the last snapshot stays readable"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def snapshot(self) -> Optional[Dict[str, float]]:
+        """Latest metrics, starting the sampler on first use"""
+        if self._snapshot is None or not self.is_running:
+            self.start()
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() - snapshot['timestamp'] > self.interval * 3:
+            # The sampler has stalled; measure directly rather than report stale figures
+            snapshot = self._sample(cpu_interval=0.1)
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._publish(self._sample())
+            except Exception as e:
+                print(f"{config.ERROR_MESSAGES['system_info_failed']}: {e}")
+
+    def _publish(self, snapshot: Dict[str, float]) -> None:
+        self._snapshot = snapshot
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Metrics listener error: {e}")
+
+    def _sample(self, cpu_interval: float = None) -> Dict[str, float]:
+        """Read CPU, memory and disk figures once"""
+        cpu_percent = psutil.cpu_percent(interval=cpu_interval)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+
+        return {
+            'cpu': cpu_percent,
+            'memory_used': memory.percent,
+            'memory_total': memory.total // (1024**3),  # GB
+            'memory_available': memory.available // (1024**3),  # GB
+            'disk_used': disk.used // (1024**3),  # GB
+            'disk_total': disk.total // (1024**3),  # GB
+            'disk_free': disk.free // (1024**3),  # GB
+            'disk_free_bytes': disk.free,
+            'disk_percent': (disk.used / disk.total) * 100,
+            'timestamp': time.monotonic()
+        }
@@ -0,0 +1,127 @@
+"""
+Metrics Series Module - Fixed-size ring buffers of metric samples with trend statistics
+"""
+
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class MetricSeries:
+    """Ring buffer of (timestamp, value) samples for one metric
+
+    Samples live in two preallocated array('d') buffers, so recording a
+    sample is two stores and no allocation. Statistics look back over a
+    window of seconds ending at the newest sample.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float, timestamp: float = None) -> None:
+        """Record a sample, overwriting the oldest once the buffer is full"""
+        self._times[self._next] = time.monotonic() if timestamp is None else timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    @property
+    def latest(self) -> Optional[float]:
+        if not self._count:
+            return None
+        return self._values[self._next - 1]
+
+    def window(self, seconds: float) -> Tuple[List[float], List[float]]:
+        """Timestamps and values of the samples in the last ``seconds``, oldest first"""
+        if not self._count:
+            return [], []
+        newest = self._times[self._next - 1]
+        cutoff = newest - seconds
+        times: List[float] = []
+        values: List[float] = []
+        # Walk back from the newest sample until the window is covered
+        index = self._next - 1
+        for _ in range(self._count):
+            if self._times[index] < cutoff:
+                break
+            times.append(self._times[index])
+            values.append(self._values[index])
+            index -= 1  # -1 wraps to the end of the buffer
+        times.reverse()
+        values.reverse()
+        return times, values
+
+    def span(self, seconds: float) -> float:
+        """Seconds actually covered by samples within the window"""
+        times, _ = self.window(seconds)
+        return times[-1] - times[0] if len(times) > 1 else 0.0
+
+    def mean(self, seconds: float) -> Optional[float]:
+        """Moving average over the window"""
+        _, values = self.window(seconds)
+        return sum(values) / len(values) if values else None
+
+    def percentile(self, percent: float, seconds: float) -> Optional[float]:
+        """Nearest-rank percentile over the window, e.g. percentile(95, 300)"""
+        _, values = self.window(seconds)
+        if not values:
+            return None
+        values.sort()
+        rank = max(0, min(len(values) - 1, int(round(percent / 100 * len(values))) - 1))
+        return values[rank]
+
+    def slope(self, seconds: float) -> Optional[float]:
+        """Least-squares rate of change per second over the window"""
+        times, values = self.window(seconds)
+        n = len(times)
+        if n < 2:
+            return None
+        mean_t = sum(times) / n
+        mean_v = sum(values) / n
+        spread = sum((t - mean_t) ** 2 for t in times)
+        if spread == 0:
+            return None
+        return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / spread
+
+    def sustained_above(self, threshold: float, seconds: float) -> bool:
+        """True when every sample for at least ``seconds`` has been above threshold"""
+        times, values = self.window(seconds)
+        if len(times) < 2 or times[-1] - times[0] < seconds * 0.9:
+            # Not enough history yet to call it sustained
+            return False
+        return min(values) > threshold
+
+    def seconds_until(self, target: float, seconds: float) -> Optional[float]:
+        """Projected seconds until the trend over the window reaches target, if heading there"""
+        rate = self.slope(seconds)
+        current = self.latest
+        if rate is None or current is None or rate == 0:
+            return None
+        remaining = (target - current) / rate
+        return remaining if remaining >= 0 else None
+
+
+class MetricsHistory:
+    """One MetricSeries per metric, fed from MetricsSampler snapshots"""
+
+    def __init__(self, metrics: List[str], capacity: int):
+        self.series: Dict[str, MetricSeries] = {name: MetricSeries(capacity) for name in metrics}
+
+    def __getitem__(self, metric: str) -> MetricSeries:
+        return self.series[metric]
+
+    def record(self, snapshot: Dict[str, float]) -> None:
+        """Append a snapshot's values to their series"""
+        timestamp = snapshot.get('timestamp')
+        for name, series in self.series.items():
+            value = snapshot.get(name)
+            if value is not None:
+                series.append(value, timestamp)
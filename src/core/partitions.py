@@ -0,0 +1,119 @@
+"""
+Partitions Module - Mounted partition inventory with timeout-bounded usage queries
+"""
+
+import fnmatch
+import os
+import select
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+import psutil
+from . import config
+
+# available is False when the mount did not answer in time or refused access
+MountUsage = namedtuple("MountUsage", [
+    "device", "mountpoint", "fstype", "total", "used", "free", "percent", "available"
+])
+
+_MOUNTS_FILE = "/proc/self/mounts"
+
+
+class PartitionInventory:
+    """Cached psutil.disk_partitions with concurrent per-mount usage queries
+
+    The partition list is re-read when the mount table changes. On Linux
+    that is detected by polling /proc/self/mounts for POLLPRI without
+    waiting; elsewhere the list is simply re-read after a refresh interval.
+    Each usage query runs on its own daemon thread, so a hung network
+    mount only costs a thread and never blocks the caller or shutdown.
+    """
+
+    def __init__(self):
+        self._partitions: Optional[list] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._mounts_poll = None
+        self._mounts_handle = None
+        # mountpoint -> thread still waiting on a previous usage query
+        self._stuck: Dict[str, threading.Thread] = {}
+
+        if hasattr(select, "poll") and os.path.exists(_MOUNTS_FILE):
+            try:
+                self._mounts_handle = open(_MOUNTS_FILE)
+                self._mounts_poll = select.poll()
+                self._mounts_poll.register(self._mounts_handle, select.POLLPRI | select.POLLERR)
+            except OSError:
+                self._mounts_poll = None
+
+    def _mounts_changed(self) -> bool:
+        """True when the kernel flagged a mount or unmount since the last read"""
+        if self._mounts_poll is None:
+            return time.monotonic() - self._loaded_at > config.PARTITION_REFRESH_SECONDS
+        changed = bool(self._mounts_poll.poll(0))
+        if changed:
+            # Reading the file to the end clears the flag
+            self._mounts_handle.seek(0)
+            self._mounts_handle.read()
+        return changed
+
+    def partitions(self) -> list:
+        """Mounted partitions, re-read only after the mount table changed"""
+        with self._lock:
+            if self._partitions is None or self._mounts_changed():
+                self._partitions = []
+                seen = set()
+                # all=True keeps network and FUSE mounts (nfs, cifs, sshfs), which
+                # psutil otherwise drops as "nodev"; pseudo filesystems are filtered here
+                for part in psutil.disk_partitions(all=True):
+                    # Empty optical drives and card readers have no filesystem
+                    if not part.fstype or 'cdrom' in part.opts or part.mountpoint in seen:
+                        continue
+                    if any(fnmatch.fnmatch(part.fstype, pattern) for pattern in config.PSEUDO_FILESYSTEMS):
+                        continue
+                    seen.add(part.mountpoint)
+                    self._partitions.append(part)
+                self._loaded_at = time.monotonic()
+            return list(self._partitions)
+
+    def usage(self, timeout: float = None) -> List[MountUsage]:
+        """Usage of every partition, queried concurrently with a shared deadline"""
+        timeout = config.PARTITION_USAGE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        partitions = self.partitions()
+        results: Dict[str, Optional[object]] = {}
+        threads: Dict[str, threading.Thread] = {}
+
+        def query(mountpoint: str) -> None:
+            try:
+                results[mountpoint] = psutil.disk_usage(mountpoint)
+            except (OSError, PermissionError):
+                results[mountpoint] = None
+
+        for part in partitions:
+            stuck = self._stuck.get(part.mountpoint)
+            if stuck is not None and stuck.is_alive():
+                # Still hung from an earlier query; don't pile up more threads on it
+                continue
+            self._stuck.pop(part.mountpoint, None)
+            thread = threading.Thread(target=query, args=(part.mountpoint,),
+                                      name="jp-disk-usage", daemon=True)
+            thread.start()
+            threads[part.mountpoint] = thread
+
+        for mountpoint, thread in threads.items():
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                self._stuck[mountpoint] = thread
+
+        report = []
+        for part in partitions:
+            usage = results.get(part.mountpoint)
+            if usage is None:
+                report.append(MountUsage(part.device, part.mountpoint, part.fstype,
+                                         0, 0, 0, 0.0, False))
+            else:
+                report.append(MountUsage(part.device, part.mountpoint, part.fstype,
+                                         usage.total, usage.used, usage.free, usage.percent, True))
+        return report
@@ -0,0 +1,536 @@
+"""
+Phonetic Index Module - Double Metaphone keys and a BK-tree for near-miss phrases
+"""
+
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .intent_router import tokenize
+
+# value: what the phrase stands for, phrase: the indexed phrase,
+# start/end: token span in the utterance, distance: edits between the keys
+PhoneticMatch = namedtuple("PhoneticMatch", ["value", "phrase", "start", "end", "distance"])
+
+_VOWELS = set("AEIOUY")
+
+# Spoken letter names, so "jay pee" and "j p" count as spelling "jp"; names
+# that are also everyday words ("see", "you", "are") are left out
+LETTER_NAMES = {
+    "ay": "a", "bee": "b", "cee": "c", "dee": "d", "ee": "e", "ef": "f", "gee": "g",
+    "aitch": "h", "jay": "j", "kay": "k", "el": "l", "em": "m", "en": "n", "pee": "p",
+    "cue": "q", "ar": "r", "es": "s", "tee": "t", "vee": "v", "ex": "x", "zee": "z", "zed": "z",
+}
+
+
+def double_metaphone(word: str) -> Tuple[str, str]:
+    """Primary and alternate Double Metaphone codes of one English word
+
+    Follows Lawrence Philips' rules for English spellings, including the
+    common Germanic, French and Italian borrowings ("schmidt", "ciao"),
+    but leaves out the rarer Slavic and Spanish special cases.
+    """
+    word = word.upper()
+    length = len(word)
+    if not length:
+        return "", ""
+    padded = word + "     "
+    primary: List[str] = []
+    alternate: List[str] = []
+
+    def add(main: str, alt: str = None) -> None:
+        primary.append(main)
+        alternate.append(main if alt is None else alt)
+
+    def at(position: int, *options: str) -> bool:
+        if position < 0:
+            return False
+        return any(padded.startswith(option, position) for option in options)
+
+    def is_vowel(position: int) -> bool:
+        return 0 <= position < length and word[position] in _VOWELS
+
+    current = 0
+    if at(0, "GN", "KN", "PN", "WR", "PS"):
+        current = 1
+    if word[0] == "X":
+        # "Xavier" starts with an S sound
+        add("S")
+        current = 1
+
+    while current < length:
+        char = word[current]
+
+        if char in _VOWELS:
+            if current == 0:
+                add("A")
+            current += 1
+
+        elif char == "B":
+            add("P")
+            current += 2 if at(current + 1, "B") else 1
+
+        elif char == "C":
+            if current == 0 and at(0, "CAESAR"):
+                add("S")
+                current += 2
+            elif at(current, "CH"):
+                if current > 0 and at(current, "CHAE"):
+                    add("K", "X")
+                elif current == 0 and (at(1, "HARAC", "HARIS", "HOR", "HYM", "HIA", "HEM")):
+                    add("K")
+                elif at(0, "SCH") or at(current - 2, "ORCHES", "ARCHIT", "ORCHID") \
+                        or at(current + 2, "T", "S"):
+                    add("K")
+                elif current == 0:
+                    add("X", "K")
+                elif at(0, "MC"):
+                    add("K")
+                else:
+                    add("X", "K")
+                current += 2
+            elif at(current, "CZ"):
+                add("S", "X")
+                current += 2
+            elif at(current + 1, "CIA"):
+                add("X")
+                current += 3
+            elif at(current, "CC") and not (current == 1 and word[0] == "M"):
+                if at(current + 2, "I", "E", "H") and not at(current + 2, "HU"):
+                    # "accident", "succeed" -> KS; "bacci" -> X
+                    if (current == 1 and word[0] == "A") or at(current - 1, "UCCEE", "UCCES"):
+                        add("KS")
+                    else:
+                        add("X")
+                    current += 3
+                else:
+                    add("K")
+                    current += 2
+            elif at(current, "CK", "CG", "CQ"):
+                add("K")
+                current += 2
+            elif at(current, "CI", "CE", "CY"):
+                add("S", "X" if at(current, "CIO", "CIE", "CIA") else "S")
+                current += 2
+            else:
+                add("K")
+                if at(current + 1, " C", " Q", " G"):
+                    current += 3
+                elif at(current + 1, "C", "K", "Q") and not at(current + 1, "CE", "CI"):
+                    current += 2
+                else:
+                    current += 1
+
+        elif char == "D":
+            if at(current, "DG"):
+                if at(current + 2, "I", "E", "Y"):
+                    # "edge"
+                    add("J")
+                    current += 3
+                else:
+                    add("TK")
+                    current += 2
+            elif at(current, "DT", "DD"):
+                add("T")
+                current += 2
+            else:
+                add("T")
+                current += 1
+
+        elif char == "F":
+            add("F")
+            current += 2 if at(current + 1, "F") else 1
+
+        elif char == "G":
+            if at(current + 1, "H"):
+                if current > 0 and not is_vowel(current - 1):
+                    add("K")
+                    current += 2
+                elif current == 0:
+                    add("J" if at(2, "I") else "K")
+                    current += 2
+                elif at(current - 2, "B", "H", "D") or at(current - 3, "B", "H", "D") \
+                        or at(current - 4, "B", "H"):
+                    # "hugh", "bough", "broughton": silent
+                    current += 2
+                else:
+                    if current > 2 and at(current - 1, "U") and at(current - 3, "C", "G", "L", "R", "T"):
+                        # "laugh", "cough", "rough"
+                        add("F")
+                    elif current > 0 and word[current - 1] != "I":
+                        add("K")
+                    current += 2
+            elif at(current + 1, "N"):
+                if current == 1 and is_vowel(0):
+                    add("KN", "N")
+                elif not at(current + 2, "EY") and not at(current + 1, "Y"):
+                    add("N", "KN")
+                else:
+                    add("KN")
+                current += 2
+            elif current == 0 and (at(1, "Y") or at(1, "ES", "EP", "EB", "EL", "EY", "IB", "IL", "IN", "IE", "EI", "ER")):
+                add("K", "J")
+                current += 2
+            elif at(current + 1, "E", "I", "Y") or at(current - 1, "AGGI", "OGGI"):
+                if at(0, "VAN ", "VON ", "SCH") or at(current + 1, "ET"):
+                    add("K")
+                elif at(current + 1, "IER"):
+                    add("J")
+                else:
+                    add("J", "K")
+                current += 2
+            else:
+                add("K")
+                current += 2 if at(current + 1, "G") else 1
+
+        elif char == "H":
+            # Only sounded at the start of a word or between vowels
+            if (current == 0 or is_vowel(current - 1)) and is_vowel(current + 1):
+                add("H")
+                current += 2
+            else:
+                current += 1
+
+        elif char == "J":
+            if at(current, "JOSE") or at(0, "SAN "):
+                add("H")
+            elif current == 0:
+                add("J", "A")
+            else:
+                add("J")
+            current += 2 if at(current + 1, "J") else 1
+
+        elif char == "K":
+            add("K")
+            current += 2 if at(current + 1, "K") else 1
+
+        elif char == "L":
+            add("L")
+            current += 2 if at(current + 1, "L") else 1
+
+        elif char == "M":
+            add("M")
+            if at(current + 1, "M") or (at(current - 1, "UMB") and (current + 1 == length - 1 or at(current + 2, "ER"))):
+                # "dumb", "thumb"
+                current += 2
+            else:
+                current += 1
+
+        elif char == "N":
+            add("N")
+            current += 2 if at(current + 1, "N") else 1
+
+        elif char == "Ñ":
+            add("N")
+            current += 1
+
+        elif char == "P":
+            if at(current + 1, "H"):
+                add("F")
+                current += 2
+            else:
+                add("P")
+                current += 2 if at(current + 1, "P", "B") else 1
+
+        elif char == "Q":
+            add("K")
+            current += 2 if at(current + 1, "Q") else 1
+
+        elif char == "R":
+            if current == length - 1 and at(current - 2, "IE") and not at(current - 4, "ME", "MA"):
+                # French "Rogier": silent in the primary code
+                add("", "R")
+            else:
+                add("R")
+            current += 2 if at(current + 1, "R") else 1
+
+        elif char == "S":
+            if at(current - 1, "ISL", "YSL"):
+                # "island", "carlisle"
+                current += 1
+            elif current == 0 and at(0, "SUGAR"):
+                add("X", "S")
+                current += 1
+            elif at(current, "SH"):
+                add("S" if at(current + 1, "HEIM", "HOEK", "HOLM", "HOLZ") else "X")
+                current += 2
+            elif at(current, "SIO", "SIA"):
+                add("S", "X")
+                current += 3
+            elif (current == 0 and at(1, "M", "N", "L", "W")) or at(current + 1, "Z"):
+                add("S", "X")
+                current += 2 if at(current + 1, "Z") else 1
+            elif at(current, "SC"):
+                if at(current + 2, "H"):
+                    if at(current + 3, "OO", "ER", "EN", "UY", "ED", "EM"):
+                        add("SK")
+                    elif current == 0 and not is_vowel(3) and not at(3, "W"):
+                        add("X", "S")
+                    else:
+                        add("X")
+                elif at(current + 2, "I", "E", "Y"):
+                    add("S")
+                else:
+                    add("SK")
+                current += 3
+            else:
+                if current == length - 1 and at(current - 2, "AI", "OI"):
+                    # French "artois"
+                    add("", "S")
+                else:
+                    add("S")
+                current += 2 if at(current + 1, "S", "Z") else 1
+
+        elif char == "T":
+            if at(current, "TION", "TIA", "TCH"):
+                add("X")
+                current += 3
+            elif at(current, "TH", "TTH"):
+                if at(current + 2, "OM", "AM") or at(0, "VAN ", "VON ", "SCH"):
+                    add("T")
+                else:
+                    add("0", "T")
+                current += 2
+            else:
+                add("T")
+                current += 2 if at(current + 1, "T", "D") else 1
+
+        elif char == "V":
+            add("F")
+            current += 2 if at(current + 1, "V") else 1
+
+        elif char == "W":
+            if at(current, "WR"):
+                add("R")
+                current += 2
+            elif current == 0 and (is_vowel(1) or at(0, "WH")):
+                # "Wasserman" sounds with A or F
+                add("A", "F" if is_vowel(1) else "A")
+                current += 1
+            elif (current == length - 1 and is_vowel(current - 1)) or at(current - 1, "EWSKI", "EWSKY", "OWSKI", "OWSKY"):
+                add("", "F")
+                current += 1
+            elif at(current, "WICZ", "WITZ"):
+                add("TS", "FX")
+                current += 4
+            else:
+                current += 1
+
+        elif char == "X":
+            if not (current == length - 1 and (at(current - 3, "IAU", "EAU") or at(current - 2, "AU", "OU"))):
+                add("KS")
+            current += 2 if at(current + 1, "C", "X") else 1
+
+        elif char == "Z":
+            if at(current + 1, "H"):
+                add("J")
+                current += 2
+            else:
+                add("S", "TS" if at(current + 1, "ZO", "ZI", "ZA") else "S")
+                current += 2 if at(current + 1, "Z") else 1
+
+        else:
+            current += 1
+
+    return "".join(primary), "".join(alternate)
+
+
+def phrase_keys(phrase: str) -> List[str]:
+    """Phonetic keys of a phrase: its words' codes joined, so splits like
+    "calculate her" still line up with "calculator"
+    """
+    codes = [double_metaphone(token) for token in tokenize(phrase)]
+    keys = ["".join(code[0] for code in codes), "".join(code[1] for code in codes)]
+    return [key for i, key in enumerate(keys) if key and key not in keys[:i]]
+
+
+def edit_distance(first: str, second: str, bound: int = None) -> int:
+    """Levenshtein distance between two short keys
+
+    With a bound, gives up as soon as the distance must exceed it and
+    returns bound + 1.
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    if bound is not None and len(first) - len(second) > bound:
+        return bound + 1
+    previous = list(range(len(second) + 1))
+    for i, char in enumerate(first, 1):
+        current = [i]
+        row_best = i
+        left = i
+        for j, other in enumerate(second, 1):
+            cost = previous[j - 1] if char == other else previous[j - 1] + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if left + 1 < cost:
+                cost = left + 1
+            current.append(cost)
+            left = cost
+            if cost < row_best:
+                row_best = cost
+        if bound is not None and row_best > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree of keys for bounded edit-distance queries
+
+    The triangle inequality lets a query skip every subtree whose edge
+    distance lies outside [d - limit, d + limit]. Distances are only
+    computed as far as the largest edge below a node makes useful, so
+    most comparisons stop after a row or two.
+    """
+
+    def __init__(self):
+        # [key, {distance: child node}, largest distance among the children]
+        self._root: Optional[list] = None
+
+    def add(self, key: str) -> None:
+        if self._root is None:
+            self._root = [key, {}, 0]
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(key, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [key, {}, 0]
+                node[2] = max(node[2], distance)
+                return
+            node = child
+
+    def search(self, key: str, limit: int) -> List[Tuple[int, str]]:
+        """(distance, key) of every key within limit edits"""
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node_key, children, largest_edge = stack.pop()
+            # Beyond this no child edge can lie within limit of the distance
+            distance = edit_distance(key, node_key, limit + largest_edge)
+            if distance <= limit:
+                found.append((distance, node_key))
+            for edge, child in children.items():
+                if distance - limit <= edge <= distance + limit:
+                    stack.append(child)
+        return found
+
+
+class PhoneticIndex:
+    """Finds phrases in an utterance by how they sound
+
+    Every phrase is stored under its Double Metaphone keys. A lookup keys
+    each run of words in the utterance; exact key hits cost a dict lookup
+    and near misses are found through BK-trees bucketed by word count and
+    key length, with longer keys allowed more edits. Phrases with keys shorter than min_key_length
+    are left to exact matching, since a few sounds collide too often.
+
+    Metaphone drops most vowels, so unrelated words can share a key.
+    With max_spelling_ratio set, a hit also has to be spelled within that
+    share of edits of the phrase ("sistem scan" passes, "doing" for
+    "thank" doesn't). Spoken letter names are read as the letters they
+    name, so "jay pee" is spelled like "jp" while "job" and "jeep" aren't.
+    """
+
+    def __init__(self, min_key_length: int = 2, max_spelling_ratio: float = None):
+        self.min_key_length = min_key_length
+        self.max_spelling_ratio = max_spelling_ratio
+        # key -> [(phrase, value, word count, letters)]
+        self._phrases: Dict[str, List[Tuple[str, object, int, str]]] = {}
+        # One tree per (words in the phrase, key length), so a run of words
+        # is only compared with keys it could be within reach of
+        self._trees: Dict[Tuple[int, int], BKTree] = {}
+        self._max_words = 1
+
+    @classmethod
+    def from_phrases(cls, phrases: Iterable[str], **options) -> "PhoneticIndex":
+        index = cls(**options)
+        for phrase in phrases:
+            index.add(phrase, phrase)
+        return index
+
+    def add(self, phrase: str, value: object) -> None:
+        """Index a phrase; lookups report value for it"""
+        tokens = tokenize(phrase)
+        entry = (phrase, value, len(tokens), "".join(tokens))
+        for key in phrase_keys(phrase):
+            if len(key) < self.min_key_length:
+                continue
+            entries = self._phrases.setdefault(key, [])
+            if entry not in entries:
+                entries.append(entry)
+            self._trees.setdefault((len(tokens), len(key)), BKTree()).add(key)
+            # One spoken word is often heard as two ("calculate her")
+            self._max_words = max(self._max_words, len(tokens) + 1)
+
+    @staticmethod
+    def max_distance(key: str) -> int:
+        if len(key) <= 4:
+            return 0
+        return 1 if len(key) <= 7 else 2
+
+    def _spelled_alike(self, tokens: List[str], letters: str) -> bool:
+        if self.max_spelling_ratio is None:
+            return True
+        spellings = {"".join(tokens), "".join(LETTER_NAMES.get(token, token) for token in tokens)}
+        return any(edit_distance(heard, letters) <= self.max_spelling_ratio * max(len(heard), len(letters))
+                   for heard in spellings)
+
+    def _windows(self, tokens: List[str]) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, key) of every run of words that could be a phrase"""
+        codes = [double_metaphone(token) for token in tokens]
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(len(tokens), start + self._max_words) + 1):
+                window = codes[start:end]
+                keys = {"".join(code[0] for code in window), "".join(code[1] for code in window)}
+                for key in keys:
+                    if len(key) >= self.min_key_length:
+                        yield start, end, key
+
+    def _matches(self, tokens: List[str], start: int, end: int, distance: int,
+                 key: str) -> Iterator[PhoneticMatch]:
+        words = end - start
+        for phrase, value, phrase_words, letters in self._phrases[key]:
+            # The phrase's words, or one more if a word was split in two
+            if phrase_words <= words <= phrase_words + 1 \
+                    and self._spelled_alike(tokens[start:end], letters):
+                yield PhoneticMatch(value, phrase, start, end, distance)
+
+    def lookup(self, text: str) -> List[PhoneticMatch]:
+        """The closest-sounding indexed phrases in the text, longest span first
+
+        Exact key hits need only dict lookups; the BK-trees are searched
+        only when no run of words sounds exactly like a phrase.
+        """
+        tokens = tokenize(text)
+        windows = list(self._windows(tokens))
+        found = [match for start, end, key in windows if key in self._phrases
+                 for match in self._matches(tokens, start, end, 0, key)]
+
+        if not found:
+            for start, end, key in windows:
+                limit = self.max_distance(key)
+                if not limit:
+                    continue
+                words = end - start
+                for size in (words, words - 1):
+                    for length in range(len(key) - limit, len(key) + limit + 1):
+                        tree = self._trees.get((size, length))
+                        if tree is None:
+                            continue
+                        for distance, hit in tree.search(key, limit):
+                            found.extend(self._matches(tokens, start, end, distance, hit))
+            if found:
+                closest = min(match.distance for match in found)
+                found = [match for match in found if match.distance == closest]
+
+        # Primary and alternate keys often find the same phrase twice
+        found = list({(match.phrase, match.start, match.end): match for match in found}.values())
+        found.sort(key=lambda match: (match.start - match.end, match.start))
+        return found
+
+    def best(self, text: str) -> Optional[PhoneticMatch]:
+        matches = self.lookup(text)
+        return matches[0] if matches else None
@@ -0,0 +1,131 @@
+"""
+Pressure Monitor Module - Linux PSI triggers for CPU, memory and I/O stalls
+"""
+
+import os
+import select
+import threading
+from typing import Callable, Dict, List, Optional
+from . import config
+
+PRESSURE_DIR = "/proc/pressure"
+
+
+def read_pressure(resource: str, kind: str = "some") -> Optional[float]:
+    """Share of the last 10 seconds (percent) that tasks stalled on a resource"""
+    try:
+        with open(os.path.join(PRESSURE_DIR, resource)) as handle:
+            for line in handle:
+                fields = line.split()
+                if fields and fields[0] == kind:
+                    return float(fields[1].split("=")[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+
+class PressureMonitor:
+    """Blocks in poll() on PSI trigger files and reports stalls as they happen
+
+    Each trigger asks the kernel to signal POLLPRI when tasks stall for
+    more than a given time within a window, so the thread sleeps
+    indefinitely while the system is healthy. Unprivileged triggers need
+    windows that are multiples of 2 seconds. start() returns False when
+    the kernel has no PSI or refuses the triggers, and callers keep
+    using the metrics sampler in that case.
+    """
+
+    def __init__(self, triggers: Dict[str, str] = None):
+        # resource -> "some|full <stall us> <window us>"
+        self.triggers = triggers or config.PSI_TRIGGERS
+        self._listeners: List[Callable[[str, float], None]] = []
+        self._fds: Dict[int, str] = {}
+        self._wake_read: Optional[int] = None
+        self._wake_write: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[[str, float], None]) -> None:
+        """Call callback(resource, avg10 percent) on the monitor thread for each stall"""
+        self._listeners.append(callback)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def is_supported() -> bool:
+        return hasattr(select, "poll") and os.path.isdir(PRESSURE_DIR)
+
+    def start(self) -> bool:
+        """Register the triggers; False when PSI isn't available here"""
+        if self.is_running:
+            return True
+        if not self.is_supported():
+            return False
+
+        for resource, trigger in self.triggers.items():
+            try:
+                fd = os.open(os.path.join(PRESSURE_DIR, resource), os.O_RDWR | os.O_NONBLOCK)
+            except OSError:
+                continue
+            try:
+                os.write(fd, trigger.encode() + b"\0")
+            except OSError:
+                # Old kernel, or a window an unprivileged user may not use
+                os.close(fd)
+                continue
+            self._fds[fd] = resource
+
+        if not self._fds:
+            return False
+
+        self._wake_read, self._wake_write = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="jp-pressure", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop waiting for stalls and release the triggers"""
+        if self._wake_write is not None:
+            os.write(self._wake_write, b"x")
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for fd in list(self._fds) + [self._wake_read, self._wake_write]:
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fds.clear()
+        self._wake_read = self._wake_write = None
+
+    def _run(self) -> None:
+        poller = select.poll()
+        for fd in self._fds:
+            poller.register(fd, select.POLLPRI)
+        poller.register(self._wake_read, select.POLLIN)
+
+        while True:
+            try:
+                events = poller.poll()
+            except InterruptedError:
+                continue
+            for fd, mask in events:
+                if fd == self._wake_read:
+                    return
+                resource = self._fds.get(fd)
+                if resource is None:
+                    continue
+                if mask & select.POLLERR:
+                    # The trigger went away; stop polling it
+                    poller.unregister(fd)
+                    continue
+                self._emit(resource, read_pressure(resource) or 0.0)
+
+    def _emit(self, resource: str, percent: float) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(resource, percent)
+            except Exception as e:
+                print(f"Pressure listener error: {e}")
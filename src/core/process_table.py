@@ -0,0 +1,104 @@
+"""
+Process Table Module - Top-N process resource usage from incremental psutil samples
+"""
+
+import heapq
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+import psutil
+from . import config
+
+ProcessUsage = namedtuple("ProcessUsage", ["pid", "name", "cpu_percent", "rss", "io_rate"])
+
+# Sort keys for top(): CPU percent, resident memory, bytes read+written per second
+SORT_KEYS = {
+    "cpu": lambda usage: usage.cpu_percent,
+    "memory": lambda usage: usage.rss,
+    "io": lambda usage: usage.io_rate,
+}
+
+
+class ProcessTable:
+    """Per-process CPU, memory and I/O rates computed between two samples
+
+    Each sample remembers every process's cumulative CPU time and I/O
+    bytes, so the next sample turns them into rates without a blocking
+    measurement interval. The background metrics sampler calls sample() on
+    every tick, so queries read rates over the last interval instead of
+    measuring on the caller's thread. Processes are keyed by
+    (pid, create_time) so a reused PID does not inherit another process's
+    counters.
+    """
+
+    def __init__(self):
+        self._attrs = ['pid', 'name', 'create_time', 'cpu_times', 'memory_info']
+        if hasattr(psutil.Process, "io_counters"):
+            # Not available on macOS
+            self._attrs.append('io_counters')
+        # (pid, create_time) -> (cpu seconds, io bytes)
+        self._previous: Dict[Tuple[int, float], Tuple[float, int]] = {}
+        self._previous_time: Optional[float] = None
+        self._usage: List[ProcessUsage] = []
+        # Whether _usage holds rates over a recent interval rather than a first reading
+        self._has_rates = False
+        self._lock = threading.Lock()
+
+    def sample(self) -> List[ProcessUsage]:
+        """Read the process list once and compute rates since the previous sample"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = (now - self._previous_time) if self._previous_time else None
+            current: Dict[Tuple[int, float], Tuple[float, int]] = {}
+            usage: List[ProcessUsage] = []
+
+            for process in psutil.process_iter(self._attrs, ad_value=None):
+                info = process.info
+                if info['pid'] == 0:
+                    # Windows' System Idle Process reports idle time as CPU use
+                    continue
+                cpu_times = info.get('cpu_times')
+                memory_info = info.get('memory_info')
+                io_counters = info.get('io_counters')
+
+                cpu_seconds = (cpu_times.user + cpu_times.system) if cpu_times else 0.0
+                io_bytes = (io_counters.read_bytes + io_counters.write_bytes) if io_counters else 0
+                key = (info['pid'], info.get('create_time'))
+                current[key] = (cpu_seconds, io_bytes)
+
+                cpu_percent = io_rate = 0.0
+                previous = self._previous.get(key)
+                if previous and elapsed:
+                    cpu_percent = max(0.0, (cpu_seconds - previous[0]) / elapsed * 100)
+                    io_rate = max(0.0, (io_bytes - previous[1]) / elapsed)
+
+                usage.append(ProcessUsage(
+                    info['pid'], info.get('name') or "?", cpu_percent,
+                    memory_info.rss if memory_info else 0, io_rate
+                ))
+
+            # Exited processes drop out here, so the table never grows unbounded
+            self._previous = current
+            self._previous_time = now
+            self._usage = usage
+            self._has_rates = elapsed is not None and elapsed <= config.PROCESS_SAMPLE_MAX_AGE
+            return usage
+
+    def refresh(self) -> List[ProcessUsage]:
+        """Latest usage, measuring here only when no recent background sample exists"""
+        with self._lock:
+            if (self._has_rates and
+                    time.monotonic() - self._previous_time <= config.PROCESS_SAMPLE_MAX_AGE):
+                return self._usage
+        # Nothing is sampling in the background (e.g. a headless run): take a short baseline
+        self.sample()
+        time.sleep(config.PROCESS_BASELINE_INTERVAL)
+        return self.sample()
+
+    def top(self, by: str = "cpu", limit: int = None,
+            usage: List[ProcessUsage] = None) -> List[ProcessUsage]:
+        """Largest consumers from the latest sample, ordered by cpu, memory or io"""
+        limit = limit or config.TOP_PROCESSES_COUNT
+        key = SORT_KEYS[by]
+        return heapq.nlargest(limit, self._usage if usage is None else usage, key=key)
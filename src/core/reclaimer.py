@@ -0,0 +1,171 @@
+"""
+Reclaimer Module - Finds and deletes stale temp and cache files
+"""
+
+import fnmatch
+import glob
+import os
+import stat
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from . import config
+
+# A directory whose old files are safe to delete
+ReclaimTarget = namedtuple("ReclaimTarget", ["name", "path"])
+
+# Files found under one target: [(path, bytes)] and their total size
+TargetPlan = namedtuple("TargetPlan", ["target", "files", "total_bytes"])
+
+ReclaimResult = namedtuple("ReclaimResult", ["freed_bytes", "files_deleted", "files_failed", "elapsed"])
+
+
+def cache_targets() -> List[ReclaimTarget]:
+    """Temp and cache directories for this platform that exist"""
+    home = os.path.expanduser("~")
+    candidates: List[Tuple[str, str]] = [("Temp files", tempfile.gettempdir())]
+
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        roaming = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
+        candidates += [
+            ("Windows temp", os.path.join(local, "Temp")),
+            ("pip cache", os.path.join(local, "pip", "Cache")),
+            ("npm cache", os.path.join(local, "npm-cache")),
+            ("npm cache", os.path.join(roaming, "npm-cache")),
+            ("Chrome cache", os.path.join(local, "Google", "Chrome", "User Data", "Default", "Cache")),
+            ("Edge cache", os.path.join(local, "Microsoft", "Edge", "User Data", "Default", "Cache")),
+        ]
+        candidates += [("Firefox cache", path) for path in
+                       glob.glob(os.path.join(local, "Mozilla", "Firefox", "Profiles", "*", "cache2"))]
+    elif sys.platform == "darwin":
+        candidates += [
+            ("Application caches", os.path.join(home, "Library", "Caches")),
+            ("npm cache", os.path.join(home, ".npm", "_cacache")),
+        ]
+    else:
+        # ~/.cache holds pip, Chrome, Firefox and most other application caches
+        candidates += [
+            ("Application caches", os.environ.get("XDG_CACHE_HOME", os.path.join(home, ".cache"))),
+            ("npm cache", os.path.join(home, ".npm", "_cacache")),
+        ]
+
+    targets = []
+    seen = set()
+    for name, path in candidates:
+        real = os.path.realpath(path)
+        if real not in seen and os.path.isdir(real):
+            seen.add(real)
+            targets.append(ReclaimTarget(name, real))
+    return targets
+
+
+class Reclaimer:
+    """Plans and performs deletion of old files in temp and cache directories
+
+    Only regular files owned by the current user and untouched for
+    RECLAIM_MIN_AGE_HOURS are considered, so sockets, FIFOs, other users'
+    files and files a running program is still using are left alone.
+    Directories matching RECLAIM_SKIP_DIRS (ssh-agent, tmux and X11
+    sockets) and directories owned by someone else are never entered.
+    Nothing is deleted until execute() is called with a plan from scan().
+    """
+
+    def __init__(self, workers: int = None, min_age_hours: float = None):
+        self.workers = workers or config.RECLAIM_WORKERS
+        self.min_age_hours = config.RECLAIM_MIN_AGE_HOURS if min_age_hours is None else min_age_hours
+        # No ownership to check on Windows, where the targets are per-user anyway
+        self.uid = os.getuid() if hasattr(os, "getuid") else None
+
+    def _owned(self, stat_result: os.stat_result) -> bool:
+        return self.uid is None or stat_result.st_uid == self.uid
+
+    @staticmethod
+    def _skipped_dir(name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in config.RECLAIM_SKIP_DIRS)
+
+    def _scan_target(self, target: ReclaimTarget) -> TargetPlan:
+        """Collect deletable files under one target"""
+        cutoff = time.time() - self.min_age_hours * 3600
+        files = []
+        total = 0
+        stack = [target.path]
+        while stack:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            stat_result = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if not self._owned(stat_result):
+                            continue
+                        if stat.S_ISDIR(stat_result.st_mode):
+                            if not self._skipped_dir(entry.name):
+                                stack.append(entry.path)
+                            continue
+                        if not stat.S_ISREG(stat_result.st_mode):
+                            # Symlinks, sockets, FIFOs and devices
+                            continue
+                        if max(stat_result.st_mtime, stat_result.st_atime) < cutoff:
+                            files.append((entry.path, stat_result.st_size))
+                            total += stat_result.st_size
+            except OSError:
+                # Skip directories we can't access
+                continue
+        return TargetPlan(target, files, total)
+
+    def scan(self, targets: List[ReclaimTarget] = None) -> List[TargetPlan]:
+        """Dry run: what would be deleted from each target, largest first"""
+        targets = cache_targets() if targets is None else targets
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jp-reclaim") as executor:
+            plans = list(executor.map(self._scan_target, targets))
+        return sorted((plan for plan in plans if plan.files), key=lambda plan: plan.total_bytes,
+                      reverse=True)
+
+    @staticmethod
+    def _delete(item: Tuple[str, int]) -> Optional[int]:
+        path, size = item
+        try:
+            os.remove(path)
+            return size
+        except OSError:
+            # In use, already gone or not ours to delete
+            return None
+
+    def execute(self, plans: List[TargetPlan]) -> ReclaimResult:
+        """Delete the planned files on a bounded worker pool"""
+        started = time.monotonic()
+        freed = deleted = failed = 0
+        emptied = set()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jp-reclaim") as executor:
+            for plan in plans:
+                for (path, _), size in zip(plan.files, executor.map(self._delete, plan.files)):
+                    if size is None:
+                        failed += 1
+                    else:
+                        freed += size
+                        deleted += 1
+                        emptied.add((os.path.dirname(path), plan.target.path))
+
+        for directory, root in emptied:
+            self._remove_empty_parents(directory, root)
+
+        return ReclaimResult(freed, deleted, failed, time.monotonic() - started)
+
+    @staticmethod
+    def _remove_empty_parents(directory: str, root: str) -> None:
+        """Remove directories the cleanup emptied, up to but not including the target"""
+        while directory != root and directory.startswith(root + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # Not empty, or already removed from another file's parent chain
+                if os.path.isdir(directory):
+                    return
+            directory = os.path.dirname(directory)
@@ -0,0 +1,128 @@
+"""
+Result Cache Module - Bounded LRU + TTL cache for file search and listing results
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from . import config
+
+
+class ResultCache:
+    """LRU cache with per-entry expiry and a total size budget
+
+    Each entry remembers the directories it was computed from, so a
+    filesystem change event can drop exactly the entries it affects.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, ttl: float = None):
+        self.max_entries = max_entries or config.RESULT_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or config.RESULT_CACHE_MAX_BYTES
+        self.ttl = config.RESULT_CACHE_TTL if ttl is None else ttl
+        # key -> (value, roots, expires_at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Tuple[str, ...], float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, extensions: Iterable[str] = (), scope: str = "",
+                 roots: Iterable[str] = ()) -> Tuple:
+        """Build a cache key from the parts that identify a search"""
+        return (query.lower(), frozenset(ext.lower() for ext in extensions), scope,
+                tuple(os.path.abspath(root) for root in roots))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[2] < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """Bytes held by a value, counting the items of (nested) tuples"""
+        size = sys.getsizeof(value)
+        if isinstance(value, tuple):
+            size += sum(ResultCache.estimate_size(item) for item in value)
+        return size
+
+    def put(self, key: Hashable, value: Any, roots: Iterable[str] = ()) -> None:
+        """Store a value, evicting least recently used entries past the limits"""
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            return
+        roots = tuple(os.path.abspath(root) for root in roots)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, roots, time.monotonic() + self.ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_path(self, path: str) -> int:
+        """Drop every entry computed from a directory that contains or lies below path"""
+        path = os.path.abspath(path)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if any(self._overlaps(path, root) for root in entry[1])]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[3]
+
+    @staticmethod
+    def _overlaps(path: str, root: str) -> bool:
+        """True when path is root, lies below it, or contains it"""
+        if path == root:
+            return True
+        return (path.startswith(root.rstrip(os.sep) + os.sep) or
+                root.startswith(path.rstrip(os.sep) + os.sep))
+
+    def handle_file_event(self, event) -> None:
+        """FileWatcher listener: invalidate results touched by a change"""
+        self.invalidate_path(event.path)
+        if event.dest_path:
+            self.invalidate_path(event.dest_path)
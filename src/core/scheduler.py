@@ -0,0 +1,134 @@
+"""
+Scheduler Module - Interval jobs on one thread, and alert rate limiting
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class JobScheduler:
+    """Runs periodic jobs from a heap ordered by next run time
+
+    A single thread sleeps on a condition variable until the earliest job
+    is due, so stop() and newly added jobs wake it immediately instead of
+    waiting out a sleep.
+    """
+
+    def __init__(self, name: str = "jp-scheduler"):
+        self.name = name
+        # (due time, tie breaker, job name, job id)
+        self._heap: List[Tuple[float, int, str, int]] = []
+        # job name -> (interval, func, job id); heap entries of a replaced job no longer match its id
+        self._jobs: Dict[str, Tuple[float, Callable[[], None], int]] = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(self, name: str, interval: float, func: Callable[[], None],
+                initial_delay: float = None) -> None:
+        """Run func every interval seconds, first after initial_delay (default: one interval)
+
+        Adding a job under an existing name replaces it rather than running both.
+        """
+        delay = interval if initial_delay is None else initial_delay
+        with self._condition:
+            job_id = next(self._counter)
+            self._jobs[name] = (interval, func, job_id)
+            heapq.heappush(self._heap, (time.monotonic() + delay, job_id, name, job_id))
+            self._condition.notify()
+
+    def remove_job(self, name: str) -> None:
+        """Stop running a job; its heap entry is skipped when it comes due"""
+        with self._condition:
+            self._jobs.pop(name, None)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the scheduler and drop its jobs, waking its thread at once"""
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._jobs.clear()
+            self._condition.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if not self._running:
+                    return
+
+                due, _, name, job_id = heapq.heappop(self._heap)
+                job = self._jobs.get(name)
+                if job is None or job[2] != job_id:
+                    continue
+                interval, func, _ = job
+                # Schedule from the due time so jobs don't drift, but never in the past
+                next_run = max(due + interval, time.monotonic())
+                heapq.heappush(self._heap, (next_run, next(self._counter), name, job_id))
+
+            try:
+                func()
+            except Exception as e:
+                print(f"Monitoring error in {name}: {e}")
+
+
+class AlertGate:
+    """Decides when an alert may be shown
+
+    An alert is raised once when its raise condition becomes true and stays
+    raised until its (stricter) clear condition holds, so a metric hovering
+    around the threshold doesn't flap. Once shown, the same alert is held
+    back for a cooldown even if it clears and comes back.
+    """
+
+    def __init__(self, cooldown: float):
+        self.cooldown = cooldown
+        self._raised: Dict[str, bool] = {}
+        self._last_shown: Dict[str, float] = {}
+
+    def update(self, name: str, raise_condition: bool, clear_condition: bool) -> bool:
+        """Feed the latest conditions; True when the alert should be shown now"""
+        if self._raised.get(name):
+            if clear_condition:
+                self._raised[name] = False
+            return False
+
+        if not raise_condition:
+            return False
+
+        self._raised[name] = True
+        now = time.monotonic()
+        last = self._last_shown.get(name)
+        if last is not None and now - last < self.cooldown:
+            return False
+        self._last_shown[name] = now
+        return True
+
+    def is_raised(self, name: str) -> bool:
+        return self._raised.get(name, False)
@@ -0,0 +1,91 @@
+"""
+Search Stream Module - Incremental file search results with a time budget
+"""
+
+import os
+import threading
+import time
+from typing import Iterator, List, Optional, Tuple
+
+
+class SearchStream:
+    """Iterable of matching paths that records whether the search finished
+
+    The source yields ``(path, root)`` pairs for matches and ``None`` as a
+    heartbeat after each directory, so the deadline is honoured even while
+    the walk is passing through directories without matches.
+    """
+
+    COMPLETED = "completed"
+    MAX_RESULTS = "max_results"
+    DEADLINE = "deadline"
+    CANCELLED = "cancelled"
+
+    def __init__(self, source: Iterator[Optional[Tuple[str, str]]],
+                 max_results: int = None, deadline: float = None):
+        self._source = source
+        self.max_results = max_results
+        self.deadline = deadline  # time.monotonic() value
+        self.results: List[str] = []
+        self.locations: List[str] = []
+        self.stop_reason: Optional[str] = None
+        self.first_match = threading.Event()
+        self.finished = threading.Event()
+        self._started = time.monotonic()
+        self._ended: Optional[float] = None
+
+    @property
+    def completed(self) -> bool:
+        """True when every root was searched to the end"""
+        return self.stop_reason == self.COMPLETED
+
+    @property
+    def truncated(self) -> bool:
+        """True when the search was cut off by the deadline or result limit"""
+        return self.stop_reason in (self.MAX_RESULTS, self.DEADLINE)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent searching so far"""
+        return (self._ended or time.monotonic()) - self._started
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            if self.max_results is not None and self.max_results <= 0:
+                self.stop_reason = self.MAX_RESULTS
+                return
+
+            for item in self._source:
+                if self.deadline is not None and time.monotonic() >= self.deadline:
+                    self.stop_reason = self.DEADLINE
+                    return
+                if item is None:
+                    continue
+
+                path, root = item
+                self.results.append(path)
+                location = os.path.basename(root)
+                if location not in self.locations:
+                    self.locations.append(location)
+                self.first_match.set()
+                yield path
+
+                if self.max_results is not None and len(self.results) >= self.max_results:
+                    self.stop_reason = self.MAX_RESULTS
+                    return
+
+            self.stop_reason = self.COMPLETED
+        finally:
+            if self.stop_reason is None:
+                self.stop_reason = self.CANCELLED
+            close = getattr(self._source, "close", None)
+            if close:
+                close()
+            self._ended = time.monotonic()
+            self.finished.set()
+
+    def collect(self) -> List[str]:
+        """Run the search to the end and return every match"""
+        for _ in self:
+            pass
+        return self.results
@@ -2,24 +2,99 @@
 Speech Engine Module - Handles speech recognition and text-to-speech
 """
 
+import json
+import threading
 import speech_recognition as sr
-import pyttsx3
 from typing import Optional
 from . import config
 
+class GoogleRecognizer:
+    """Google Web Speech API through speech_recognition; needs the network"""
+    
+    name = "google"
+    
+    def __init__(self, recognizer: sr.Recognizer):
+        self.recognizer = recognizer
+    
+    def recognize(self, audio: sr.AudioData) -> str:
+        return self.recognizer.recognize_google(audio)
+
+class VoskRecognizer:
+    """Offline recognition with a Vosk model loaded once and reused
+    
+    One KaldiRecognizer decodes every utterance; FinalResult() resets it
+    for the next one. Raises like speech_recognition does, so both
+    backends are handled the same way.
+    """
+    
+    name = "vosk"
+    
+    def __init__(self, model_path: str = None, sample_rate: int = None):
+        # Optional dependency, only imported when this backend is selected
+        from vosk import KaldiRecognizer, Model, SetLogLevel
+        
+        SetLogLevel(-1)
+        self.sample_rate = sample_rate or config.VOSK_SAMPLE_RATE
+        self.model = Model(model_path or config.VOSK_MODEL_PATH)
+        self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
+        self._lock = threading.Lock()
+    
+    def recognize(self, audio: sr.AudioData) -> str:
+        data = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        with self._lock:
+            self.recognizer.AcceptWaveform(data)
+            text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+def create_recognizer_backend(name: str, recognizer: sr.Recognizer = None):
+    """Build a recognition backend by name; raises if it cannot be loaded"""
+    if name == GoogleRecognizer.name:
+        return GoogleRecognizer(recognizer or sr.Recognizer())
+    if name == VoskRecognizer.name:
+        return VoskRecognizer()
+    raise ValueError(f"unknown speech recognizer '{name}'")
+
 class SpeechEngine:
     """Handles speech recognition and text-to-speech functionality"""
     
     def __init__(self):
         """Initialize speech recognition and TTS engine"""
         self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
+        # Created by the first speak(), on the thread that will keep driving it
+        self.tts_engine = None
+        self.tts_failed = False
         self.microphone = None
-        self.setup_tts()
+        self.backend = None
+        self.setup_backend()
         self.setup_microphone()
     
+    def setup_backend(self) -> None:
+        """Load the configured recognition backend once, falling back to Google"""
+        try:
+            self.backend = create_recognizer_backend(config.SPEECH_RECOGNIZER, self.recognizer)
+        except Exception as e:
+            print(f"⚠️ Speech recognizer '{config.SPEECH_RECOGNIZER}' unavailable ({e}), using Google")
+            self.backend = GoogleRecognizer(self.recognizer)
+        print(f"✅ Speech recognition: {self.backend.name}")
+    
     def setup_tts(self) -> None:
-        """Configure text-to-speech settings"""
+        """Create and configure the TTS engine
+
+        pyttsx3 engines (SAPI, NSSpeech) only work from the thread that
+        created them, so this runs on the first speak() rather than in
+        __init__.
+        """
+        try:
+            # Imported here so the recognizer backends (and the speech benchmark) work without TTS
+            import pyttsx3
+            self.tts_engine = pyttsx3.init()
+        except Exception as e:
+            self.tts_failed = True
+            print(f"⚠️ TTS unavailable, replies will only be printed: {e}")
+            return
+        
         try:
             voices = self.tts_engine.getProperty('voices')
             if voices:
@@ -56,18 +131,29 @@ class SpeechEngine:
     
     def speak(self, text: str) -> None:
         """Convert text to speech"""
+        print(f"🤖 JP: {text}")
+        if self.tts_engine is None and not self.tts_failed:
+            self.setup_tts()
+        if self.tts_engine is None:
+            return
+        
         try:
-            print(f"🤖 JP: {text}")
             self.tts_engine.say(text)
             self.tts_engine.runAndWait()
         except Exception as e:
             print(f"⚠️ TTS Error: {e}")
-            print(f"🤖 JP: {text}")  # Fallback to text only
     
     def listen(self, wake_word_mode: bool = False) -> str:
         """Listen for speech and convert to text"""
-        if not self.microphone:
+        audio = self.capture(wake_word_mode)
+        if audio is None:
             return ""
+        return self.recognize(audio, wake_word_mode)
+    
+    def capture(self, wake_word_mode: bool = False) -> Optional[sr.AudioData]:
+        """Record one utterance from the microphone; None on timeout"""
+        if not self.microphone:
+            return None
         
         timeout = config.WAKE_WORD_TIMEOUT if wake_word_mode else config.TIMEOUT_SECONDS
         
@@ -79,29 +165,35 @@ class SpeechEngine:
                     print("🎤 Listening... (speak now)")
                 
                 # Listen for audio
-                audio = self.recognizer.listen(
+                return self.recognizer.listen(
                     source, 
                     timeout=timeout,
                     phrase_time_limit=config.PHRASE_TIME_LIMIT
                 )
                 
-                if not wake_word_mode:
-                    print("🔄 Processing speech...")
-                
-                # Convert to text using Google Speech Recognition
-                text = self.recognizer.recognize_google(audio)
-                
-                if wake_word_mode:
-                    print(f"🔍 Heard: {text}")
-                else:
-                    print(f"👤 You: {text}")
-                    
-                return text.lower()
-                
         except sr.WaitTimeoutError:
             if not wake_word_mode:
                 print(config.ERROR_MESSAGES["speech_timeout"])
-            return ""
+            return None
+        except Exception as e:
+            print(f"{config.ERROR_MESSAGES['general_error']}: {e}")
+            return None
+    
+    def recognize(self, audio: sr.AudioData, wake_word_mode: bool = False) -> str:
+        """Convert recorded audio to lower-case text; "" if nothing was understood"""
+        try:
+            if not wake_word_mode:
+                print("🔄 Processing speech...")
+            
+            text = self.backend.recognize(audio)
+            
+            if wake_word_mode:
+                print(f"🔍 Heard: {text}")
+            else:
+                print(f"👤 You: {text}")
+                
+            return text.lower()
+            
         except sr.UnknownValueError:
             if not wake_word_mode:
                 print(config.ERROR_MESSAGES["speech_unclear"])
@@ -3,36 +3,409 @@ System Manager Module - Handles system operations and information
 """
 
 import os
-import psutil
+import sqlite3
 import subprocess
+import threading
+import time
 import webbrowser
-from typing import Dict, List, Optional
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from . import config
+from .content_search import ContentMatch, ContentSearcher
+from .disk_usage import DiskUsageAnalyzer, UsageReport, format_size
+from .file_index import FileIndex
+from .fs_walker import ParallelWalker
+from .fs_watcher import FileWatcher, create_watcher
+from .intent_router import tokenize
+from .metrics_exporter import MetricFamily
+from .metrics_sampler import MetricsSampler
+from .partitions import MountUsage, PartitionInventory
+from .phonetic_index import PhoneticIndex
+from .process_table import ProcessTable, ProcessUsage
+from .reclaimer import ReclaimResult, Reclaimer, TargetPlan
+from .result_cache import ResultCache
+from .search_stream import SearchStream
+from .trigram_index import TrigramIndex
+
+# A file search's spoken answer and the paths behind it, for follow-up questions;
+# truncated when the result limit or deadline cut the search short
+FileSearchResult = namedtuple("FileSearchResult", ["text", "paths", "truncated"], defaults=(False,))
 
 class SystemManager:
     """Handles system information and operations"""
     
+    _file_index: Optional[FileIndex] = None
+    _file_index_failed = False
+    _file_watcher: Optional[FileWatcher] = None
+    _trigram_index: Optional[TrigramIndex] = None
+    _trigram_generation = -1
+    _trigram_builder: Optional[threading.Thread] = None
+    _result_cache = ResultCache()
+    _content_searcher: Optional[ContentSearcher] = None
+    _disk_usage = DiskUsageAnalyzer()
+    _metrics_sampler: Optional[MetricsSampler] = None
+    _process_table = ProcessTable()
+    _partitions = PartitionInventory()
+    _reclaimer = Reclaimer()
+    
+    @classmethod
+    def get_file_index(cls) -> Optional[FileIndex]:
+        """Get the shared file index, opening it on first use"""
+        if cls._file_index is None and not cls._file_index_failed:
+            try:
+                cls._file_index = FileIndex()
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ File index unavailable, using live search: {e}")
+                cls._file_index_failed = True
+        return cls._file_index
+    
+    @classmethod
+    def start_file_watcher(cls) -> Optional[FileWatcher]:
+        """Watch the search roots and keep the file index current from change events"""
+        if cls._file_watcher is None:
+            index = cls.get_file_index()
+            if not index:
+                return None
+            
+            watcher = create_watcher(config.SEARCH_EXCLUDED_DIRS)
+            index.attach_watcher(watcher)
+            watcher.add_listener(cls._update_trigram_index)
+            watcher.add_listener(cls._result_cache.handle_file_event)
+            watcher.add_listener(cls._disk_usage.handle_file_event)
+            watcher.start(cls.get_search_locations(system_wide=True, include_system=True))
+            cls._file_watcher = watcher
+        return cls._file_watcher
+    
+    @classmethod
+    def stop_file_watcher(cls) -> None:
+        """Stop the file watcher if it is running"""
+        if cls._file_watcher:
+            cls._file_watcher.stop()
+            cls._file_watcher = None
+    
+    @classmethod
+    def get_trigram_index(cls) -> Optional[TrigramIndex]:
+        """Get the fuzzy name index, (re)building it in the background when the file index changed
+        
+        Returns None until the first build has finished.
+        """
+        index = cls.get_file_index()
+        if not index:
+            return None
+        
+        building = cls._trigram_builder is not None and cls._trigram_builder.is_alive()
+        if index.generation != cls._trigram_generation and not building:
+            cls._trigram_builder = threading.Thread(
+                target=cls._build_trigram_index, args=(index,), daemon=True
+            )
+            cls._trigram_builder.start()
+        return cls._trigram_index
+    
+    @classmethod
+    def _build_trigram_index(cls, index: FileIndex) -> None:
+        """Load every indexed path into a fresh trigram index and swap it in"""
+        generation = index.generation
+        trigram_index = TrigramIndex()
+        try:
+            trigram_index.add_many(index.iter_paths())
+        except sqlite3.Error as e:
+            print(f"Trigram index build failed: {e}")
+            return
+        cls._trigram_index = trigram_index
+        cls._trigram_generation = generation
+    
+    @classmethod
+    def _update_trigram_index(cls, event) -> None:
+        """Apply a file watcher event to the trigram index"""
+        trigram_index = cls._trigram_index
+        if trigram_index is None:
+            return
+        
+        if event.kind in (FileWatcher.DELETED, FileWatcher.RENAMED):
+            if event.is_dir:
+                trigram_index.remove_tree(event.path)
+            else:
+                trigram_index.remove(event.path)
+        
+        added = event.dest_path if event.kind == FileWatcher.RENAMED else event.path
+        if event.kind in (FileWatcher.CREATED, FileWatcher.RENAMED):
+            if event.is_dir:
+                # The file index listener runs first, so the new tree is already indexed
+                trigram_index.add_many(cls._file_index.paths_under(added))
+            else:
+                trigram_index.add(added)
+    
+    @classmethod
+    def collect_metrics(cls) -> List[MetricFamily]:
+        """Host and search metrics for the Prometheus exporter"""
+        families: List[MetricFamily] = []
+        
+        info = cls.get_system_info()
+        if info:
+            families.extend([
+                ("jp_host_cpu_percent", "gauge", "Host CPU usage percent",
+                 [({}, info['cpu'])]),
+                ("jp_host_memory_used_percent", "gauge", "Host memory usage percent",
+                 [({}, info['memory_used'])]),
+                ("jp_host_disk_used_percent", "gauge", "System disk usage percent",
+                 [({}, info['disk_percent'])]),
+                ("jp_host_disk_free_bytes", "gauge", "System disk free space",
+                 [({}, info['disk_free_bytes'])]),
+            ])
+        
+        stats = cls.get_cache_stats()
+        families.extend([
+            ("jp_search_cache_hits_total", "counter", "Search result cache hits",
+             [({}, stats['hits'])]),
+            ("jp_search_cache_misses_total", "counter", "Search result cache misses",
+             [({}, stats['misses'])]),
+            ("jp_search_cache_hit_ratio", "gauge", "Search result cache hit ratio",
+             [({}, stats['hit_rate'])]),
+            ("jp_search_cache_entries", "gauge", "Search results currently cached",
+             [({}, stats['entries'])]),
+        ])
+        
+        index = cls._file_index
+        if index:
+            families.append(("jp_file_index_files", "gauge", "Files in the persistent search index",
+                             [({}, index.file_count())]))
+        if cls._trigram_index is not None:
+            families.append(("jp_trigram_index_names", "gauge", "File names in the fuzzy name index",
+                             [({}, len(cls._trigram_index))]))
+        
+        return families
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, float]:
+        """Hit/miss counters of the search result cache"""
+        return cls._result_cache.stats()
+    
     @staticmethod
-    def get_system_info() -> Optional[Dict[str, float]]:
-        """Get comprehensive system information"""
+    def _cache_result(key: tuple, value: Any, roots: List[str],
+                      stream: Optional[SearchStream] = None) -> Any:
+        """Cache a formatted result unless the search behind it ran out of time"""
+        if stream is None or stream.stop_reason != SearchStream.DEADLINE:
+            SystemManager._result_cache.put(key, value, roots)
+        return value
+    
+    @staticmethod
+    def get_search_locations(system_wide: bool = True, include_system: bool = False) -> List[str]:
+        """Get the root directories searched by file commands"""
+        if not system_wide:
+            return [os.getcwd()]
+        
+        user_home = os.path.expanduser("~")
+        search_locations = [
+            os.path.join(user_home, "Documents"),
+            os.path.join(user_home, "Downloads"),
+            os.path.join(user_home, "Desktop"),
+            os.path.join(user_home, "Music"),
+            os.path.join(user_home, "Videos"),
+            os.path.join(user_home, "Pictures"),
+        ]
+        if include_system:
+            search_locations.extend([
+                "C:\\Users\\Public",
+                "C:\\Program Files",
+                "C:\\Program Files (x86)"
+            ])
+        search_locations.append(os.getcwd())
+        return search_locations
+    
+    @staticmethod
+    def _iter_matches(search_locations: List[str],
+                      index_query: Callable[[FileIndex, str, int], List[str]],
+                      matches: Callable[[str], bool],
+                      excluded_dirs: List[str],
+                      limit: int = None) -> Iterator[Optional[Tuple[str, str]]]:
+        """Yield (path, root) matches from the index, walking only roots that are not indexed yet
+        
+        Yields None after each walked directory so a SearchStream can check its deadline.
+        """
+        live_roots = []
+        index = SystemManager.get_file_index()
+        
         try:
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
+            for search_dir in search_locations:
+                if not os.path.exists(search_dir):
+                    continue
+                if index and index.is_indexed(search_dir):
+                    for path in index_query(index, search_dir, limit):
+                        yield path, search_dir
+                else:
+                    live_roots.append(search_dir)
             
-            # Get disk usage for Windows (C: drive)
-            disk = psutil.disk_usage('C:')
+            if live_roots:
+                # Walk every unindexed root at once on the shared thread pool
+                walk = ParallelWalker(excluded_dirs).walk(live_roots)
+                try:
+                    for entry in walk:
+                        for filename in entry.files:
+                            if matches(filename):
+                                yield os.path.join(entry.path, filename), entry.root
+                        yield None
+                finally:
+                    walk.close()
+        finally:
+            # Build or refresh the index in the background for the next query
+            if index:
+                index.ensure_fresh(search_locations)
+    
+    @staticmethod
+    def iter_files_by_extension(extension: str, directory: str = None, system_wide: bool = True,
+                                max_results: int = None, deadline: float = None) -> SearchStream:
+        """Stream files with a specific extension as they are found
+        
+        deadline is a time.monotonic() value; check stream.stop_reason afterwards
+        to tell a finished search from one that was cut off.
+        """
+        return SystemManager.iter_files_by_extensions(
+            [extension], directory, system_wide, max_results, deadline
+        )
+    
+    @staticmethod
+    def iter_files_by_extensions(extensions: Iterable[str], directory: str = None,
+                                 system_wide: bool = True, max_results: int = None,
+                                 deadline: float = None, include_system: bool = True) -> SearchStream:
+        """Stream files matching any of several extensions in a single traversal"""
+        if directory:
+            # Search specific directory
+            search_locations = [directory]
+        else:
+            search_locations = SystemManager.get_search_locations(system_wide, include_system)
+        
+        extension_set = frozenset(FileIndex.normalize_extension(ext) for ext in extensions)
+        source = SystemManager._iter_matches(
+            search_locations,
+            lambda index, root, limit: index.find_by_extensions(
+                root, extension_set, limit=limit,
+                excluded_dirs=config.EXTENSION_SEARCH_EXCLUDED_DIRS
+            ),
+            lambda name: os.path.splitext(name)[1].lower() in extension_set,
+            config.EXTENSION_SEARCH_EXCLUDED_DIRS,
+            max_results
+        )
+        return SearchStream(source, max_results=max_results, deadline=deadline)
+    
+    @staticmethod
+    def get_category_extensions(category: str) -> List[str]:
+        """Get the extensions belonging to a media category such as 'music'"""
+        return config.MEDIA_CATEGORIES.get(category.lower(), [])
+    
+    @staticmethod
+    def group_by_extension(files: Iterable[str]) -> Dict[str, List[str]]:
+        """Group file paths by lower-case extension, preserving discovery order"""
+        grouped: Dict[str, List[str]] = {}
+        for file_path in files:
+            grouped.setdefault(os.path.splitext(file_path)[1].lower(), []).append(file_path)
+        return grouped
+    
+    @staticmethod
+    def find_files_by_category(category: str, system_wide: bool = True) -> str:
+        """Find every file of a media category in one pass, grouped by extension"""
+        return SystemManager.collect_files_by_category(category, system_wide).text
+    
+    @staticmethod
+    def collect_files_by_category(category: str, system_wide: bool = True) -> FileSearchResult:
+        """Category search answer together with the files it found"""
+        extensions = SystemManager.get_category_extensions(category)
+        if not extensions:
+            available = ", ".join(config.MEDIA_CATEGORIES)
+            return FileSearchResult(f"I can search for these file categories: {available}", ())
+        
+        try:
+            roots = SystemManager.get_search_locations(system_wide, include_system=True)
+            key = ResultCache.make_key(category, extensions, "category", roots)
+            cached = SystemManager._result_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            stream = SystemManager.iter_files_by_extensions(
+                extensions,
+                system_wide=system_wide,
+                max_results=config.MAX_EXTENSION_SEARCH_RESULTS,
+                deadline=time.monotonic() + config.SEARCH_TIME_BUDGET
+            )
+            files = stream.collect()
+            grouped = SystemManager.group_by_extension(files)
+            result = FileSearchResult(
+                SystemManager.format_category_results(category, grouped, stream, system_wide), tuple(files),
+                stream.truncated
+            )
+            return SystemManager._cache_result(key, result, roots, stream)
             
-            return {
-                'cpu': cpu_percent,
-                'memory_used': memory.percent,
-                'memory_total': memory.total // (1024**3),  # GB
-                'memory_available': memory.available // (1024**3),  # GB
-                'disk_used': disk.used // (1024**3),  # GB
-                'disk_total': disk.total // (1024**3),  # GB
-                'disk_free': disk.free // (1024**3),  # GB
-                'disk_percent': (disk.used / disk.total) * 100
-            }
+        except Exception as e:
+            return FileSearchResult(f"Error searching for {category} files: {str(e)}", ())
+    
+    @staticmethod
+    def format_category_results(category: str, grouped: Dict[str, List[str]],
+                                stream: SearchStream, system_wide: bool = True) -> str:
+        """Summarize category search results with one line per extension"""
+        if not grouped:
+            search_desc = "entire system" if system_wide else "current directory"
+            return f"No {category} files found in {search_desc}"
+        
+        file_count = sum(len(files) for files in grouped.values())
+        result = [f"🔍 Found {file_count} {category} files across {len(stream.locations)} locations"]
+        
+        status = SystemManager._search_status(stream)
+        if status:
+            result.append(status)
+        
+        # Most common extension first
+        for extension, files in sorted(grouped.items(), key=lambda item: -len(item[1])):
+            sample_files = ", ".join(os.path.basename(path) for path in files[:3])
+            result.append(f"   📂 {extension.lstrip('.').upper()} ({len(files)}): {sample_files}")
+            if len(files) > 3:
+                result.append(f"      ... and {len(files) - 3} more")
+        
+        return "\n".join(result)
+    
+    @staticmethod
+    def iter_files_by_name(filename: str, system_wide: bool = True,
+                           max_results: int = None, deadline: float = None,
+                           directory: str = None) -> SearchStream:
+        """Stream files whose name contains a term as they are found"""
+        search_locations = [directory] if directory else SystemManager.get_search_locations(system_wide)
+        filename_lower = filename.lower()
+        source = SystemManager._iter_matches(
+            search_locations,
+            lambda index, root, limit: index.find_by_name(root, filename, limit=limit),
+            lambda name: filename_lower in name.lower(),
+            config.SEARCH_EXCLUDED_DIRS,
+            max_results
+        )
+        return SearchStream(source, max_results=max_results, deadline=deadline)
+    
+    @staticmethod
+    def _search_status(stream: SearchStream) -> Optional[str]:
+        """Describe why a search stopped early, if it did"""
+        if stream.stop_reason == SearchStream.DEADLINE:
+            return f"⏱️ Search stopped after {stream.elapsed:.1f}s, results may be incomplete"
+        if stream.stop_reason == SearchStream.MAX_RESULTS:
+            return f"📊 Showing first {len(stream.results)} results"
+        return None
+    
+    @classmethod
+    def get_metrics_sampler(cls) -> MetricsSampler:
+        """Get the shared background metrics sampler"""
+        if cls._metrics_sampler is None:
+            cls._metrics_sampler = MetricsSampler()
+            # Keep a recent process baseline so top-process queries never wait on one
+            cls._metrics_sampler.add_listener(lambda snapshot: cls._process_table.sample())
+        return cls._metrics_sampler
+    
+    @classmethod
+    def stop_metrics_sampler(cls) -> None:
+        """Stop background metrics sampling"""
+        if cls._metrics_sampler:
+            cls._metrics_sampler.stop()
+    
+    @staticmethod
+    def get_system_info() -> Optional[Dict[str, float]]:
+        """Get comprehensive system information from the latest background sample"""
+        try:
+            return SystemManager.get_metrics_sampler().snapshot()
         except Exception as e:
             print(f"{config.ERROR_MESSAGES['system_info_failed']}: {e}")
             return None
@@ -59,20 +432,57 @@ class SystemManager:
         
         return f"CPU usage is currently at {info['cpu']:.1f} percent"
     
+    @classmethod
+    def get_top_processes(cls, by: str = "cpu", limit: int = None) -> List[ProcessUsage]:
+        """Processes using the most CPU, memory or I/O right now"""
+        try:
+            return cls._process_table.top(by, limit, cls._process_table.refresh())
+        except Exception as e:
+            print(f"{config.ERROR_MESSAGES['system_info_failed']}: {e}")
+            return []
+    
+    @staticmethod
+    def get_top_processes_report(by: str = "cpu") -> str:
+        """Describe the processes using the most CPU or memory"""
+        processes = SystemManager.get_top_processes(by)
+        if not processes:
+            return config.ERROR_MESSAGES["system_info_failed"]
+        
+        if by == "memory":
+            result = ["🧠 Top memory users:"]
+            for i, process in enumerate(processes, 1):
+                result.append(f"   {i}. {process.name} (PID {process.pid}) - {format_size(process.rss)}")
+        else:
+            busy = [process for process in processes if process.cpu_percent >= 0.1]
+            if not busy:
+                return "No process is using noticeable CPU right now"
+            result = ["🔥 Top CPU users:"]
+            for i, process in enumerate(busy, 1):
+                result.append(f"   {i}. {process.name} (PID {process.pid}) - {process.cpu_percent:.1f}%")
+        
+        return "\n".join(result)
+    
     @staticmethod
     def list_files(directory: str = None) -> str:
         """List files in specified directory"""
         try:
             target_dir = directory or os.getcwd()
-            files = os.listdir(target_dir)[:config.MAX_FILES_TO_SHOW]
+            key = ResultCache.make_key("", scope="list", roots=[target_dir])
+            cached = SystemManager._result_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            entries = os.listdir(target_dir)
+            files = entries[:config.MAX_FILES_TO_SHOW]
             
             if not files:
                 return f"The directory {target_dir} appears to be empty."
             
             file_list = ", ".join(files)
-            more_text = "and more" if len(os.listdir(target_dir)) > config.MAX_FILES_TO_SHOW else ""
+            more_text = "and more" if len(entries) > config.MAX_FILES_TO_SHOW else ""
             
-            return f"In {target_dir}, I can see: {file_list} {more_text}".strip()
+            result = f"In {target_dir}, I can see: {file_list} {more_text}".strip()
+            return SystemManager._cache_result(key, result, [target_dir])
             
         except Exception as e:
             print(f"{config.ERROR_MESSAGES['file_access_failed']}: {e}")
@@ -81,198 +491,309 @@ class SystemManager:
     @staticmethod
     def find_files_by_extension(extension: str, directory: str = None, system_wide: bool = True) -> str:
         """Find files with specific extension across system or specific directory"""
+        return SystemManager.collect_files_by_extension(extension, directory, system_wide).text
+    
+    @staticmethod
+    def collect_files_by_extension(extension: str, directory: str = None,
+                                   system_wide: bool = True) -> FileSearchResult:
+        """Extension search answer together with the files it found"""
         try:
-            files = []
-            search_locations = []
-            
             if directory:
-                # Search specific directory
-                search_locations = [directory]
-            elif system_wide:
-                # Search common user directories and system locations
-                user_home = os.path.expanduser("~")
-                search_locations = [
-                    os.path.join(user_home, "Documents"),
-                    os.path.join(user_home, "Downloads"), 
-                    os.path.join(user_home, "Music"),
-                    os.path.join(user_home, "Videos"),
-                    os.path.join(user_home, "Pictures"),
-                    os.path.join(user_home, "Desktop"),
-                    "C:\\Users\\Public",
-                    "C:\\Program Files",
-                    "C:\\Program Files (x86)"
-                ]
-                # Add current directory
-                search_locations.append(os.getcwd())
+                roots = [directory]
             else:
-                # Just current directory
-                search_locations = [os.getcwd()]
+                roots = SystemManager.get_search_locations(system_wide, include_system=True)
+            key = ResultCache.make_key("", [extension], "extension", roots)
+            cached = SystemManager._result_cache.get(key)
+            if cached is not None:
+                return cached
             
-            total_searched = 0
-            locations_found = []
+            stream = SystemManager.iter_files_by_extension(
+                extension, directory, system_wide,
+                max_results=config.MAX_EXTENSION_SEARCH_RESULTS,
+                deadline=time.monotonic() + config.SEARCH_TIME_BUDGET
+            )
+            files = stream.collect()
+            result = FileSearchResult(
+                SystemManager.format_extension_results(extension, files, stream, system_wide), tuple(files),
+                stream.truncated
+            )
+            return SystemManager._cache_result(key, result, roots, stream)
             
-            for search_dir in search_locations:
-                if not os.path.exists(search_dir):
-                    continue
-                    
-                try:
-                    # Walk through directory and subdirectories with limits
-                    for root, dirs, filenames in os.walk(search_dir):
-                        # Skip system directories that might cause issues
-                        dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                                 d not in ['System32', 'Windows', 'Program Files', '__pycache__']]
-                        
-                        for filename in filenames:
-                            if filename.lower().endswith(extension.lower()):
-                                full_path = os.path.join(root, filename)
-                                files.append(full_path)
-                                if search_dir not in locations_found:
-                                    locations_found.append(os.path.basename(search_dir))
-                                
-                                # Limit to prevent overwhelming results
-                                if len(files) >= 50:  # Increased limit for system-wide search
-                                    break
-                        
-                        total_searched += 1
-                        # Prevent searching too deep
-                        if total_searched > 1000:
-                            break
-                            
-                        if len(files) >= 50:
-                            break
-                    
-                    if len(files) >= 50:
-                        break
-                        
-                except (PermissionError, OSError):
-                    # Skip directories we can't access
-                    continue
+        except Exception as e:
+            return FileSearchResult(f"Error searching for {extension} files: {str(e)}", ())
+    
+    @staticmethod
+    def format_extension_results(extension: str, files: List[str], stream: SearchStream,
+                                 system_wide: bool = True) -> str:
+        """Summarize extension search results grouped by folder"""
+        if not files:
+            search_desc = "entire system" if system_wide else "current directory"
+            if stream.stop_reason == SearchStream.DEADLINE:
+                return f"No {extension} files found in {search_desc} within {stream.elapsed:.1f}s"
+            return f"No {extension} files found in {search_desc}"
+        
+        file_count = len(files)
+        
+        # Group files by directory for better organization
+        file_locations = {}
+        for file_path in files[:20]:  # Show details for first 20
+            dir_name = os.path.dirname(file_path)
+            base_dir = os.path.basename(dir_name) if dir_name else "Root"
+            if base_dir not in file_locations:
+                file_locations[base_dir] = []
+            file_locations[base_dir].append(os.path.basename(file_path))
+        
+        result = [f"🔍 Found {file_count} {extension} files across {len(stream.locations)} locations"]
+        
+        status = SystemManager._search_status(stream)
+        if status:
+            result.append(status)
+        
+        result.append("📁 File locations:")
+        for location, files_in_loc in list(file_locations.items())[:5]:  # Show top 5 locations
+            sample_files = files_in_loc[:3]  # Show 3 files per location
+            result.append(f"   📂 {location}: {', '.join(sample_files)}")
+            if len(files_in_loc) > 3:
+                result.append(f"      ... and {len(files_in_loc) - 3} more")
+        
+        if len(file_locations) > 5:
+            result.append(f"   📂 ... and {len(file_locations) - 5} more locations")
             
-            if not files:
-                search_desc = "entire system" if system_wide else "current directory"
-                return f"No {extension} files found in {search_desc}"
+        return "\n".join(result)
+    
+    @staticmethod
+    def fuzzy_search_files(query: str, system_wide: bool = True,
+                           limit: int = None) -> Optional[List[Tuple[float, str]]]:
+        """Rank indexed file names by similarity to a query
+        
+        Tolerates separators, word order and small typos ("vacation photo" finds
+        "vacation_photos_2023.jpg"). Returns (score, path) pairs, or None while the
+        fuzzy index is still being built.
+        """
+        trigram_index = SystemManager.get_trigram_index()
+        if trigram_index is None:
+            return None
+        
+        roots = [os.path.abspath(root) for root in SystemManager.get_search_locations(system_wide)]
+        return trigram_index.search(query, limit=limit or config.MAX_NAME_SEARCH_RESULTS, roots=roots)
+    
+    @staticmethod
+    def format_fuzzy_results(query: str, matches: List[Tuple[float, str]]) -> str:
+        """Summarize fuzzy search results with their similarity scores"""
+        if not matches:
+            return f"No files found matching '{query}'"
+        
+        result = [f"🔍 Found {len(matches)} files matching '{query}'"]
+        for i, (score, file_path) in enumerate(matches[:10], 1):
+            dir_name = os.path.basename(os.path.dirname(file_path))
+            file_name = os.path.basename(file_path)
+            result.append(f"   {i}. {file_name} (in {dir_name}, {score:.0%} match)")
+        
+        if len(matches) > 10:
+            result.append(f"   ... and {len(matches) - 10} more files")
+        
+        return "\n".join(result)
+    
+    @staticmethod
+    def search_files_by_name(filename: str, system_wide: bool = True) -> str:
+        """Search for files by name across system"""
+        return SystemManager.collect_files_by_name(filename, system_wide).text
+    
+    @staticmethod
+    def collect_files_by_name(filename: str, system_wide: bool = True,
+                              directory: str = None) -> FileSearchResult:
+        """Name search answer together with the files it found
+        
+        With a directory only that folder is searched, by exact name match.
+        """
+        try:
+            roots = [directory] if directory else SystemManager.get_search_locations(system_wide)
+            key = ResultCache.make_key(filename, scope="name", roots=roots)
+            cached = SystemManager._result_cache.get(key)
+            if cached is not None:
+                return cached
             
-            file_count = len(files)
+            matches = None if directory else SystemManager.fuzzy_search_files(filename, system_wide)
+            if matches:
+                result = FileSearchResult(SystemManager.format_fuzzy_results(filename, matches),
+                                          tuple(path for _, path in matches),
+                                          len(matches) >= config.MAX_NAME_SEARCH_RESULTS)
+                return SystemManager._cache_result(key, result, roots)
             
-            # Group files by directory for better organization
-            file_locations = {}
-            for file_path in files[:20]:  # Show details for first 20
-                dir_name = os.path.dirname(file_path)
-                base_dir = os.path.basename(dir_name) if dir_name else "Root"
-                if base_dir not in file_locations:
-                    file_locations[base_dir] = []
-                file_locations[base_dir].append(os.path.basename(file_path))
+            stream = SystemManager.iter_files_by_name(
+                filename, system_wide,
+                max_results=config.MAX_NAME_SEARCH_RESULTS,
+                deadline=time.monotonic() + config.SEARCH_TIME_BUDGET,
+                directory=directory
+            )
+            files = stream.collect()
+            result = FileSearchResult(SystemManager.format_name_results(filename, files, stream), tuple(files),
+                                      stream.truncated)
+            return SystemManager._cache_result(key, result, roots, stream)
             
-            result = [f"🔍 Found {file_count} {extension} files across {len(locations_found)} locations"]
+        except Exception as e:
+            return FileSearchResult(f"Error searching for files: {str(e)}", ())
+    
+    @staticmethod
+    def format_name_results(filename: str, files: List[str], stream: SearchStream) -> str:
+        """Summarize name search results as a numbered list"""
+        if not files:
+            if stream.stop_reason == SearchStream.DEADLINE:
+                return f"No files found containing '{filename}' within {stream.elapsed:.1f}s"
+            return f"No files found containing '{filename}'"
+        
+        file_count = len(files)
+        result = [f"🔍 Found {file_count} files containing '{filename}'"]
+        
+        status = SystemManager._search_status(stream)
+        if status:
+            result.append(status)
+        
+        # Show organized results
+        for i, file_path in enumerate(files[:10], 1):
+            dir_name = os.path.basename(os.path.dirname(file_path))
+            file_name = os.path.basename(file_path)
+            result.append(f"   {i}. {file_name} (in {dir_name})")
+        
+        if file_count > 10:
+            result.append(f"   ... and {file_count - 10} more files")
+            
+        return "\n".join(result)
+    
+    @classmethod
+    def stop_content_search(cls) -> None:
+        """Shut down the content search worker processes"""
+        if cls._content_searcher:
+            cls._content_searcher.shutdown()
+            cls._content_searcher = None
+    
+    @classmethod
+    def iter_file_contents(cls, query: str, system_wide: bool = True,
+                           deadline: float = None) -> Iterator[ContentMatch]:
+        """Stream lines of text-like files in the user folders that mention a phrase"""
+        if cls._content_searcher is None:
+            cls._content_searcher = ContentSearcher()
+        
+        paths = cls.iter_files_by_extensions(
+            config.TEXT_FILE_EXTENSIONS,
+            system_wide=system_wide,
+            deadline=deadline,
+            include_system=False
+        )
+        return cls._content_searcher.search(query, paths, deadline=deadline)
+    
+    @staticmethod
+    def search_file_contents(query: str, system_wide: bool = True) -> str:
+        """Find files whose text mentions a phrase, with the matching lines"""
+        if not query.strip():
+            return "What text should I look for inside your files?"
+        
+        try:
+            deadline = time.monotonic() + config.CONTENT_SEARCH_TIME_BUDGET
+            matches: Dict[str, List[ContentMatch]] = {}
+            search = SystemManager.iter_file_contents(query, system_wide, deadline)
+            try:
+                for match in search:
+                    matches.setdefault(match.path, []).append(match)
+                    if len(matches) >= config.MAX_CONTENT_SEARCH_RESULTS:
+                        break
+            finally:
+                search.close()
+            timed_out = time.monotonic() >= deadline
             
-            if file_count > 50:
-                result.append(f"📊 Showing first 50 results (found {file_count} total)")
+            if not matches:
+                suffix = f" within {config.CONTENT_SEARCH_TIME_BUDGET:.0f}s" if timed_out else ""
+                return f"No files found mentioning '{query}'{suffix}"
             
-            result.append("📁 File locations:")
-            for location, files_in_loc in list(file_locations.items())[:5]:  # Show top 5 locations
-                sample_files = files_in_loc[:3]  # Show 3 files per location
-                result.append(f"   📂 {location}: {', '.join(sample_files)}")
-                if len(files_in_loc) > 3:
-                    result.append(f"      ... and {len(files_in_loc) - 3} more")
+            result = [f"🔍 Found {len(matches)} files mentioning '{query}'"]
+            if timed_out:
+                result.append("⏱️ Search ran out of time, results may be incomplete")
+            for i, (file_path, file_matches) in enumerate(list(matches.items())[:10], 1):
+                first = file_matches[0]
+                result.append(f"   {i}. {os.path.basename(file_path)} (line {first.line_number}): {first.snippet}")
+            
+            if len(matches) > 10:
+                result.append(f"   ... and {len(matches) - 10} more files")
             
-            if len(file_locations) > 5:
-                result.append(f"   📂 ... and {len(file_locations) - 5} more locations")
-                
             return "\n".join(result)
             
         except Exception as e:
-            return f"Error searching for {extension} files: {str(e)}"
+            return f"Error searching file contents: {str(e)}"
+    
+    @classmethod
+    def get_disk_usage_report(cls, root: str = None, time_budget: float = None) -> UsageReport:
+        """Size the directories under root (the home folder by default)"""
+        root = root or os.path.expanduser("~")
+        budget = config.DISK_USAGE_TIME_BUDGET if time_budget is None else time_budget
+        return cls._disk_usage.analyze(root, deadline=time.monotonic() + budget)
+    
+    @classmethod
+    def get_last_disk_usage_report(cls) -> Optional[UsageReport]:
+        """The most recent disk usage report, without scanning again"""
+        return cls._disk_usage.last_report
     
     @staticmethod
-    def search_files_by_name(filename: str, system_wide: bool = True) -> str:
-        """Search for files by name across system"""
+    def analyze_disk_usage(root: str = None) -> str:
+        """Report which folders and files take up the most space"""
         try:
-            files = []
-            search_locations = []
-            
-            if system_wide:
-                # Search common user directories
-                user_home = os.path.expanduser("~")
-                search_locations = [
-                    os.path.join(user_home, "Documents"),
-                    os.path.join(user_home, "Downloads"), 
-                    os.path.join(user_home, "Desktop"),
-                    os.path.join(user_home, "Music"),
-                    os.path.join(user_home, "Videos"),
-                    os.path.join(user_home, "Pictures"),
-                    os.getcwd()
-                ]
-            else:
-                search_locations = [os.getcwd()]
+            report = SystemManager.get_disk_usage_report(root)
             
-            for search_dir in search_locations:
-                if not os.path.exists(search_dir):
-                    continue
-                    
-                try:
-                    for root, dirs, filenames in os.walk(search_dir):
-                        # Skip system directories
-                        dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                                 d not in ['System32', 'Windows', '__pycache__']]
-                        
-                        for file in filenames:
-                            if filename.lower() in file.lower():
-                                full_path = os.path.join(root, file)
-                                files.append(full_path)
-                                
-                                if len(files) >= 30:
-                                    break
-                        
-                        if len(files) >= 30:
-                            break
-                            
-                except (PermissionError, OSError):
-                    continue
-                
-                if len(files) >= 30:
-                    break
+            if not report.total_bytes:
+                return f"Couldn't measure disk usage under {report.root}"
             
-            if not files:
-                return f"No files found containing '{filename}'"
+            result = [f"📦 {format_size(report.total_bytes)} used under {report.root}"]
+            if not report.complete:
+                result.append("⏱️ Scan ran out of time, ask again to continue where it stopped")
             
-            file_count = len(files)
-            result = [f"🔍 Found {file_count} files containing '{filename}'"]
+            if report.largest_dirs:
+                result.append("📁 Largest folders:")
+                for size, path in report.largest_dirs[:5]:
+                    result.append(f"   • {os.path.relpath(path, report.root)} - {format_size(size)}")
             
-            # Show organized results
-            for i, file_path in enumerate(files[:10], 1):
-                dir_name = os.path.basename(os.path.dirname(file_path))
-                file_name = os.path.basename(file_path)
-                result.append(f"   {i}. {file_name} (in {dir_name})")
+            if report.largest_files:
+                result.append("📄 Largest files:")
+                for size, path in report.largest_files[:5]:
+                    result.append(f"   • {os.path.basename(path)} - {format_size(size)}")
             
-            if file_count > 10:
-                result.append(f"   ... and {file_count - 10} more files")
-                
             return "\n".join(result)
             
         except Exception as e:
-            return f"Error searching for files: {str(e)}"
+            return f"Error analyzing disk usage: {str(e)}"
+    
+    @classmethod
+    def plan_cleanup(cls) -> List[TargetPlan]:
+        """Dry run: old temp and cache files that could be deleted, per location"""
+        return cls._reclaimer.scan()
+    
+    @classmethod
+    def run_cleanup(cls, plans: List[TargetPlan]) -> ReclaimResult:
+        """Delete the files of a cleanup plan"""
+        result = cls._reclaimer.execute(plans)
+        for plan in plans:
+            cls._result_cache.invalidate_path(plan.target.path)
+        return result
+    
+    @classmethod
+    def get_partition_usage(cls, timeout: float = None) -> List[MountUsage]:
+        """Usage of every mounted partition; stuck mounts come back unavailable"""
+        return cls._partitions.usage(timeout)
     
     @staticmethod
     def get_drive_usage() -> str:
         """Get usage information for all available drives"""
         try:
-            import string
             drives_info = []
             
-            # Check all possible drive letters
-            for letter in string.ascii_uppercase:
-                drive_path = f"{letter}:\\"
-                if os.path.exists(drive_path):
-                    try:
-                        drive_usage = psutil.disk_usage(drive_path)
-                        total_gb = drive_usage.total // (1024**3)
-                        used_gb = drive_usage.used // (1024**3)
-                        free_gb = drive_usage.free // (1024**3)
-                        used_percent = (drive_usage.used / drive_usage.total) * 100
-                        
-                        drives_info.append(f"💿 Drive {letter}: {used_gb}GB/{total_gb}GB ({used_percent:.1f}% used, {free_gb}GB free)")
-                    except:
-                        drives_info.append(f"💿 Drive {letter}: Unable to access")
+            for mount in SystemManager.get_partition_usage():
+                if not mount.available:
+                    drives_info.append(f"💿 {mount.mountpoint}: Unable to access")
+                    continue
+                
+                total_gb = mount.total // (1024**3)
+                used_gb = mount.used // (1024**3)
+                free_gb = mount.free // (1024**3)
+                drives_info.append(f"💿 {mount.mountpoint} ({mount.fstype}): {used_gb}GB/{total_gb}GB "
+                                   f"({mount.percent:.1f}% used, {free_gb}GB free)")
             
             if not drives_info:
                 return "No drives found"
@@ -295,10 +816,25 @@ class ProgramLauncher:
         'control': ['control.exe'],  # Control Panel
     }
     
+    _program_index: Optional[PhoneticIndex] = None
+    
+    @staticmethod
+    def find_program(text: str) -> Optional[str]:
+        """Program named in the text, also when misheard ("open calculate her")"""
+        words = set(tokenize(text))
+        for program in ProgramLauncher.PROGRAMS:
+            if program in words:
+                return program
+        
+        if ProgramLauncher._program_index is None:
+            ProgramLauncher._program_index = PhoneticIndex.from_phrases(ProgramLauncher.PROGRAMS)
+        match = ProgramLauncher._program_index.best(text)
+        return match.value if match else None
+    
     @staticmethod
     def launch_program(program_name: str) -> str:
         """Launch a system program"""
-        program_name = program_name.lower()
+        program_name = ProgramLauncher.find_program(program_name) or program_name.lower()
         
         if program_name in ProgramLauncher.PROGRAMS:
             try:
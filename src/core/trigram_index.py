@@ -0,0 +1,177 @@
+"""
+Trigram Index Module - Ranked fuzzy matching over file names
+"""
+
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from . import config
+
+# Separators and case changes that split a file name into tokens:
+# "vacation_photos-2023.JPG" -> ["vacation", "photos", "2023", "jpg"]
+_TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+_CAMEL_PATTERN = re.compile(r"([a-z])([A-Z])")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a name or query into lower-case word and number tokens"""
+    return _TOKEN_PATTERN.findall(_CAMEL_PATTERN.sub(r"\1 \2", text).lower())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded per-token trigrams, so separators and word order do not matter"""
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class TrigramIndex:
+    """In-memory inverted index from trigrams to file ids
+
+    Posting lists are compact arrays of ids. A search counts how many
+    query trigrams each file shares with one NumPy bincount over the
+    query's postings, then scores only the files sharing enough trigrams
+    to reach the minimum score. Its cost follows the postings' size and
+    not the number of weak candidates, so queries with no good match are
+    as fast as those with one.
+    """
+
+    def __init__(self):
+        self._paths: List[Optional[str]] = []
+        self._gram_counts = array('H')
+        self._postings: Dict[str, array] = {}
+        self._ids: Dict[str, int] = {}
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, path: str) -> None:
+        """Index a file's base name"""
+        with self._lock:
+            if path in self._ids:
+                return
+            grams = trigrams(os.path.basename(path))
+            doc_id = len(self._paths)
+            self._paths.append(path)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            self._ids[path] = doc_id
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    postings = self._postings[gram] = array('I')
+                # Ids only grow, so appending keeps every list sorted
+                postings.append(doc_id)
+
+    def add_many(self, paths: Iterable[str]) -> None:
+        """Index several files"""
+        for path in paths:
+            self.add(path)
+
+    def remove(self, path: str) -> None:
+        """Forget a file; its postings are dropped on the next compaction"""
+        with self._lock:
+            doc_id = self._ids.pop(path, None)
+            if doc_id is None:
+                return
+            self._paths[doc_id] = None
+            self._dead += 1
+            if self._dead > config.TRIGRAM_COMPACT_RATIO * max(len(self._paths), 1):
+                self._compact()
+
+    def remove_tree(self, dir_path: str) -> None:
+        """Forget every file below a directory"""
+        prefix = dir_path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for path in [p for p in self._ids if p.startswith(prefix)]:
+                self.remove(path)
+
+    def _compact(self) -> None:
+        """Rebuild the postings without deleted files"""
+        live = [path for path in self._paths if path is not None]
+        self._paths = []
+        self._gram_counts = array('H')
+        self._postings = {}
+        self._ids = {}
+        self._dead = 0
+        self.add_many(live)
+
+    @staticmethod
+    def _best_score(shared: int, total: int) -> float:
+        """Highest score a name sharing this many of the query's trigrams can get
+
+        Such a name has at least ``shared`` trigrams itself, so its Dice
+        term is at most 2s / (t + s).
+        """
+        containment = min(shared, total) / total
+        return 0.7 * containment + 0.3 * (2 * containment / (1 + containment))
+
+    @classmethod
+    def _min_shared(cls, total: int, min_score: float) -> int:
+        """Fewest shared trigrams that could still reach min_score"""
+        for shared in range(1, total + 1):
+            if cls._best_score(shared, total) >= min_score:
+                return shared
+        return total
+
+    def search(self, query: str, limit: int = 10, min_score: float = None,
+               roots: Iterable[str] = None) -> List[Tuple[float, str]]:
+        """Rank file names by similarity to a query; returns (score, path) pairs
+
+        The score blends containment (how much of the query appears in the
+        name) with Dice similarity (how much of the name the query covers),
+        so "vacation photo" ranks "vacation_photos_2023.jpg" near the top
+        without requiring an exact substring.
+        """
+        min_score = config.TRIGRAM_MIN_SCORE if min_score is None else min_score
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        prefixes = None
+        if roots is not None:
+            prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+
+        # Imported here so NumPy only loads once a fuzzy search runs
+        import numpy as np
+
+        with self._lock:
+            postings = [self._postings.get(gram) for gram in query_grams]
+            total = len(postings)
+            needed = self._min_shared(total, min_score)
+            postings = [p for p in postings if p]
+            if len(postings) < needed:
+                return []
+
+            # Shared trigram counts for every candidate in one pass, so the cost
+            # tracks the posting volume rather than a Python loop per candidate.
+            # The frombuffer views are temporaries: an array exporting its buffer
+            # can't grow, and add() appends to these lists.
+            ids = np.concatenate([np.frombuffer(p, dtype=np.uintc) for p in postings])
+            shared = np.bincount(ids, minlength=len(self._paths))
+            candidates = np.flatnonzero(shared >= needed)
+            if not len(candidates):
+                return []
+
+            shared = shared[candidates]
+            gram_counts = np.frombuffer(self._gram_counts, dtype=np.ushort)[candidates]
+            scores = 0.7 * shared / total + 0.3 * 2 * shared / (total + gram_counts)
+
+            # Best first; deleted files and other roots are skipped on the way
+            top: List[Tuple[float, str]] = []
+            for position in np.argsort(-scores, kind="stable"):
+                score = float(scores[position])
+                if score < min_score or len(top) >= limit:
+                    break
+                path = self._paths[candidates[position]]
+                if path is None or (prefixes and not path.startswith(prefixes)):
+                    continue
+                top.append((score, path))
+
+        return sorted(top, reverse=True)
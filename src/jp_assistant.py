@@ -3,6 +3,7 @@ JP Assistant - Enhanced Voice-Activated AI Assistant
 Main application module
 """
 
+import argparse
 import os
 import sys
 import threading
@@ -10,22 +11,39 @@ import time
 from typing import Optional
 from core import config
 from core.jp_config import *
-from core.speech_engine import SpeechEngine
 from core.command_processor import CommandProcessor
+from core.command_registry import ENHANCED, STANDARD, registry
 from core.jp_brain import JPBrain, SmartMonitoring
+from core.metrics_exporter import MetricsExporter, assistant_metrics
+from core.phonetic_index import PhoneticIndex
+from voice_pipeline import run_pipeline
 
 class JPAssistant:
     """Enhanced JP Voice Assistant"""
     
-    def __init__(self):
-        """Initialize the enhanced assistant"""
-        self.speech_engine: Optional[SpeechEngine] = None
+    def __init__(self, headless: bool = False):
+        """Initialize the enhanced assistant
+        
+        headless skips speech I/O, smart monitoring, the file watcher and
+        background metrics sampling, for driving process_jp_command from a
+        script or on hosts without audio.
+        """
+        self.headless = headless
+        self.speech_engine: Optional["SpeechEngine"] = None
         self.command_processor: Optional[CommandProcessor] = None
         self.jp_brain: Optional[JPBrain] = None
         self.monitoring: Optional[SmartMonitoring] = None
+        self.metrics_exporter: Optional[MetricsExporter] = None
+        # Intent of the command that answered the last process_jp_command call, None if none matched
+        self.last_intent: Optional[str] = None
         self.running = False
         self.awake = True  # Start awake
         self.always_listening = ALWAYS_LISTENING
+        # Sound-alike lookups for wake and sleep words the recognizer mangles
+        self.wake_index = PhoneticIndex.from_phrases(
+            WAKE_WORDS + ATTENTION_WORDS, max_spelling_ratio=config.PHONETIC_MAX_WAKE_SPELLING_RATIO)
+        self.sleep_index = PhoneticIndex.from_phrases(
+            SLEEP_WORDS, max_spelling_ratio=config.PHONETIC_MAX_WAKE_SPELLING_RATIO)
         
         # Initialize components
         self.initialize()
@@ -37,12 +55,15 @@ class JPAssistant:
         
         try:
             # Initialize speech engine
-            print("🎤 Loading speech systems...")
-            self.speech_engine = SpeechEngine()
-            if not self.speech_engine.is_ready():
-                print("❌ Speech engine initialization failed")
-                return False
-            print("✅ Speech systems online")
+            if not self.headless:
+                print("🎤 Loading speech systems...")
+                # Imported here so headless runs work without audio libraries
+                from core.speech_engine import SpeechEngine
+                self.speech_engine = SpeechEngine()
+                if not self.speech_engine.is_ready():
+                    print("❌ Speech engine initialization failed")
+                    return False
+                print("✅ Speech systems online")
             
             # Initialize command processor
             print("🧠 Loading command processor...")
@@ -54,8 +75,38 @@ class JPAssistant:
             self.jp_brain = JPBrain()
             print("✅ JP brain online")
             
+            # Load (or train) the fallback intent model in the background, so neither startup
+            # nor the first unmatched command waits on NumPy and training
+            if not self.headless:
+                threading.Thread(target=self._load_intent_classifier, name="jp-intent-model",
+                                 daemon=True).start()
+            
+            # Keep file search results fresh without rescans
+            if config.FILE_WATCHER_ENABLED and not self.headless:
+                watcher = self.jp_brain.system_manager.start_file_watcher()
+                if watcher:
+                    print(f"✅ File watcher active ({watcher.backend})")
+            
+            # Sample system metrics in the background so status queries never block
+            if not self.headless:
+                self.jp_brain.system_manager.get_metrics_sampler().start()
+            
+            # Publish metrics for Prometheus scraping
+            if config.METRICS_EXPORT_ENABLED or config.METRICS_TEXTFILE_PATH:
+                assistant_metrics.add_collector(self.jp_brain.system_manager.collect_metrics)
+                self.metrics_exporter = MetricsExporter()
+                if config.METRICS_EXPORT_ENABLED:
+                    try:
+                        address, port = self.metrics_exporter.start_http()
+                        print(f"✅ Metrics available at http://{address}:{port}/metrics")
+                    except OSError as e:
+                        print(f"⚠️ Metrics endpoint unavailable: {e}")
+                if config.METRICS_TEXTFILE_PATH:
+                    self.metrics_exporter.start_textfile()
+                    print(f"✅ Writing metrics to {config.METRICS_TEXTFILE_PATH}")
+            
             # Initialize smart monitoring
-            if ADVANCED_FEATURES["proactive_assistance"]:
+            if ADVANCED_FEATURES["proactive_assistance"] and not self.headless:
                 print("👁️ Activating smart monitoring...")
                 self.monitoring = SmartMonitoring(self.jp_brain)
                 print("✅ Smart monitoring active")
@@ -68,6 +119,14 @@ class JPAssistant:
             print(f"❌ Initialization failed: {e}")
             return False
     
+    @staticmethod
+    def _load_intent_classifier() -> None:
+        from core.intent_classifier import get_intent_classifier
+        try:
+            get_intent_classifier()
+        except Exception as e:
+            print(f"⚠️ Intent model unavailable: {e}")
+    
     def display_welcome(self) -> None:
         """Display enhanced welcome interface"""
         print("\n" + "═"*65)
@@ -116,6 +175,12 @@ class JPAssistant:
             if attention_word in text:
                 print(f"✅ Attention word detected: '{attention_word}' in '{text}'")
                 return True
+        
+        # Then by sound, for "j p", "jay pee" and similar mishearings
+        match = self.wake_index.best(text)
+        if match:
+            print(f"✅ JP attention detected: '{match.phrase}' heard in '{text}'")
+            return True
             
         return False
     
@@ -128,18 +193,31 @@ class JPAssistant:
                 print(f"✅ Sleep word detected: '{sleep_word}' in '{text}'")
                 return True
         
+        match = self.sleep_index.best(text)
+        if match:
+            print(f"✅ Sleep word detected: '{match.phrase}' heard in '{text}'")
+            return True
+        
         return False
     
     def process_jp_command(self, command: str) -> str:
         """Process command with JP intelligence"""
-        # First try JP brain for enhanced commands
-        jp_response = self.jp_brain.process_enhanced_command(command)
-        
-        if jp_response:
-            return jp_response
-        
-        # Fall back to standard command processing
-        standard_response = self.command_processor.process_command(command)
+        self.last_intent = None
+        with assistant_metrics.command("unrecognized"):
+            # One routing pass serves both the JP brain and the standard processor
+            matches = registry.matches(command)
+            
+            # First try JP brain for enhanced commands
+            jp_response = self.jp_brain.process_enhanced_command(command, matches)
+            
+            if jp_response:
+                self.last_intent = registry.best(ENHANCED, matches).intent
+                return jp_response
+            
+            # Fall back to standard command processing
+            standard_response = self.command_processor.process_command(command, matches)
+            match = registry.best(STANDARD, matches)
+            self.last_intent = match.intent if match else None
         
         # Enhance with JP personality
         return self.jp_brain.personality.personalize_response(
@@ -160,80 +238,14 @@ class JPAssistant:
         if self.monitoring and ADVANCED_FEATURES["proactive_assistance"]:
             self.monitoring.start_monitoring()
         
-        # Enhanced greeting
-        greeting = self.jp_brain.personality.personalize_response("greeting")
-        self.speech_engine.speak(greeting)
-        
         self.running = True
         
-        # Main interaction loop
-        while self.running:
-            try:
-                if not self.awake:
-                    # Wake word detection mode
-                    user_input = input("\n💤 Say 'Hey JP' to wake up (or press ENTER/type 'quit'): ").strip()
-                    
-                    # Handle manual input
-                    if user_input.lower() == 'quit':
-                        self.shutdown()
-                        break
-                    elif user_input.lower() == 'help':
-                        print(config.HELP_TEXT)
-                        continue
-                    elif user_input:  # Manual command
-                        response = self.command_processor.process_command(user_input)
-                        self.speech_engine.speak(response)
-                        continue
-                    
-                    # Listen for JP attention
-                    wake_input = self.speech_engine.listen(wake_word_mode=True)
-                    if wake_input:
-                        if self.check_jp_attention(wake_input):
-                            self.awake = True
-                            acknowledgment = self.jp_brain.personality.personalize_response(
-                                "acknowledgment", "Yes, I'm here! How can I help?"
-                            )
-                            self.speech_engine.speak(acknowledgment)
-                            continue
-                        else:
-                            # Continue listening for attention
-                            continue
-                    
-                else:
-                    # Active listening mode
-                    print("\n🎤 I'm awake! Say something (or 'Bye JP' to sleep)")
-                    command = self.speech_engine.listen()
-                    
-                    if command:
-                        # Check for sleep command
-                        if self.check_sleep_word(command):
-                            self.awake = False
-                            sleep_msg = self.jp_brain.personality.personalize_response("standby")
-                            self.speech_engine.speak(sleep_msg)
-                            continue
-                        
-                        # Check for exit commands
-                        if any(word in command for word in ["goodbye", "bye", "exit", "quit"]):
-                            goodbye = self.jp_brain.personality.personalize_response(
-                                "standby", "Goodbye! Thanks for using JP Assistant. Have a great day!"
-                            )
-                            self.speech_engine.speak(goodbye)
-                            self.shutdown()
-                            break
-                        
-                        # Process with enhanced intelligence
-                        response = self.process_jp_command(command)
-                        self.speech_engine.speak(response)
-                    else:
-                        self.speech_engine.speak("I didn't hear anything clearly. Try again or say 'Bye JP' to sleep.")
-                
-            except KeyboardInterrupt:
-                print("\n\n👋 Interrupted by user")
-                self.shutdown()
-                break
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
-                self.speech_engine.speak("I encountered an error. Please try again.")
+        # Listening, recognition, commands and speech run as overlapping stages
+        try:
+            run_pipeline(self)
+        except KeyboardInterrupt:
+            print("\n\n👋 Interrupted by user")
+        self.shutdown()
     
     def shutdown(self) -> None:
         """Gracefully shutdown the enhanced assistant"""
@@ -245,6 +257,16 @@ class JPAssistant:
         if self.monitoring:
             self.monitoring.stop_monitoring()
         
+        # Stop watching the file system (nothing to stop if no command ever needed it)
+        if self.jp_brain and self.jp_brain.has_system_manager:
+            self.jp_brain.system_manager.stop_file_watcher()
+            self.jp_brain.system_manager.stop_content_search()
+            self.jp_brain.system_manager.stop_metrics_sampler()
+        
+        # Stop publishing metrics
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+        
         # Save learning data
         if self.jp_brain:
             self.jp_brain.file_manager.save_json(
@@ -256,6 +278,27 @@ class JPAssistant:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description=f"{ASSISTANT_NAME} voice assistant")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="process commands from a text/JSONL file ('-' for stdin) without speech")
+    parser.add_argument("--output", metavar="FILE", default="-",
+                        help="where --batch writes JSONL responses (default: stdout)")
+    parser.add_argument("--seed", type=int,
+                        help="seed the random responses, for repeatable --batch runs")
+    parser.add_argument("--benchmark-speech", metavar="AUDIO", nargs="+",
+                        help="time each speech recognizer on WAV/AIFF/FLAC recordings and exit")
+    parser.add_argument("--recognizer", action="append", choices=["google", "vosk"],
+                        help="backend for --benchmark-speech (repeatable; default: all)")
+    args = parser.parse_args()
+    
+    if args.batch:
+        from batch_mode import run_batch_files
+        sys.exit(run_batch_files(args.batch, args.output, args.seed))
+    
+    if args.benchmark_speech:
+        from speech_benchmark import run_benchmark
+        sys.exit(run_benchmark(args.benchmark_speech, args.recognizer))
+    
     try:
         assistant = JPAssistant()
         assistant.run()
@@ -0,0 +1,87 @@
+"""
+JP Assistant - Speech recognition benchmark
+Times each recognition backend on recorded WAV clips
+"""
+
+import time
+from typing import Dict, List
+import speech_recognition as sr
+from core.speech_engine import create_recognizer_backend
+from utils.stats import percentile
+
+BACKENDS = ["google", "vosk"]
+
+
+def load_clips(paths: List[str]) -> List[sr.AudioData]:
+    """Audio of each WAV/AIFF/FLAC file, as the microphone would deliver it"""
+    recognizer = sr.Recognizer()
+    clips = []
+    for path in paths:
+        with sr.AudioFile(path) as source:
+            clips.append(recognizer.record(source))
+    return clips
+
+
+def benchmark_backend(name: str, clips: List[sr.AudioData], repeats: int = 1) -> Dict:
+    """Load time, per-utterance latencies and transcripts for one backend"""
+    started = time.perf_counter()
+    backend = create_recognizer_backend(name)
+    load_seconds = time.perf_counter() - started
+
+    latencies: List[float] = []
+    transcripts: List[str] = []
+    errors = 0
+    for _ in range(repeats):
+        for clip in clips:
+            started = time.perf_counter()
+            try:
+                text = backend.recognize(clip)
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                errors += 1
+                text = f"<{type(e).__name__}>"
+            latencies.append(time.perf_counter() - started)
+            transcripts.append(text)
+
+    latencies.sort()
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "utterances": len(latencies),
+        "errors": errors,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "transcripts": transcripts[:len(clips)],
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"🎙️ {report['backend']}: loaded in {report['load_seconds'] * 1000:.0f} ms",
+        f"   ⏱️ {report['utterances']} utterances ({report['errors']} failed or not recognized): "
+        f"mean {report['mean_ms']:.0f} ms, p50 {report['p50_ms']:.0f} ms, "
+        f"p90 {report['p90_ms']:.0f} ms, max {report['max_ms']:.0f} ms",
+    ]
+    lines += [f"   📝 {text}" for text in report["transcripts"]]
+    return "\n".join(lines)
+
+
+def run_benchmark(paths: List[str], backends: List[str] = None, repeats: int = 1) -> int:
+    """Entry point for main.py --benchmark-speech; returns the process exit code"""
+    try:
+        clips = load_clips(paths)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read audio: {e}")
+        return 1
+
+    print("📊 Speech Recognition Benchmark")
+    print("━" * 31)
+    failed = False
+    for name in backends or BACKENDS:
+        try:
+            print(format_report(benchmark_backend(name, clips, repeats)))
+        except Exception as e:
+            failed = True
+            print(f"⚠️ {name}: unavailable ({e})")
+    return 1 if failed else 0
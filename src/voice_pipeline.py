@@ -0,0 +1,244 @@
+"""
+JP Assistant - Voice pipeline
+Listen → recognize → route → execute → speak as overlapping asyncio stages
+"""
+
+import asyncio
+import queue
+import sys
+import threading
+from concurrent.futures import Executor, Future
+from typing import Optional
+from core import config
+
+# Queued after the last item to stop the stage reading the queue
+_STOP = None
+
+EXIT_WORDS = ["goodbye", "bye", "exit", "quit"]
+
+
+class _StageWorker(Executor):
+    """One daemon thread running a stage's blocking calls in order
+
+    ThreadPoolExecutor joins its threads at exit, so a capture still
+    waiting for speech would keep JP running until the listen timed out.
+    """
+
+    def __init__(self, name: str):
+        self._calls: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._work, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        self._calls.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._calls.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def _work(self) -> None:
+        while True:
+            call = self._calls.get()
+            if call is _STOP:
+                return
+            future, fn, args, kwargs = call
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class VoicePipeline:
+    """The assistant's main loop as stages joined by bounded queues
+
+    capture → audio queue → recognize → text queue → route/execute →
+    speech queue → speak. Every blocking call runs in an executor: the
+    microphone, the recognizer, command execution (psutil, file walks)
+    and the TTS engine each get one thread, since none of them is safe to
+    call concurrently and commands must run in the order they were said.
+    The TTS engine is also created on the speaker thread, as pyttsx3
+    engines only work from the thread that made them.
+
+    By default the microphone waits until the last utterance has been
+    answered and JP has stopped talking, so JP never hears its own replies
+    ("...say 'Bye JP' to sleep"). With PIPELINE_LISTEN_WHILE_SPEAKING the
+    next utterance is recorded while the current one is still being
+    recognized, executed and spoken. Full queues make the earlier stages
+    wait instead of buffering audio without limit. Commands typed on the
+    console join the text queue alongside spoken ones.
+    """
+
+    def __init__(self, assistant):
+        self.assistant = assistant
+        self.speech_engine = assistant.speech_engine
+        self._microphone = _StageWorker("jp-capture")
+        self._recognizer = _StageWorker("jp-recognize")
+        self._commands = _StageWorker("jp-command")
+        self._speaker = _StageWorker("jp-speak")
+        # Utterances captured but not yet answered, and whether JP is talking
+        self._in_flight = 0
+        self._speaking = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Created in run() so they belong to the running event loop
+        self._audio: Optional[asyncio.Queue] = None
+        self._texts: Optional[asyncio.Queue] = None
+        self._speech: Optional[asyncio.Queue] = None
+        # Set while no utterance is in flight and JP is silent
+        self._quiet: Optional[asyncio.Event] = None
+
+    async def run(self) -> None:
+        """Run until the user says goodbye or types 'quit'"""
+        self._loop = asyncio.get_running_loop()
+        self._audio = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+        self._texts = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+        self._speech = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+        self._quiet = asyncio.Event()
+        self._quiet.set()
+
+        brain = self.assistant.jp_brain
+        # Long searches announce early matches through the speech stage too
+        brain.partial_result_callback = self.say_threadsafe
+
+        speaker = asyncio.ensure_future(self._speak())
+        listeners = [asyncio.ensure_future(self._capture()), asyncio.ensure_future(self._recognize())]
+        threading.Thread(target=self._read_console, name="jp-console", daemon=True).start()
+
+        await self.say(brain.personality.personalize_response("greeting"))
+        try:
+            await self._route()
+        finally:
+            for task in listeners:
+                task.cancel()
+            # Let JP finish what it is saying, e.g. the goodbye
+            await self._speech.put(_STOP)
+            await speaker
+            brain.partial_result_callback = None
+            # A capture may still be waiting for speech; its daemon thread ends with the process
+            for worker in (self._microphone, self._recognizer, self._commands, self._speaker):
+                worker.shutdown(wait=False)
+
+    async def say(self, text: str) -> None:
+        self._quiet.clear()
+        await self._speech.put(text)
+
+    def say_threadsafe(self, text: str) -> None:
+        """Queue speech from a worker thread without waiting for it"""
+        asyncio.run_coroutine_threadsafe(self.say(text), self._loop)
+
+    async def _capture(self) -> None:
+        while True:
+            if not config.PIPELINE_LISTEN_WHILE_SPEAKING:
+                await self._quiet.wait()
+            wake_word_mode = not self.assistant.awake
+            started = self._loop.time()
+            audio = await self._loop.run_in_executor(
+                self._microphone, self.speech_engine.capture, wake_word_mode)
+            if audio is not None:
+                self._in_flight += 1
+                self._quiet.clear()
+                await self._audio.put((audio, wake_word_mode))
+            elif self._loop.time() - started < config.PIPELINE_CAPTURE_RETRY_SECONDS:
+                # Failed at once (missing or broken microphone) rather than timing out
+                await asyncio.sleep(config.PIPELINE_CAPTURE_RETRY_SECONDS)
+
+    async def _recognize(self) -> None:
+        while True:
+            audio, wake_word_mode = await self._audio.get()
+            text = await self._loop.run_in_executor(
+                self._recognizer, self.speech_engine.recognize, audio, wake_word_mode)
+            await self._texts.put((text, False))
+
+    def _read_console(self) -> None:
+        """Forward typed lines to the text queue (runs in a daemon thread)"""
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                asyncio.run_coroutine_threadsafe(self._texts.put((line, True)), self._loop).result()
+            except RuntimeError:
+                return  # The pipeline has shut down
+
+    async def _route(self) -> None:
+        while self.assistant.running:
+            text, typed = await self._texts.get()
+            try:
+                if not await self._handle(text, typed):
+                    return
+            except Exception as e:
+                print(f"❌ Unexpected error: {e}")
+                await self.say("I encountered an error. Please try again.")
+            finally:
+                if not typed:
+                    self._in_flight -= 1
+                    self._update_quiet()
+
+    def _update_quiet(self) -> None:
+        if not self._in_flight and not self._speaking and self._speech.empty():
+            self._quiet.set()
+
+    async def _handle(self, text: str, typed: bool) -> bool:
+        """Act on one utterance or typed line; False once JP should exit"""
+        assistant = self.assistant
+        personality = assistant.jp_brain.personality
+
+        if typed:
+            if text.lower() == "quit":
+                return False
+            if text.lower() == "help":
+                print(config.HELP_TEXT)
+                return True
+            await self.say(await self._execute(text.lower()))
+            return True
+
+        if not assistant.awake:
+            # Listen for JP attention
+            if text and assistant.check_jp_attention(text):
+                assistant.awake = True
+                await self.say(personality.personalize_response(
+                    "acknowledgment", "Yes, I'm here! How can I help?"
+                ))
+            return True
+
+        if not text:
+            await self.say("I didn't hear anything clearly. Try again or say 'Bye JP' to sleep.")
+            return True
+
+        if assistant.check_sleep_word(text):
+            assistant.awake = False
+            await self.say(personality.personalize_response("standby"))
+            return True
+
+        if any(word in text for word in EXIT_WORDS):
+            await self.say(personality.personalize_response(
+                "standby", "Goodbye! Thanks for using JP Assistant. Have a great day!"
+            ))
+            return False
+
+        await self.say(await self._execute(text))
+        return True
+
+    async def _execute(self, command: str) -> str:
+        return await self._loop.run_in_executor(self._commands, self.assistant.process_jp_command, command)
+
+    async def _speak(self) -> None:
+        while True:
+            text = await self._speech.get()
+            if text is _STOP:
+                return
+            self._speaking = True
+            try:
+                await self._loop.run_in_executor(self._speaker, self.speech_engine.speak, text)
+            finally:
+                self._speaking = False
+                self._update_quiet()
+
+
+def run_pipeline(assistant) -> None:
+    """Entry point for JPAssistant.run"""
+    asyncio.run(VoicePipeline(assistant).run())